@@ -0,0 +1 @@
+from apps.api import startup  # noqa: F401  # start the startup clock first
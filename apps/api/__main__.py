@@ -1,3 +1,4 @@
+import os
 import uvicorn
 from apps.api.config import settings
 
@@ -5,10 +6,35 @@ from apps.api.config import settings
 def main() -> None:
     """Startup event to initialize the application."""
     print("Currency Exchange Agent starting up...")
-    print(f"Using ExchangeRate API: {settings.exchangerate_base_url}")
-    print("Agent initialized successfully!")
+    if settings.rate_provider == "file":
+        print(f"Using rate file: {settings.rate_file_path}")
+    elif settings.rate_provider in ("", "exchangerate_api"):
+        print(f"Using ExchangeRate API: {settings.exchangerate_base_url}")
+    else:
+        print(f"Using rate provider: {settings.rate_provider}")
 
-    uvicorn.run("apps.api.app:app", host=settings.host, port=settings.port, reload=True)
+    if settings.server_mode.lower() == "production":
+        workers = settings.server_workers or os.cpu_count() or 1
+        print(
+            f"Serving in production mode with {workers} worker(s) "
+            f"(loop={settings.server_loop}, http={settings.server_http})"
+        )
+        if workers > 1 and not settings.rate_snapshot_path:
+            print("Warning: RATE_SNAPSHOT_PATH is empty, workers will not share rates")
+
+        uvicorn.run(
+            "apps.api.app:app",
+            host=settings.host,
+            port=settings.port,
+            workers=workers,
+            loop=settings.server_loop,
+            http=settings.server_http,
+            timeout_graceful_shutdown=settings.server_graceful_shutdown_seconds,
+        )
+    else:
+        uvicorn.run(
+            "apps.api.app:app", host=settings.host, port=settings.port, reload=True
+        )
 
 
 if __name__ == "__main__":
@@ -1,14 +1,63 @@
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from apps.api.routers import agent, health
-from apps.domain.exceptions import NotFoundError
+from apps.api.middleware import MetricsMiddleware
+from apps.api.routers import agent, health, metrics, profiles
+from apps.api.startup import PROCESS_STARTED_AT, startup_report
+from apps.domain.exceptions import (
+    AdmissionQueueFullError,
+    ModelRateLimitError,
+    NotFoundError,
+    OverloadedError,
+)
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.prefetch import RatePrefetcher
+from apps.api.config import settings
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    startup_report.record("imports", time.perf_counter() - PROCESS_STARTED_AT)
+    await rate_client.startup()
+
+    prefetcher = RatePrefetcher(
+        rate_client,
+        base_currencies=settings.rate_prefetch_currencies.split(","),
+        retry_seconds=settings.rate_prefetch_retry_seconds,
+    )
+    with startup_report.measure("rate_snapshot_load"):
+        loaded = prefetcher.load()
+    if loaded:
+        print(f"Loaded {loaded} rate snapshot(s) from {settings.rate_snapshot_path}")
+    if settings.rate_prefetch_enabled:
+        prefetcher.start()
+
+    try:
+        with startup_report.measure("agent_init"):
+            agent.get_currency_agent()
+        startup_report.mark_ready()
+    except Exception as e:
+        # Keep serving /healthcheck; /readiness reports the failure and the
+        # agent is retried on first use.
+        startup_report.error = f"Agent initialization failed: {e}"
+        print(startup_report.error)
+    print(f"Startup: {startup_report.summary()}")
+
+    yield
+
+    await prefetcher.stop()
+    agent.shutdown_query_sync_executor()
+    await rate_client.aclose()
+
+
 app = FastAPI(
     title="Currency Exchange Agent",
     description="LangChain-powered currency exchange agent using OpenAI and ExchangeRate API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
@@ -17,6 +66,20 @@ async def no_result_error_handler(_: Request, exc: NotFoundError):
     return JSONResponse(status_code=404, content={"message": str(exc)})
 
 
+@app.exception_handler(OverloadedError)
+async def overloaded_error_handler(_: Request, exc: OverloadedError):
+    # A full queue or a rate-limited provider means "slow down" (429); a run
+    # that waited out the queue timeout means the server is saturated (503).
+    status_code = (
+        429 if isinstance(exc, (AdmissionQueueFullError, ModelRateLimitError)) else 503
+    )
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -25,10 +88,23 @@ async def root():
         "description": "LangChain-powered currency exchange agent",
         "endpoints": {
             "POST /query": "Send currency exchange queries",
-            "GET /health": "Health check endpoint",
+            "POST /query/stream": "Stream agent events and answer tokens (SSE)",
+            "POST /query/batch": "Answer several queries concurrently",
+            "GET /query/cache/stats": "Answer cache hit/miss counters",
+            "GET /healthcheck": "Liveness check endpoint",
+            "GET /readiness": "Readiness check with startup timings",
+            "GET /metrics": "Prometheus metrics",
+            "GET /profiles/{profile_id}": "Download a request profile (if enabled)",
         },
     }
 
 
 app.include_router(health.router)
 app.include_router(agent.router)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if settings.profiling_enabled:
+    app.include_router(profiles.router)
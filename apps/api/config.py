@@ -15,12 +15,17 @@ class Settings(BaseSettings):
     model_max_tokens: int = Field(default=1000, env="MODEL_MAX_TOKENS")
 
     # OpenAI Configuration
-    openai_api_key: str = Field(..., env="OPENAI_API_KEY")
+    openai_api_key: Optional[str] = Field(
+        default=None, env="OPENAI_API_KEY"
+    )  # required when model_provider is "openai"
 
     # Ollama Configuration
     ollama_base_url: str = Field(
         default="http://localhost:11434", env="OLLAMA_BASE_URL"
     )
+    ollama_tool_calling: str = Field(
+        default="auto", env="OLLAMA_TOOL_CALLING"
+    )  # "auto" (ask the server), "on" (native tool calls) or "off" (text ReAct)
 
     # ExchangeRate API Configuration
     exchangerate_api_key: str = Field(
@@ -29,11 +34,186 @@ class Settings(BaseSettings):
     exchangerate_base_url: str = Field(
         default="https://v6.exchangerate-api.com/v6", env="EXCHANGERATE_BASE_URL"
     )
+    exchangerate_timeout_seconds: float = Field(
+        default=10.0, env="EXCHANGERATE_TIMEOUT_SECONDS"
+    )
+    exchangerate_max_connections: int = Field(
+        default=20, env="EXCHANGERATE_MAX_CONNECTIONS"
+    )  # keep-alive pool size shared by the sync and async clients
+
+    # Rate Provider Configuration
+    rate_provider: str = Field(
+        default="exchangerate_api", env="RATE_PROVIDER"
+    )  # "exchangerate_api", "file" or a custom provider as "module:ClassName"
+    rate_file_path: str = Field(
+        default="", env="RATE_FILE_PATH"
+    )  # rate table read by the "file" provider
+    rate_file_format: str = Field(
+        default="", env="RATE_FILE_FORMAT"
+    )  # "json", "csv" or "ecb_xml"; taken from the file extension when empty
+    rate_file_base_currency: str = Field(
+        default="USD", env="RATE_FILE_BASE_CURRENCY"
+    )  # base of CSV rate tables, which do not name one
+
+    # Rate Cache Configuration
+    rate_cache_max_ttl_seconds: float = Field(
+        default=3600.0, env="RATE_CACHE_MAX_TTL_SECONDS"
+    )  # upper bound; entries also expire at the provider's next update
+    rate_cache_max_size: int = Field(default=32, env="RATE_CACHE_MAX_SIZE")
+    rate_matrix_base_currency: str = Field(
+        default="USD", env="RATE_MATRIX_BASE_CURRENCY"
+    )  # single base table all cross rates are derived from
+
+    # Rate Provider Resilience Configuration
+    rate_stale_max_age_seconds: float = Field(
+        default=86400.0, env="RATE_STALE_MAX_AGE_SECONDS"
+    )  # serve the last good snapshot (flagged stale) this long; 0 disables
+    rate_breaker_failure_threshold: int = Field(
+        default=3, env="RATE_BREAKER_FAILURE_THRESHOLD"
+    )  # consecutive provider failures that open the circuit; 0 disables the breaker
+    rate_breaker_reset_seconds: float = Field(
+        default=30.0, env="RATE_BREAKER_RESET_SECONDS"
+    )  # how long an open circuit fails fast before letting one probe request through
+    rate_refresh_retry_attempts: int = Field(
+        default=4, env="RATE_REFRESH_RETRY_ATTEMPTS"
+    )  # background refresh attempts for a stale base
+    rate_refresh_retry_base_seconds: float = Field(
+        default=1.0, env="RATE_REFRESH_RETRY_BASE_SECONDS"
+    )
+    rate_refresh_retry_max_seconds: float = Field(
+        default=30.0, env="RATE_REFRESH_RETRY_MAX_SECONDS"
+    )  # cap of the jittered exponential backoff between attempts
+
+    # Rate Prefetch Configuration
+    rate_prefetch_enabled: bool = Field(default=True, env="RATE_PREFETCH_ENABLED")
+    rate_prefetch_currencies: str = Field(
+        default="", env="RATE_PREFETCH_CURRENCIES"
+    )  # comma-separated bases kept warm in addition to the matrix base
+    rate_prefetch_retry_seconds: float = Field(
+        default=300.0, env="RATE_PREFETCH_RETRY_SECONDS"
+    )
+    rate_snapshot_path: Optional[str] = Field(
+        default="", env="RATE_SNAPSHOT_PATH"
+    )  # snapshot file shared by all workers and loaded at startup; empty disables
+    rate_history_path: Optional[str] = Field(
+        default="", env="RATE_HISTORY_PATH"
+    )  # daily rate history directory read by get_historical_rates; empty disables
+
+    # Admission Control Configuration
+    admission_enabled: bool = Field(
+        default=True, env="ADMISSION_ENABLED"
+    )  # cap concurrent agent runs; fast path and cached answers are not limited
+    admission_max_concurrent_runs_ollama: int = Field(
+        default=4, env="ADMISSION_MAX_CONCURRENT_RUNS_OLLAMA"
+    )
+    admission_max_concurrent_runs_openai: int = Field(
+        default=32, env="ADMISSION_MAX_CONCURRENT_RUNS_OPENAI"
+    )
+    admission_max_queue: int = Field(
+        default=32, env="ADMISSION_MAX_QUEUE"
+    )  # runs waiting for a slot; beyond this requests get 429
+    admission_queue_timeout_seconds: float = Field(
+        default=10.0, env="ADMISSION_QUEUE_TIMEOUT_SECONDS"
+    )  # longest wait for a slot before 503
+    admission_retry_after_seconds: int = Field(
+        default=5, env="ADMISSION_RETRY_AFTER_SECONDS"
+    )  # Retry-After sent with 429/503 responses
+    query_sync_max_workers: int = Field(
+        default=8, env="QUERY_SYNC_MAX_WORKERS"
+    )  # threads dedicated to /query-sync
+
+    # Agent Tool Execution Configuration
+    agent_max_parallel_tool_calls: int = Field(
+        default=4, env="AGENT_MAX_PARALLEL_TOOL_CALLS"
+    )  # per request; tool calls from one model turn run concurrently up to this
+    agent_tool_timeout_seconds: float = Field(
+        default=10.0, env="AGENT_TOOL_TIMEOUT_SECONDS"
+    )  # a timed-out call becomes an error observation; 0 disables
+    agent_direct_answers: bool = Field(
+        default=True, env="AGENT_DIRECT_ANSWERS"
+    )  # a lone pair lookup or conversion ends the run without a summarizing turn
+
+    # Prompt Configuration
+    prompt_compact: bool = Field(
+        default=False, env="PROMPT_COMPACT"
+    )  # trimmed system prompt, terse tool output and a capped scratchpad
+    prompt_scratchpad_max_tokens: int = Field(
+        default=600, env="PROMPT_SCRATCHPAD_MAX_TOKENS"
+    )  # compact mode only; oldest agent steps are dropped beyond this
+
+    # Fast Path Configuration
+    fast_path_enabled: bool = Field(
+        default=True, env="FAST_PATH_ENABLED"
+    )  # answer plain "amount FROM to TO" queries without the LLM
+
+    # Answer Cache Configuration
+    answer_cache_enabled: bool = Field(default=True, env="ANSWER_CACHE_ENABLED")
+    answer_cache_max_size: int = Field(default=1024, env="ANSWER_CACHE_MAX_SIZE")
+    answer_cache_backend: Optional[str] = Field(
+        default=None, env="ANSWER_CACHE_BACKEND"
+    )  # "module:ClassName" of an AnswerCacheBackend shared between workers
+
+    # Session Configuration
+    session_max_tokens: int = Field(
+        default=1000, env="SESSION_MAX_TOKENS"
+    )  # estimated prompt tokens per session; older turns are summarized beyond this
+    session_max_count: int = Field(default=1000, env="SESSION_MAX_COUNT")
+    session_max_total_tokens: int = Field(
+        default=2_000_000, env="SESSION_MAX_TOTAL_TOKENS"
+    )  # all sessions together, tool results included; LRU sessions are evicted
+    session_idle_ttl_seconds: float = Field(
+        default=1800.0, env="SESSION_IDLE_TTL_SECONDS"
+    )
+    session_max_tool_results: int = Field(
+        default=16, env="SESSION_MAX_TOOL_RESULTS"
+    )  # tool results per session reused when the model repeats a call
+
+    # Batch Query Configuration
+    batch_max_concurrency: int = Field(default=5, env="BATCH_MAX_CONCURRENCY")
+    batch_max_size: int = Field(default=50, env="BATCH_MAX_SIZE")
+
+    # Observability Configuration
+    metrics_enabled: bool = Field(
+        default=True, env="METRICS_ENABLED"
+    )  # Prometheus metrics on /metrics
+    agent_verbose: bool = Field(
+        default=True, env="AGENT_VERBOSE"
+    )  # print agent steps to stdout; turn off in production
+
+    # Profiling Configuration
+    profiling_enabled: bool = Field(
+        default=False, env="PROFILING_ENABLED"
+    )  # allow cProfile profiles of /query and /query-sync runs
+    profiling_sample_rate: float = Field(
+        default=0.0, env="PROFILING_SAMPLE_RATE"
+    )  # fraction of requests profiled without asking via the X-Profile header
+    profiling_max_concurrent: int = Field(
+        default=1, env="PROFILING_MAX_CONCURRENT"
+    )  # requests beyond this run unprofiled; capped at 1 on Python 3.12+
+    profiling_dir: str = Field(default=".cache/profiles", env="PROFILING_DIR")
+    profiling_max_files: int = Field(
+        default=100, env="PROFILING_MAX_FILES"
+    )  # oldest profiles are deleted beyond this
 
     # FastAPI Configuration
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=8000, env="PORT")
 
+    # Server Configuration
+    server_mode: str = Field(
+        default="development", env="SERVER_MODE"
+    )  # "development" (single process, auto-reload) or "production"
+    server_workers: int = Field(default=1, env="SERVER_WORKERS")
+    server_loop: str = Field(
+        default="auto", env="SERVER_LOOP"
+    )  # "auto", "uvloop" or "asyncio"
+    server_http: str = Field(
+        default="auto", env="SERVER_HTTP"
+    )  # "auto", "httptools" or "h11"
+    server_graceful_shutdown_seconds: int = Field(
+        default=30, env="SERVER_GRACEFUL_SHUTDOWN_SECONDS"
+    )
+
     # LangChain Configuration
     langchain_tracing_v2: bool = Field(default=False, env="LANGCHAIN_TRACING_V2")
     langchain_api_key: Optional[str] = Field(default=None, env="LANGCHAIN_API_KEY")
@@ -0,0 +1,39 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from apps.domain.metrics import HTTP_REQUEST_DURATION
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording end-to-end request time per route.
+
+    Requests are labelled with the route template (``/query``), not the raw
+    path, so unknown URLs do not create new series. Timing stops when the last
+    body chunk is sent, which for /query/stream means the end of the stream.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,201 @@
+import asyncio
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from apps.api.config import settings
+
+T = TypeVar("T")
+
+# Clients ask for a profile of their request with this header ("1"/"true").
+PROFILE_REQUEST_HEADER = "X-Profile"
+# The response names the saved profile with these headers.
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_URL_HEADER = "X-Profile-Url"
+
+_PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{12}$")
+
+
+def profile_requested(header_value: Optional[str]) -> bool:
+    return header_value is not None and header_value.strip().lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+class ProfileRun:
+    """Deterministic ``cProfile`` profile of one request's agent run.
+
+    Before Python 3.12 ``cProfile`` follows only the thread that enabled it.
+    On /query-sync that thread belongs to the request alone; on /query it is
+    the event loop, so the profile also includes whatever else the loop ran
+    in the meantime. From 3.12 it hooks ``sys.monitoring``, which covers every
+    thread of the process and allows only one active profile at a time.
+    """
+
+    def __init__(
+        self, profiler: "RequestProfiler", profile_id: str, on_event_loop: bool = False
+    ):
+        self.profiler = profiler
+        self.profile_id = profile_id
+        self.on_event_loop = on_event_loop
+        self.profile = cProfile.Profile()
+        self.enabled = False
+        self.saved = False
+
+    def __enter__(self) -> "ProfileRun":
+        try:
+            self.profile.enable()
+            self.enabled = True
+        except ValueError as e:  # another profiler is active in this process
+            print(f"Could not start profile {self.profile_id}: {e}")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.enabled:
+            self.profile.disable()
+
+    def save(self) -> None:
+        """Write the profile to the profile directory and free its slot."""
+        try:
+            if self.enabled:
+                self.profiler.save(self)
+                self.saved = True
+        except OSError as e:
+            print(
+                f"Could not save profile {self.profile_id} "
+                f"to {self.profiler.directory}: {e}"
+            )
+        finally:
+            self.profiler.release(self)
+
+
+class RequestProfiler:
+    """Decides which requests are profiled and keeps the saved profiles.
+
+    While ``enabled``, a request is profiled when it asks for it with
+    ``X-Profile`` or is picked at ``sample_rate``. At most ``max_concurrent``
+    runs are profiled at a time, the rest run normally, and only the newest
+    ``max_files`` profiles are kept, so the overhead stays bounded however
+    many clients ask.
+
+    Profiles only overlap safely when each has a thread to itself, so one run
+    at a time is profiled on the event loop, and only one at all from Python
+    3.12, where a second ``cProfile`` cannot be enabled.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        max_concurrent: int = 1,
+        max_files: int = 100,
+    ):
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_concurrent = (
+            min(max_concurrent, 1) if sys.version_info >= (3, 12) else max_concurrent
+        )
+        self.max_files = max_files
+        self._active = 0
+        self._event_loop_busy = False
+        self._lock = threading.Lock()
+
+    def start(
+        self, requested: bool, on_event_loop: bool = False
+    ) -> Optional[ProfileRun]:
+        """Return a run to profile this request with, or None to run it unprofiled.
+
+        ``on_event_loop`` marks a run profiled on the event loop thread.
+        """
+        if not self.enabled:
+            return None
+        if not requested and random.random() >= self.sample_rate:
+            return None
+        with self._lock:
+            if self._active >= self.max_concurrent:
+                return None
+            if on_event_loop and self._event_loop_busy:
+                return None
+            self._active += 1
+            self._event_loop_busy = self._event_loop_busy or on_event_loop
+        profile_id = (
+            f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:12]}"
+        )
+        return ProfileRun(self, profile_id, on_event_loop)
+
+    def release(self, run: ProfileRun) -> None:
+        with self._lock:
+            self._active -= 1
+            if run.on_event_loop:
+                self._event_loop_busy = False
+
+    def path_for(self, profile_id: str) -> Optional[str]:
+        """Return the file of a saved profile, or None for ids it never issues."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}.prof")
+
+    def save(self, run: ProfileRun) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        run.profile.dump_stats(self.path_for(run.profile_id))
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond ``max_files``."""
+        profiles = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".prof"):
+                try:
+                    profiles.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    pass  # another worker pruned it first
+        profiles.sort()
+        for _, path in profiles[: max(0, len(profiles) - self.max_files)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def call_profiled(
+    run: Optional[ProfileRun], fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Call ``fn`` in the current thread, profiled by ``run`` if there is one."""
+    if run is None:
+        return fn(*args, **kwargs)
+    try:
+        with run:
+            return fn(*args, **kwargs)
+    finally:
+        run.save()
+
+
+async def await_profiled(run: Optional[ProfileRun], awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable``, profiled by ``run`` if there is one."""
+    if run is None:
+        return await awaitable
+    try:
+        with run:
+            return await awaitable
+    finally:
+        await asyncio.to_thread(run.save)
+
+
+# Process-wide profiler used by the query endpoints
+request_profiler = RequestProfiler(
+    settings.profiling_dir,
+    enabled=settings.profiling_enabled,
+    sample_rate=settings.profiling_sample_rate,
+    max_concurrent=settings.profiling_max_concurrent,
+    max_files=settings.profiling_max_files,
+)
@@ -1,10 +1,84 @@
+import asyncio
+import functools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
+from typing import Any, AsyncIterator, Dict, Optional
 from fastapi import APIRouter
+from fastapi import Header
 from fastapi import HTTPException
-from apps.domain.models import QueryRequest, QueryResponse
+from fastapi import Request
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from apps.api.config import settings
+from apps.api.profiling import (
+    PROFILE_ID_HEADER,
+    PROFILE_REQUEST_HEADER,
+    PROFILE_URL_HEADER,
+    ProfileRun,
+    await_profiled,
+    call_profiled,
+    profile_requested,
+    request_profiler,
+)
+from apps.domain.models import (
+    BatchQueryRequest,
+    BatchQueryResponse,
+    QueryRequest,
+    QueryResponse,
+)
 from apps.domain.agents.currency_exchange import CurrencyExchangeAgent
+from apps.domain.agents.answer_cache import answer_cache
+from apps.domain.exceptions import OverloadedError
+
+_currency_agent: Optional[CurrencyExchangeAgent] = None
+_currency_agent_lock = threading.Lock()
+_query_sync_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_currency_agent() -> CurrencyExchangeAgent:
+    """Return the shared agent, constructing it on first use."""
+    global _currency_agent
+    if _currency_agent is None:
+        with _currency_agent_lock:
+            if _currency_agent is None:
+                _currency_agent = CurrencyExchangeAgent()
+    return _currency_agent
+
+
+def get_query_sync_executor() -> ThreadPoolExecutor:
+    """Return the thread pool reserved for /query-sync, creating it on first use.
+
+    Sync agent runs block a thread for their whole duration; keeping them off
+    the default thread pool means a burst of them cannot starve the async
+    endpoints of threads.
+    """
+    global _query_sync_executor
+    if _query_sync_executor is None:
+        with _currency_agent_lock:
+            if _query_sync_executor is None:
+                _query_sync_executor = ThreadPoolExecutor(
+                    max_workers=settings.query_sync_max_workers,
+                    thread_name_prefix="query-sync",
+                )
+    return _query_sync_executor
+
+
+def shutdown_query_sync_executor() -> None:
+    """Stop the /query-sync thread pool, if it was started."""
+    global _query_sync_executor
+    if _query_sync_executor is not None:
+        _query_sync_executor.shutdown(wait=False)
+        _query_sync_executor = None
+
+
+def _set_profile_headers(response: Response, run: Optional[ProfileRun]) -> None:
+    """Point the client at the profile saved for its request, if one was."""
+    if run is not None and run.saved:
+        response.headers[PROFILE_ID_HEADER] = run.profile_id
+        response.headers[PROFILE_URL_HEADER] = f"/profiles/{run.profile_id}"
 
-currency_agent = CurrencyExchangeAgent()
 
 router = APIRouter(
     tags=["agent"],
@@ -12,7 +86,11 @@ router = APIRouter(
 
 
 @router.post("/query", response_model=QueryResponse)
-async def process_currency_query(request: QueryRequest):
+async def process_currency_query(
+    request: QueryRequest,
+    response: Response,
+    x_profile: Optional[str] = Header(default=None, alias=PROFILE_REQUEST_HEADER),
+):
     """
     Process currency exchange queries using the LangChain agent.
 
@@ -24,56 +102,195 @@ async def process_currency_query(request: QueryRequest):
     - "Show me exchange rates for British Pound"
     - "How much is 100 dollars in Japanese yen?"
     - "What are today's exchange rates?"
+
+    With ``PROFILING_ENABLED``, an ``X-Profile: 1`` header profiles the agent
+    run; ``X-Profile-Id`` in the response names the saved profile.
     """
     try:
         if not request.message.strip():
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Message cannot be empty")
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail="Message cannot be empty"
+            )
 
-        result = await currency_agent.process_query(request.message)
+        # Build the agent first so a failure cannot leave the profiler slot taken.
+        agent = get_currency_agent()
+        run = request_profiler.start(profile_requested(x_profile), on_event_loop=True)
+        result = await await_profiled(
+            run, agent.process_query(request.message, session_id=request.session_id)
+        )
+        _set_profile_headers(response, run)
 
         if not result["success"]:
             raise HTTPException(
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Agent processing failed: {result['error']}"
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail=f"Agent processing failed: {result['error']}",
             )
 
         return QueryResponse(
             success=result["success"],
             response=result["response"],
             error=result["error"],
+            served_by=result["served_by"],
+            token_usage=result.get("token_usage"),
+            session_id=request.session_id,
+            answer=result.get("answer"),
         )
 
-    except HTTPException:
+    except (HTTPException, OverloadedError):
         raise
     except Exception as e:
-        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Internal server error: {str(e)}")
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def process_currency_query_batch(request: BatchQueryRequest):
+    """
+    Process several currency queries in one request.
+
+    Queries run concurrently through the agent, at most
+    ``BATCH_MAX_CONCURRENCY`` at a time, and share rate lookups. Results are
+    returned in request order, each with its own success/error fields, so one
+    failing query does not fail the batch.
+    """
+    if len(request.queries) > settings.batch_max_size:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Batch cannot contain more than {settings.batch_max_size} queries",
+        )
+
+    results = await get_currency_agent().process_batch(
+        [query.message for query in request.queries],
+        max_concurrency=settings.batch_max_concurrency,
+        session_ids=[query.session_id for query in request.queries],
+    )
+
+    return BatchQueryResponse(
+        results=[
+            QueryResponse(
+                success=result["success"],
+                response=result["response"],
+                error=result["error"],
+                served_by=result["served_by"],
+                token_usage=result.get("token_usage"),
+                session_id=query.session_id,
+                answer=result.get("answer"),
+            )
+            for query, result in zip(request.queries, results)
+        ]
+    )
+
+
+@router.get("/query/cache/stats")
+async def answer_cache_stats() -> dict:
+    """Return answer cache hit/miss counters."""
+    return answer_cache.stats()
 
 
 @router.post("/query-sync", response_model=QueryResponse)
-def process_currency_query_sync(request: QueryRequest):
+async def process_currency_query_sync(
+    request: QueryRequest,
+    response: Response,
+    x_profile: Optional[str] = Header(default=None, alias=PROFILE_REQUEST_HEADER),
+):
     """
     Synchronous version of the currency query endpoint.
 
     This endpoint provides the same functionality as /query but processes
     requests synchronously, which might be useful for certain integrations.
+    Runs on a dedicated pool of ``QUERY_SYNC_MAX_WORKERS`` threads. Before
+    Python 3.12, profiles requested with ``X-Profile`` cover only this
+    request's thread.
     """
     try:
         if not request.message.strip():
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Message cannot be empty")
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail="Message cannot be empty"
+            )
 
-        result = currency_agent.process_query_sync(request.message)
+        agent = get_currency_agent()
+        executor = get_query_sync_executor()
+        run = request_profiler.start(profile_requested(x_profile))
+        result = await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                call_profiled,
+                run,
+                agent.process_query_sync,
+                request.message,
+                session_id=request.session_id,
+            ),
+        )
+        _set_profile_headers(response, run)
 
         if not result["success"]:
             raise HTTPException(
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Agent processing failed: {result['error']}"
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail=f"Agent processing failed: {result['error']}",
             )
 
         return QueryResponse(
             success=result["success"],
             response=result["response"],
             error=result["error"],
+            served_by=result["served_by"],
+            token_usage=result.get("token_usage"),
+            session_id=request.session_id,
+            answer=result.get("answer"),
         )
 
-    except HTTPException:
+    except (HTTPException, OverloadedError):
         raise
     except Exception as e:
-        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Internal server error: {str(e)}")
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Encode an agent stream event as a server-sent event frame."""
+    return (
+        f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+    )
+
+
+@router.post("/query/stream")
+async def stream_currency_query(request: QueryRequest, http_request: Request):
+    """
+    Streaming version of the currency query endpoint.
+
+    Returns a ``text/event-stream`` of ``tool_start``/``tool_end`` events and
+    final-answer ``token`` events as the agent produces them, followed by a
+    ``final`` (or ``error``) event with the same fields as /query. The agent
+    run is cancelled if the client disconnects.
+
+    A query that needs the agent gets its admission slot before the stream
+    starts, so an overloaded server answers 429 or 503 with ``Retry-After``
+    like /query does.
+    """
+    if not request.message.strip():
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Message cannot be empty"
+        )
+
+    events = await get_currency_agent().open_stream(
+        request.message, session_id=request.session_id
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in events:
+                if await http_request.is_disconnected():
+                    break
+                yield _format_sse(event)
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,4 +1,7 @@
+from http import HTTPStatus
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from apps.api.startup import startup_report
 
 router = APIRouter(
     tags=["healthcheck"],
@@ -8,3 +11,12 @@ router = APIRouter(
 @router.get("/healthcheck", include_in_schema=True)
 async def healthcheck() -> dict:
     return {"status": "alive"}
+
+
+@router.get("/readiness", include_in_schema=True)
+async def readiness() -> JSONResponse:
+    """Report whether startup finished, with per-stage startup timings."""
+    status_code = (
+        HTTPStatus.OK if startup_report.ready else HTTPStatus.SERVICE_UNAVAILABLE
+    )
+    return JSONResponse(status_code=status_code, content=startup_report.as_dict())
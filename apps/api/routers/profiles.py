@@ -0,0 +1,27 @@
+import os
+from http import HTTPStatus
+from fastapi import APIRouter
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
+from apps.api.profiling import request_profiler
+
+router = APIRouter(
+    tags=["profiling"],
+)
+
+
+@router.get("/profiles/{profile_id}", include_in_schema=False)
+async def download_profile(profile_id: str) -> FileResponse:
+    """Download a saved request profile.
+
+    The file is in ``pstats`` format: open it with ``python -m pstats`` or a
+    viewer such as snakeviz.
+    """
+    path = request_profiler.path_for(profile_id)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Profile not found"
+        )
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.prof"
+    )
@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Captured when the ``apps.api`` package is first imported, which is the
+# earliest point a worker runs any application code.
+PROCESS_STARTED_AT = time.perf_counter()
+
+
+class StartupReport:
+    """Timings of each startup stage and whether the worker is ready to serve."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.ready = False
+        self.error: Optional[str] = None
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = seconds
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Record how long the wrapped block takes under ``stage``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.record("total", time.perf_counter() - PROCESS_STARTED_AT)
+
+    def summary(self) -> str:
+        """One-line human-readable report of the stage timings."""
+        return ", ".join(
+            f"{stage} {seconds:.3f}s" for stage, seconds in self.stages.items()
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "stages_seconds": dict(self.stages),
+        }
+
+
+startup_report = StartupReport()
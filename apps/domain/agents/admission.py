@@ -0,0 +1,241 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from apps.api.config import settings
+from apps.domain.exceptions import (
+    AdmissionQueueFullError,
+    AdmissionTimeoutError,
+    ModelRateLimitError,
+)
+from apps.domain.metrics import AGENT_ADMISSION_QUEUE_DEPTH, AGENT_ADMISSION_WAIT
+
+
+class _Waiter:
+    """A queued run; ``granted`` is set under the controller lock on admission."""
+
+    __slots__ = ("granted", "wake")
+
+    def __init__(self, wake: Callable[[], None]):
+        self.granted = False
+        self.wake = wake
+
+
+class AdmissionSlot:
+    """A slot taken ahead of the run that uses it; releasing it twice is a no-op."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller.release()
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionController:
+    """Caps concurrent agent runs for one model provider.
+
+    At most ``max_concurrent`` runs hold a slot; up to ``max_queue`` more wait
+    for one, first come first served, for at most ``queue_timeout_seconds``.
+    Beyond that callers fail fast with :class:`AdmissionQueueFullError`, and a
+    wait that times out raises :class:`AdmissionTimeoutError`; both carry
+    ``retry_after_seconds`` for the client. Slots are shared by the async and
+    sync paths, so waiters on either side are woken in order.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        retry_after_seconds: int,
+    ):
+        self.provider = provider
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _observe_wait(self, outcome: str, started: float) -> None:
+        if settings.metrics_enabled:
+            AGENT_ADMISSION_WAIT.labels(
+                provider=self.provider, outcome=outcome
+            ).observe(time.perf_counter() - started)
+
+    def _set_queue_depth(self) -> None:
+        if settings.metrics_enabled:
+            AGENT_ADMISSION_QUEUE_DEPTH.labels(provider=self.provider).set(
+                len(self._waiters)
+            )
+
+    def _enter(self, wake: Callable[[], None], started: float) -> Optional[_Waiter]:
+        """Take a free slot and return None, or queue a waiter and return it."""
+        with self._lock:
+            if self._in_flight < self.max_concurrent and not self._waiters:
+                self._in_flight += 1
+                return None
+
+            if len(self._waiters) >= self.max_queue:
+                self._observe_wait("queue_full", started)
+                raise AdmissionQueueFullError(
+                    f"All {self.max_concurrent} {self.provider} agent slots are busy "
+                    f"and {len(self._waiters)} requests are already waiting",
+                    self.retry_after_seconds,
+                )
+
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+            self._set_queue_depth()
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Drop a waiter that gave up; True if it was handed a slot in the meantime."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            self._set_queue_depth()
+            return False
+
+    def _timed_out(self, started: float) -> AdmissionTimeoutError:
+        self._observe_wait("timeout", started)
+        return AdmissionTimeoutError(
+            f"Timed out after {self.queue_timeout_seconds:g} seconds waiting for a "
+            f"free {self.provider} agent slot",
+            self.retry_after_seconds,
+        )
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the oldest waiter if there is one."""
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+                self._set_queue_depth()
+                waiter.wake()
+            else:
+                self._in_flight -= 1
+
+    async def acquire(self) -> None:
+        """Wait for a slot on the event loop."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        waiter = self._enter(
+            lambda: loop.call_soon_threadsafe(_resolve, future), started
+        )
+
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(future, timeout=self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                if not self._abandon(waiter):
+                    raise self._timed_out(started)
+            except asyncio.CancelledError:
+                if self._abandon(waiter):
+                    self.release()
+                raise
+
+        self._observe_wait("admitted", started)
+
+    async def reserve(self) -> AdmissionSlot:
+        """Wait for a slot and return it, for callers that hand it on to a run."""
+        await self.acquire()
+        return AdmissionSlot(self)
+
+    def acquire_sync(self) -> None:
+        """Synchronous version of acquire; blocks the calling thread."""
+        started = time.perf_counter()
+        event = threading.Event()
+        waiter = self._enter(event.set, started)
+
+        if waiter is not None and not event.wait(self.queue_timeout_seconds):
+            if not self._abandon(waiter):
+                raise self._timed_out(started)
+
+        self._observe_wait("admitted", started)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def slot_sync(self) -> Iterator[None]:
+        self.acquire_sync()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def model_rate_limit_error(error: BaseException) -> Optional[ModelRateLimitError]:
+    """Translate a provider's HTTP 429 into a :class:`ModelRateLimitError`.
+
+    Both ``openai.RateLimitError`` and Ollama's ``ResponseError`` carry a
+    ``status_code``; the provider's ``Retry-After`` header is passed on when
+    it has one.
+    """
+    if getattr(error, "status_code", None) != 429:
+        return None
+
+    retry_after = settings.admission_retry_after_seconds
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    header = headers.get("retry-after")
+    if header and str(header).isdigit():
+        retry_after = int(header)
+    return ModelRateLimitError(
+        f"Model provider is rate limiting requests: {error}", retry_after
+    )
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def _max_concurrent_runs(provider: str) -> int:
+    if provider == "ollama":
+        return settings.admission_max_concurrent_runs_ollama
+    return settings.admission_max_concurrent_runs_openai
+
+
+def get_admission_controller(provider: str) -> AdmissionController:
+    """Return the shared controller for a model provider, creating it on first use."""
+    provider = provider.lower()
+    with _controllers_lock:
+        controller = _controllers.get(provider)
+        if controller is None:
+            controller = AdmissionController(
+                provider,
+                max_concurrent=_max_concurrent_runs(provider),
+                max_queue=settings.admission_max_queue,
+                queue_timeout_seconds=settings.admission_queue_timeout_seconds,
+                retry_after_seconds=settings.admission_retry_after_seconds,
+            )
+            _controllers[provider] = controller
+        return controller
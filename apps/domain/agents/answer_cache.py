@@ -0,0 +1,134 @@
+import hashlib
+import importlib
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from apps.api.config import settings
+
+_PUNCTUATION = re.compile(r"[\s?!.,;:]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Reduce a query to a canonical form so trivial rephrasings share a key."""
+    normalized = " ".join(query.lower().replace("’", "'").split())
+    return _PUNCTUATION.sub("", normalized)
+
+
+class AnswerCacheBackend(ABC):
+    """Storage interface for cached answers.
+
+    Subclass this to share answers between workers (for example backed by
+    Redis or memcached) and point ``ANSWER_CACHE_BACKEND`` at the class.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class InMemoryAnswerCacheBackend(AnswerCacheBackend):
+    """Process-local LRU backend bounded to ``max_size`` answers."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def load_backend(path: Optional[str], max_size: int) -> AnswerCacheBackend:
+    """Instantiate the backend named by ``module:ClassName``, or the default."""
+    if not path:
+        return InMemoryAnswerCacheBackend(max_size=max_size)
+
+    module_name, _, class_name = path.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(backend_class, type) or not issubclass(
+        backend_class, AnswerCacheBackend
+    ):
+        raise TypeError(f"{path} is not an AnswerCacheBackend subclass")
+    return backend_class()
+
+
+class AnswerCache:
+    """Cache of agent answers keyed on the query, the model and the rate version.
+
+    Including the rate snapshot version in the key means cached answers stop
+    matching as soon as the rates refresh, without explicit invalidation.
+    """
+
+    def __init__(self, backend: AnswerCacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        query: str, model_provider: str, model_name: str, rate_version: str
+    ) -> str:
+        """Build the cache key for a query answered by a model from a rate snapshot."""
+        raw = "\x1f".join(
+            (model_provider.lower(), model_name, rate_version, normalize_query(query))
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.backend.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+
+
+# Process-wide answer cache shared by every agent instance
+answer_cache = AnswerCache(
+    load_backend(settings.answer_cache_backend, settings.answer_cache_max_size)
+)
@@ -1,15 +1,85 @@
-from typing import List, Dict, Any, Union
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional
 from langchain.agents import (
     create_openai_tools_agent,
     create_react_agent,
+    create_tool_calling_agent,
     AgentExecutor,
 )
 from langchain.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
-from apps.domain.tools.currency_tool import CurrencyRateTool, SpecificCurrencyRateTool
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig, RunnablePassthrough
+from apps.domain.tools.currency_tool import (
+    CurrencyConversionTool,
+    CurrencyRateTool,
+    HistoricalRateTool,
+    SpecificCurrencyRateTool,
+)
+from apps.domain.agents.admission import (
+    AdmissionController,
+    AdmissionSlot,
+    get_admission_controller,
+    model_rate_limit_error,
+)
+from apps.domain.agents.answer_cache import AnswerCache, answer_cache
+from apps.domain.agents.executor import ConcurrentToolExecutor
+from apps.domain.agents.sessions import Session, reusing_tool_results, session_store
+from apps.domain.agents.ollama_capabilities import ollama_supports_tools
+from apps.domain.agents.fast_path import conversion_answer, parse_conversion_query
+from apps.domain.agents.token_usage import (
+    TokenUsageCallbackHandler,
+    trim_intermediate_steps,
+)
+from apps.domain.exceptions import OverloadedError, RateProviderError
+from apps.domain.metrics import MetricsCallbackHandler
+from apps.domain.rates.client import rate_client
+from apps.domain.tools.rate_answers import RateAnswer, collecting_rate_answers
 from apps.api.config import settings
 
+SERVED_BY_FAST_PATH = "fast_path"
+SERVED_BY_AGENT = "agent"
+SERVED_BY_CACHE = "cache"
+
+AGENT_TYPE_OPENAI_TOOLS = "openai_tools"
+AGENT_TYPE_REACT = "react"
+AGENT_TYPE_TOOL_CALLING = "tool_calling"
+
+OLLAMA_TOOL_CALLING_AUTO = "auto"
+OLLAMA_TOOL_CALLING_ON = "on"
+
+# ReAct models stream their Thought/Action text too; only text after this
+# marker is part of the answer shown to the user.
+REACT_FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Compact prompt mode: prompt tokens dominate latency on local models, so these
+# drop the examples and restate only what the model needs to call the tools.
+COMPACT_SYSTEM_PROMPT = (
+    "You are a currency exchange assistant. Tools:\n"
+    "- get_specific_currency_rate: the rate of one currency pair\n"
+    "- get_currency_rates: all rates of one base currency\n"
+    "- convert_currency_amount: one amount into several currencies at once\n"
+    "{history_tool}"
+    "Only quote rates returned by the tools, answer briefly and say when the "
+    "rates were last updated."
+)
+COMPACT_HISTORY_TOOL = "- get_historical_rates: past rates or recent changes\n"
+
+COMPACT_REACT_PROMPT = """Answer currency questions using only rates from these tools:
+
+{tools}
+
+Format:
+Thought: what to do next
+Action: one of [{tool_names}]
+Action Input: the tool input
+Observation: the tool result
+... (repeat Thought/Action/Action Input/Observation as needed)
+Final Answer: the answer, including when the rates were last updated
+
+{chat_history}Question: {input}
+Thought:{agent_scratchpad}"""
+
 
 class CurrencyExchangeAgent:
     """LangChain agent for currency exchange queries using OpenAI or Ollama."""
@@ -18,11 +88,23 @@ class CurrencyExchangeAgent:
         """Initialize the currency exchange agent."""
         self.llm = self._create_llm()
         self.tools = self._create_tools()
+        self.agent_type = AGENT_TYPE_OPENAI_TOOLS
         self.agent_executor = self._create_agent_executor()
+        self.admission: Optional[AdmissionController] = (
+            get_admission_controller(settings.model_provider)
+            if settings.admission_enabled
+            else None
+        )
 
-    def _create_llm(self) -> Union[ChatOpenAI, ChatOllama]:
-        """Create LLM instance based on configured provider."""
+    def _create_llm(self) -> BaseChatModel:
+        """Create LLM instance based on configured provider.
+
+        Only the configured provider's package is imported, so workers do not
+        pay for loading the other one.
+        """
         if settings.model_provider.lower() == "ollama":
+            from langchain_ollama import ChatOllama
+
             print(f"Initializing Ollama model: {settings.model_name}")
             return ChatOllama(
                 model=settings.model_name,
@@ -31,6 +113,8 @@ class CurrencyExchangeAgent:
                 num_predict=settings.model_max_tokens,
             )
         else:
+            from langchain_openai import ChatOpenAI
+
             print(f"Initializing OpenAI model: {settings.model_name}")
             return ChatOpenAI(
                 api_key=settings.openai_api_key,
@@ -41,19 +125,127 @@ class CurrencyExchangeAgent:
 
     def _create_tools(self) -> List:
         """Create and return the currency exchange tools."""
-        return [CurrencyRateTool(), SpecificCurrencyRateTool()]
+        tool_classes = [
+            CurrencyRateTool,
+            SpecificCurrencyRateTool,
+            CurrencyConversionTool,
+        ]
+        # Past rates only exist when the service records its own history.
+        if rate_client.history is not None:
+            tool_classes.append(HistoricalRateTool)
+
+        if settings.prompt_compact:
+            return [
+                tool_class(compact=True, description=tool_class.compact_description)
+                for tool_class in tool_classes
+            ]
+        return [tool_class() for tool_class in tool_classes]
+
+    @staticmethod
+    def _with_scratchpad_cap(agent: Runnable) -> Runnable:
+        """In compact mode, drop the oldest agent steps beyond the scratchpad budget."""
+        if not settings.prompt_compact:
+            return agent
+
+        max_tokens = settings.prompt_scratchpad_max_tokens
+        return (
+            RunnablePassthrough.assign(
+                intermediate_steps=lambda x: trim_intermediate_steps(
+                    x["intermediate_steps"], max_tokens
+                )
+            )
+            | agent
+        )
 
     def _create_agent_executor(self) -> AgentExecutor:
         """Create the agent executor with tools and prompt."""
 
         if settings.model_provider.lower() == "ollama":
+            if self._ollama_tool_calling_enabled():
+                self.agent_type = AGENT_TYPE_TOOL_CALLING
+                return self._create_tool_calling_agent_executor()
+            self.agent_type = AGENT_TYPE_REACT
             return self._create_react_agent_executor()
         else:
+            self.agent_type = AGENT_TYPE_OPENAI_TOOLS
             return self._create_openai_tools_agent_executor()
 
+    @staticmethod
+    def _ollama_tool_calling_enabled() -> bool:
+        """Decide whether the Ollama model gets native tool calls or text ReAct."""
+        mode = settings.ollama_tool_calling.lower()
+        if mode == OLLAMA_TOOL_CALLING_AUTO:
+            supported = ollama_supports_tools(
+                settings.ollama_base_url, settings.model_name
+            )
+            print(
+                f"Ollama model {settings.model_name} "
+                f"{'supports' if supported else 'does not support'} tool calling"
+            )
+            return supported
+        return mode == OLLAMA_TOOL_CALLING_ON
+
+    def _tools_agent_executor(self, agent: Runnable) -> AgentExecutor:
+        """Wrap a tool-calling agent runnable in an executor."""
+        return ConcurrentToolExecutor(
+            agent=self._with_scratchpad_cap(agent),
+            tools=self.tools,
+            verbose=settings.agent_verbose,
+            max_parallel_tool_calls=settings.agent_max_parallel_tool_calls,
+            tool_timeout_seconds=settings.agent_tool_timeout_seconds or None,
+            direct_tool_answers=settings.agent_direct_answers,
+            handle_parsing_errors=True,
+            max_iterations=3,
+        )
+
     def _create_openai_tools_agent_executor(self) -> AgentExecutor:
         """Create OpenAI tools agent executor."""
-        prompt = ChatPromptTemplate.from_messages(
+        agent = create_openai_tools_agent(
+            llm=self.llm, tools=self.tools, prompt=self._tools_prompt()
+        )
+        return self._tools_agent_executor(agent)
+
+    def _create_tool_calling_agent_executor(self) -> AgentExecutor:
+        """Create a native tool-calling agent executor for Ollama models."""
+        agent = create_tool_calling_agent(
+            llm=self.llm, tools=self.tools, prompt=self._tools_prompt()
+        )
+        return self._tools_agent_executor(agent)
+
+    @staticmethod
+    def _tools_prompt() -> ChatPromptTemplate:
+        """Return the chat prompt shared by the tool-calling agent flavours."""
+        has_history = rate_client.history is not None
+        if settings.prompt_compact:
+            return ChatPromptTemplate.from_messages(
+                [
+                    (
+                        "system",
+                        COMPACT_SYSTEM_PROMPT.format(
+                            history_tool=COMPACT_HISTORY_TOOL if has_history else ""
+                        ),
+                    ),
+                    ("placeholder", "{chat_history}"),
+                    ("user", "{input}"),
+                    ("placeholder", "{agent_scratchpad}"),
+                ]
+            )
+
+        if has_history:
+            history_rules = """4. Use the get_historical_rates tool for the rate on a past date or how a rate changed over the last N days
+5. Always provide the most current information available
+6. Be helpful and explain the rates in a user-friendly way
+7. History only covers days this service has recorded; say so when a date is not available, and never predict future rates
+"""
+            history_example = '- "How has EUR to USD changed over the last 30 days?"\n'
+        else:
+            history_rules = """4. Always provide the most current information available
+5. Be helpful and explain the rates in a user-friendly way
+6. If asked about trends or predictions, remind users that you only have current rates, not historical data or predictions
+"""
+            history_example = ""
+
+        return ChatPromptTemplate.from_messages(
             [
                 (
                     "system",
@@ -62,18 +254,18 @@ class CurrencyExchangeAgent:
 When users ask about currency rates or conversions:
 1. Use the get_currency_rates tool to get general exchange rates for a base currency
 2. Use the get_specific_currency_rate tool to get conversion rates between two specific currencies
-3. Always provide the most current information available
-4. Be helpful and explain the rates in a user-friendly way
-5. If asked about trends or predictions, remind users that you only have current rates, not historical data or predictions
-
+3. Use the convert_currency_amount tool to convert an amount into several currencies in a single call
+{history_rules}
 You can handle queries like:
 - "What's the current USD to EUR rate?"
 - "Show me exchange rates for GBP"
 - "How much is 100 USD in Japanese Yen?"
-- "What are the current exchange rates?"
+- "How much is 250 EUR in USD, GBP, JPY and CHF?"
+{history_example}- "What are the current exchange rates?"
 
 Always be clear about when the rates were last updated and provide accurate, helpful information.""",
                 ),
+                ("placeholder", "{chat_history}"),
                 ("user", "{input}"),
                 (
                     "assistant",
@@ -83,16 +275,6 @@ Always be clear about when the rates were last updated and provide accurate, hel
             ]
         )
 
-        agent = create_openai_tools_agent(llm=self.llm, tools=self.tools, prompt=prompt)
-
-        return AgentExecutor(
-            agent=agent,
-            tools=self.tools,
-            verbose=True,
-            handle_parsing_errors=True,
-            max_iterations=3,
-        )
-
     def _create_react_agent_executor(self) -> AgentExecutor:
         """Create ReAct agent executor for Ollama models."""
         prompt_template = """You are a helpful currency exchange assistant. You have access to tools that provide real-time currency exchange rates.
@@ -118,52 +300,572 @@ IMPORTANT RULES:
 2. Always start by using the appropriate tool to get real-time data
 3. For general rate queries, use get_currency_rates
 4. For specific currency pair queries, use get_specific_currency_rate
-5. Always provide the timestamp when rates were last updated
-6. Be helpful and explain the rates clearly
-
+5. To convert an amount into several currencies, use convert_currency_amount once with all targets
+{history_rules}
 Begin!
 
-Question: {input}
+{chat_history}Question: {input}
 Thought: I need to get current exchange rate information using the available tools.
 {agent_scratchpad}"""
 
-        prompt = ChatPromptTemplate.from_template(prompt_template)
+        if rate_client.history is not None:
+            history_rules = """6. For past dates or changes over recent days, use get_historical_rates
+7. Always provide the timestamp when rates were last updated
+8. Be helpful and explain the rates clearly
+"""
+        else:
+            history_rules = """6. Always provide the timestamp when rates were last updated
+7. Be helpful and explain the rates clearly
+8. If asked about trends or predictions, explain that you only have current rates, not historical data or predictions
+"""
+        prompt_template = prompt_template.replace("{history_rules}", history_rules)
+
+        if settings.prompt_compact:
+            prompt_template = COMPACT_REACT_PROMPT
+        # Sessions fill in the earlier conversation; stateless queries leave it empty.
+        prompt = ChatPromptTemplate.from_template(prompt_template).partial(
+            chat_history=""
+        )
 
         agent = create_react_agent(llm=self.llm, tools=self.tools, prompt=prompt)
 
-        return AgentExecutor(
-            agent=agent,
+        return ConcurrentToolExecutor(
+            agent=self._with_scratchpad_cap(agent),
             tools=self.tools,
-            verbose=True,
+            verbose=settings.agent_verbose,
+            max_parallel_tool_calls=settings.agent_max_parallel_tool_calls,
+            tool_timeout_seconds=settings.agent_tool_timeout_seconds or None,
+            # ReAct takes one action per turn, so its first lookup never shows
+            # that nothing else was going to be asked.
+            direct_tool_answers=False,
             handle_parsing_errors=True,
             max_iterations=5,
             return_intermediate_steps=True,
         )
 
-    async def process_query(self, query: str) -> Dict[str, Any]:
-        """Process a user query and return the response."""
+    async def _try_fast_path(self, query: str) -> Optional[RateAnswer]:
+        """Answer simple conversion queries from rate data without the LLM.
+
+        Returns None when the query is not a plain conversion or the rates are
+        unavailable, in which case the agent handles it.
+        """
+        if not settings.fast_path_enabled:
+            return None
+
+        intent = parse_conversion_query(query)
+        if intent is None:
+            return None
+
+        try:
+            matrix = await rate_client.aget_matrix()
+        except RateProviderError:
+            return None
+
+        return conversion_answer(intent, matrix)
+
+    def _try_fast_path_sync(self, query: str) -> Optional[RateAnswer]:
+        """Synchronous version of _try_fast_path."""
+        if not settings.fast_path_enabled:
+            return None
+
+        intent = parse_conversion_query(query)
+        if intent is None:
+            return None
+
+        try:
+            matrix = rate_client.get_matrix()
+        except RateProviderError:
+            return None
+
+        return conversion_answer(intent, matrix)
+
+    def _run_config(self, token_usage: TokenUsageCallbackHandler) -> RunnableConfig:
+        """Return the per-run config, with a fresh metrics handler when enabled."""
+        callbacks = [token_usage]
+        if settings.metrics_enabled:
+            callbacks.append(MetricsCallbackHandler(agent_type=self.agent_type))
+        return {"callbacks": callbacks}
+
+    @asynccontextmanager
+    async def _agent_slot(self) -> AsyncIterator[None]:
+        """Hold an admission slot for one agent run, if admission control is on."""
+        if self.admission is None:
+            yield
+            return
+        async with self.admission.slot():
+            yield
+
+    @contextmanager
+    def _agent_slot_sync(self) -> Iterator[None]:
+        """Synchronous version of _agent_slot."""
+        if self.admission is None:
+            yield
+            return
+        with self.admission.slot_sync():
+            yield
+
+    @staticmethod
+    def _report_token_usage(token_usage: TokenUsageCallbackHandler) -> Dict[str, int]:
+        """Return a run's token counts, recording them as metrics when enabled."""
+        if settings.metrics_enabled:
+            token_usage.usage.observe()
+        return token_usage.usage.as_dict()
+
+    @staticmethod
+    def _answer_cache_key(query: str, rate_version: str) -> str:
+        """Build the answer cache key for a query against a rate snapshot version."""
+        return AnswerCache.make_key(
+            query, settings.model_provider, settings.model_name, rate_version
+        )
+
+    async def _get_answer_cache_key(
+        self, query: str, session: Optional[Session] = None
+    ) -> Optional[str]:
+        """Return the answer cache key for a query, or None if caching is unavailable.
+
+        Follow-ups in a session depend on the earlier turns, so they are never cached.
+        """
+        if not settings.answer_cache_enabled or (
+            session is not None and session.has_history
+        ):
+            return None
+
+        try:
+            matrix = await rate_client.aget_matrix()
+        except RateProviderError:
+            return None
+
+        return self._answer_cache_key(query, matrix.version)
+
+    def _get_answer_cache_key_sync(
+        self, query: str, session: Optional[Session] = None
+    ) -> Optional[str]:
+        """Synchronous version of _get_answer_cache_key."""
+        if not settings.answer_cache_enabled or (
+            session is not None and session.has_history
+        ):
+            return None
+
         try:
-            result = await self.agent_executor.ainvoke({"input": query})
+            matrix = rate_client.get_matrix()
+        except RateProviderError:
+            return None
+
+        return self._answer_cache_key(query, matrix.version)
+
+    @staticmethod
+    async def _bind_session_rates(session: Optional[Session]) -> None:
+        """Tie the session's reusable tool results to the current rate snapshot."""
+        if session is None:
+            return
+        try:
+            version: Optional[str] = (await rate_client.aget_matrix()).version
+        except RateProviderError:
+            version = None
+        session.tool_results.set_rate_version(version)
+
+    @staticmethod
+    def _bind_session_rates_sync(session: Optional[Session]) -> None:
+        """Synchronous version of _bind_session_rates."""
+        if session is None:
+            return
+        try:
+            version: Optional[str] = rate_client.get_matrix().version
+        except RateProviderError:
+            version = None
+        session.tool_results.set_rate_version(version)
+
+    def _agent_inputs(self, query: str, session: Optional[Session]) -> Dict[str, Any]:
+        """Build the agent input, with the session's earlier turns if it has any."""
+        inputs: Dict[str, Any] = {"input": query}
+        if session is not None and session.has_history:
+            if self.agent_type == AGENT_TYPE_REACT:
+                inputs["chat_history"] = session.history_text()
+            else:
+                inputs["chat_history"] = session.history_messages()
+        return inputs
+
+    @staticmethod
+    def _remember_turn(session: Optional[Session], query: str, response: str) -> None:
+        """Add an answered query to its session, if it has one."""
+        if session is not None:
+            session_store.record(session, query, response)
+
+    @staticmethod
+    def _answer_data(answer: Optional[RateAnswer]) -> Optional[Dict[str, Any]]:
+        """Return the structured fields of an answer for the result dict."""
+        return answer.as_dict() if answer is not None else None
+
+    @staticmethod
+    def _cached_result(cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a cached answer as a query result, if there is one."""
+        if cache_key is None:
+            return None
+
+        cached = answer_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        return {
+            "success": True,
+            "response": cached["response"],
+            "error": None,
+            "served_by": SERVED_BY_CACHE,
+            "answer": cached.get("answer"),
+        }
+
+    async def process_query(
+        self, query: str, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process a user query and return the response.
+
+        With a ``session_id`` the query is answered in the context of that
+        session's earlier turns, and the answer becomes part of the session.
+        """
+        session = session_store.get(session_id) if session_id else None
+        try:
+            fast_answer = await self._try_fast_path(query)
+            if fast_answer is not None:
+                response = fast_answer.describe()
+                self._remember_turn(session, query, response)
+                return {
+                    "success": True,
+                    "response": response,
+                    "error": None,
+                    "served_by": SERVED_BY_FAST_PATH,
+                    "answer": fast_answer.as_dict(),
+                }
+
+            cache_key = await self._get_answer_cache_key(query, session)
+            cached_result = self._cached_result(cache_key)
+            if cached_result is not None:
+                self._remember_turn(session, query, cached_result["response"])
+                return cached_result
+
+            await self._bind_session_rates(session)
+            token_usage = TokenUsageCallbackHandler()
+            with reusing_tool_results(session.tool_results if session else None):
+                with collecting_rate_answers(query) as answers:
+                    async with self._agent_slot():
+                        result = await self.agent_executor.ainvoke(
+                            self._agent_inputs(query, session),
+                            config=self._run_config(token_usage),
+                        )
+            response = result.get("output", "")
+            answer = self._answer_data(answers.single_answer)
+
+            if cache_key is not None:
+                answer_cache.set(cache_key, {"response": response, "answer": answer})
+            self._remember_turn(session, query, response)
 
             return {
                 "success": True,
-                "response": result.get("output", ""),
+                "response": response,
                 "error": None,
+                "served_by": SERVED_BY_AGENT,
+                "token_usage": self._report_token_usage(token_usage),
+                "answer": answer,
             }
 
+        except OverloadedError:
+            raise
         except Exception as e:
-            return {"success": False, "response": "", "error": str(e)}
+            rate_limited = model_rate_limit_error(e)
+            if rate_limited is not None:
+                raise rate_limited from e
+            return {
+                "success": False,
+                "response": "",
+                "error": str(e),
+                "served_by": SERVED_BY_AGENT,
+            }
+
+    async def process_batch(
+        self,
+        queries: List[str],
+        max_concurrency: int,
+        session_ids: Optional[List[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Process several queries concurrently, returning results in input order.
+
+        At most ``max_concurrency`` agent runs are in flight at once. The rate
+        matrix is loaded once up front so every query in the batch shares it.
+        ``session_ids``, if given, holds each query's optional session id.
+        """
+        try:
+            await rate_client.aget_matrix()
+        except RateProviderError:
+            pass  # each query reports its own rate errors
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(query: str, session_id: Optional[str]) -> Dict[str, Any]:
+            if not query.strip():
+                return {
+                    "success": False,
+                    "response": "",
+                    "error": "Message cannot be empty",
+                    "served_by": SERVED_BY_AGENT,
+                }
+            async with semaphore:
+                try:
+                    return await self.process_query(query, session_id=session_id)
+                except OverloadedError as e:
+                    return {
+                        "success": False,
+                        "response": "",
+                        "error": str(e),
+                        "served_by": SERVED_BY_AGENT,
+                    }
 
-    def process_query_sync(self, query: str) -> Dict[str, Any]:
+        if session_ids is None:
+            session_ids = [None] * len(queries)
+        return await asyncio.gather(
+            *(run(query, session_id) for query, session_id in zip(queries, session_ids))
+        )
+
+    def process_query_sync(
+        self, query: str, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Synchronous version of process_query."""
+        session = session_store.get(session_id) if session_id else None
         try:
-            result = self.agent_executor.invoke({"input": query})
+            fast_answer = self._try_fast_path_sync(query)
+            if fast_answer is not None:
+                response = fast_answer.describe()
+                self._remember_turn(session, query, response)
+                return {
+                    "success": True,
+                    "response": response,
+                    "error": None,
+                    "served_by": SERVED_BY_FAST_PATH,
+                    "answer": fast_answer.as_dict(),
+                }
+
+            cache_key = self._get_answer_cache_key_sync(query, session)
+            cached_result = self._cached_result(cache_key)
+            if cached_result is not None:
+                self._remember_turn(session, query, cached_result["response"])
+                return cached_result
+
+            self._bind_session_rates_sync(session)
+            token_usage = TokenUsageCallbackHandler()
+            with reusing_tool_results(session.tool_results if session else None):
+                with collecting_rate_answers(query) as answers:
+                    with self._agent_slot_sync():
+                        result = self.agent_executor.invoke(
+                            self._agent_inputs(query, session),
+                            config=self._run_config(token_usage),
+                        )
+            response = result.get("output", "")
+            answer = self._answer_data(answers.single_answer)
+
+            if cache_key is not None:
+                answer_cache.set(cache_key, {"response": response, "answer": answer})
+            self._remember_turn(session, query, response)
 
             return {
                 "success": True,
-                "response": result.get("output", ""),
+                "response": response,
                 "error": None,
+                "served_by": SERVED_BY_AGENT,
+                "token_usage": self._report_token_usage(token_usage),
+                "answer": answer,
+            }
+
+        except OverloadedError:
+            raise
+        except Exception as e:
+            rate_limited = model_rate_limit_error(e)
+            if rate_limited is not None:
+                raise rate_limited from e
+            return {
+                "success": False,
+                "response": "",
+                "error": str(e),
+                "served_by": SERVED_BY_AGENT,
             }
 
+    @staticmethod
+    def _final_answer_delta(buffers: Dict[str, str], run_id: str, content: str) -> str:
+        """Return the part of a ReAct token that belongs to the final answer."""
+        previous = buffers.get(run_id, "")
+        text = previous + content
+        buffers[run_id] = text
+
+        marker_index = text.find(REACT_FINAL_ANSWER_MARKER)
+        if marker_index < 0:
+            return ""
+
+        answer_start = marker_index + len(REACT_FINAL_ANSWER_MARKER)
+        if len(previous) <= answer_start:
+            return text[answer_start:].lstrip()
+        return text[len(previous) :]
+
+    @staticmethod
+    def _error_event(error: Exception) -> Dict[str, Any]:
+        return {
+            "event": "error",
+            "data": {
+                "success": False,
+                "response": "",
+                "error": str(error),
+                "served_by": SERVED_BY_AGENT,
+            },
+        }
+
+    @staticmethod
+    async def _replay(*events: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        for event in events:
+            yield event
+
+    async def open_stream(
+        self, query: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Start streaming a query, refusing it up front if the agent is saturated.
+
+        The fast path and the answer cache are tried first; an answer from
+        either streams as a single ``final`` event without an admission slot.
+        Otherwise a slot is reserved before the stream is returned, so an
+        overloaded server raises :class:`OverloadedError` here instead of
+        sending an ``error`` event. Events are as in :meth:`stream_query`.
+        """
+        session = session_store.get(session_id) if session_id else None
+        try:
+            fast_answer = await self._try_fast_path(query)
+            if fast_answer is not None:
+                response = fast_answer.describe()
+                self._remember_turn(session, query, response)
+                return self._replay(
+                    {
+                        "event": "final",
+                        "data": {
+                            "success": True,
+                            "response": response,
+                            "error": None,
+                            "served_by": SERVED_BY_FAST_PATH,
+                            "answer": fast_answer.as_dict(),
+                        },
+                    }
+                )
+
+            cache_key = await self._get_answer_cache_key(query, session)
+            cached_result = self._cached_result(cache_key)
+            if cached_result is not None:
+                self._remember_turn(session, query, cached_result["response"])
+                return self._replay({"event": "final", "data": cached_result})
+        except Exception as e:
+            return self._replay(self._error_event(e))
+
+        slot = await self.admission.reserve() if self.admission is not None else None
+        return self._stream_agent(query, session, cache_key, slot)
+
+    async def stream_query(
+        self, query: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream tool and final-answer token events for a query as they happen.
+
+        Yields dicts with an ``event`` name (``tool_start``, ``tool_end``,
+        ``token``, ``final`` or ``error``) and a ``data`` payload. Closing the
+        iterator cancels the underlying agent run. ``session_id`` works as in
+        :meth:`process_query`. An overloaded server is reported as an
+        ``error`` event; use :meth:`open_stream` to refuse the query instead.
+        """
+        try:
+            events = await self.open_stream(query, session_id)
+        except OverloadedError as e:
+            yield self._error_event(e)
+            return
+
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+
+    async def _stream_agent(
+        self,
+        query: str,
+        session: Optional[Session],
+        cache_key: Optional[str],
+        slot: Optional[AdmissionSlot],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream one agent run, releasing its admission ``slot`` at the end."""
+        events = None
+        try:
+            await self._bind_session_rates(session)
+            react_buffers: Dict[str, str] = {}
+            token_usage = TokenUsageCallbackHandler()
+            events = self.agent_executor.astream_events(
+                self._agent_inputs(query, session),
+                config=self._run_config(token_usage),
+                version="v2",
+            )
+            with reusing_tool_results(session.tool_results if session else None):
+                with collecting_rate_answers(query) as answers:
+                    async for event in events:
+                        kind = event["event"]
+
+                        if kind == "on_tool_start":
+                            yield {
+                                "event": "tool_start",
+                                "data": {
+                                    "tool": event["name"],
+                                    "input": event["data"].get("input"),
+                                },
+                            }
+
+                        elif kind == "on_tool_end":
+                            yield {
+                                "event": "tool_end",
+                                "data": {
+                                    "tool": event["name"],
+                                    "output": str(event["data"].get("output", "")),
+                                },
+                            }
+
+                        elif kind == "on_chat_model_stream":
+                            content = event["data"]["chunk"].content
+                            if not isinstance(content, str) or not content:
+                                continue
+                            if self.agent_type == AGENT_TYPE_REACT:
+                                content = self._final_answer_delta(
+                                    react_buffers, event["run_id"], content
+                                )
+                            if content:
+                                yield {
+                                    "event": "token",
+                                    "data": {"content": content},
+                                }
+
+                        elif kind == "on_chain_end" and not event.get("parent_ids"):
+                            output = event["data"].get("output") or {}
+                            response = output.get("output", "")
+                            answer = self._answer_data(answers.single_answer)
+                            if cache_key is not None:
+                                answer_cache.set(
+                                    cache_key,
+                                    {"response": response, "answer": answer},
+                                )
+                            self._remember_turn(session, query, response)
+                            yield {
+                                "event": "final",
+                                "data": {
+                                    "success": True,
+                                    "response": response,
+                                    "error": None,
+                                    "served_by": SERVED_BY_AGENT,
+                                    "token_usage": self._report_token_usage(
+                                        token_usage
+                                    ),
+                                    "answer": answer,
+                                },
+                            }
+
         except Exception as e:
-            return {"success": False, "response": "", "error": str(e)}
+            yield self._error_event(e)
+        finally:
+            if slot is not None:
+                slot.release()
+            if events is not None:
+                await events.aclose()
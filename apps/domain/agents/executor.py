@@ -0,0 +1,131 @@
+import asyncio
+import time
+import weakref
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentFinish, AgentStep
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForChainRun,
+    CallbackManagerForChainRun,
+)
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+from apps.domain.agents.sessions import remember_tool_step, reused_tool_step
+from apps.domain.metrics import TOOL_CALL_DURATION
+from apps.domain.tools.rate_answers import active_rate_answers
+
+
+class ConcurrentToolExecutor(AgentExecutor):
+    """AgentExecutor that bounds and times out concurrent tool calls.
+
+    On the async path every tool call of one model turn already runs
+    concurrently, so a turn costs the slowest call rather than the sum. This
+    caps how many of one run's calls are in flight at once and gives each call
+    ``tool_timeout_seconds``. A call that times out becomes an error
+    observation the model can react to instead of failing the whole run.
+
+    Within a session, a call the model already made against the same rate
+    snapshot returns the earlier result without running the tool again.
+
+    With ``direct_tool_answers``, a run whose first and only tool call was a
+    pair lookup or single conversion covering the whole query ends with that
+    result, phrased from its :class:`RateAnswer`, instead of a second model
+    turn that would only restate it.
+    """
+
+    max_parallel_tool_calls: int = 4
+    tool_timeout_seconds: Optional[float] = 10.0
+    direct_tool_answers: bool = True
+
+    # One semaphore per run, dropped once the run's tool calls are done.
+    _tool_slots: "weakref.WeakValueDictionary[UUID, asyncio.Semaphore]" = PrivateAttr(
+        default_factory=weakref.WeakValueDictionary
+    )
+
+    def _slots_for(
+        self, run_manager: Optional[AsyncCallbackManagerForChainRun]
+    ) -> asyncio.Semaphore:
+        limit = max(1, self.max_parallel_tool_calls)
+        if run_manager is None:
+            return asyncio.Semaphore(limit)
+
+        slots = self._tool_slots.get(run_manager.run_id)
+        if slots is None:
+            slots = asyncio.Semaphore(limit)
+            self._tool_slots[run_manager.run_id] = slots
+        return slots
+
+    @staticmethod
+    def _count_tool_call() -> None:
+        answers = active_rate_answers()
+        if answers is not None:
+            answers.tool_calls += 1
+
+    def _get_tool_return(
+        self, next_step_output: Tuple[AgentAction, str]
+    ) -> Optional[AgentFinish]:
+        finish = super()._get_tool_return(next_step_output)
+        answers = active_rate_answers()
+        if finish is not None or not self.direct_tool_answers or answers is None:
+            return finish
+
+        answer = answers.answer_for(next_step_output[1])
+        if answer is None:
+            return None
+        return AgentFinish({"output": answer.describe()}, "")
+
+    def _perform_agent_action(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        agent_action: AgentAction,
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> AgentStep:
+        self._count_tool_call()
+        reused = reused_tool_step(agent_action)
+        if reused is not None:
+            return reused
+
+        step = super()._perform_agent_action(
+            name_to_tool_map, color_mapping, agent_action, run_manager
+        )
+        remember_tool_step(step)
+        return step
+
+    async def _aperform_agent_action(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        agent_action: AgentAction,
+        run_manager: Optional[AsyncCallbackManagerForChainRun] = None,
+    ) -> AgentStep:
+        self._count_tool_call()
+        reused = reused_tool_step(agent_action)
+        if reused is not None:
+            return reused
+
+        slots = self._slots_for(run_manager)
+        async with slots:
+            started = time.perf_counter()
+            try:
+                step = await asyncio.wait_for(
+                    super()._aperform_agent_action(
+                        name_to_tool_map, color_mapping, agent_action, run_manager
+                    ),
+                    timeout=self.tool_timeout_seconds,
+                )
+                remember_tool_step(step)
+                return step
+            except asyncio.TimeoutError:
+                TOOL_CALL_DURATION.labels(
+                    tool=agent_action.tool, status="timeout"
+                ).observe(time.perf_counter() - started)
+                return AgentStep(
+                    action=agent_action,
+                    observation=(
+                        f"Error: {agent_action.tool} timed out after "
+                        f"{self.tool_timeout_seconds:g} seconds"
+                    ),
+                )
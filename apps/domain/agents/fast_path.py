@@ -0,0 +1,125 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_index import currency_index
+from apps.domain.tools.rate_answers import RateAnswer
+
+# Currencies the fast path recognises by name or symbol; any other currency
+# must be given as a three-letter code. The names and symbols come from the
+# currency index, so they resolve exactly as the rate tools do, including the
+# index's default reading of common units such as "dollar" (USD) and "franc"
+# (CHF). Names it treats as ambiguous (peso, krona, ...) are left to the agent.
+FAST_PATH_CURRENCIES = frozenset(
+    "USD EUR GBP JPY CAD AUD NZD HKD SGD CHF CNY INR KRW RUB PLN UAH TRY ZAR BRL "
+    "MXN SEK NOK DKK".split()
+)
+
+_INDEXED_NAMES = currency_index.names_for(FAST_PATH_CURRENCIES)
+
+CURRENCY_NAMES: Dict[str, str] = {
+    name: code
+    for name, code in _INDEXED_NAMES.items()
+    if re.fullmatch(r"[a-z]+(?: [a-z]+)*", name)
+}
+CURRENCY_SYMBOLS: Dict[str, str] = {
+    symbol: code
+    for symbol, code in _INDEXED_NAMES.items()
+    if len(symbol) == 1 and not symbol.isalnum()
+}
+
+_NAME_ALTERNATION = "|".join(
+    re.escape(name) for name in sorted(CURRENCY_NAMES, key=len, reverse=True)
+)
+_CURRENCY = rf"(?:{_NAME_ALTERNATION}|[a-z]{{3}})"
+_NUMBER = r"(?:\d[\d,]*(?:\.\d+)?|\.\d+|an?|one)"
+_SYMBOL = "[" + re.escape("".join(CURRENCY_SYMBOLS)) + "]"
+
+_CONVERSION_PATTERN = re.compile(
+    rf"""
+    ^
+    (?:(?:what(?:'s|\s+is|\s+are)|how\s+much\s+is|convert|show(?:\s+me)?|tell\s+me|give\s+me|get)\s+)?
+    (?:the\s+)?
+    (?:(?:current|latest|today'?s|live)\s+)?
+    (?:(?:exchange|conversion)\s+)?(?:rate\s+(?:for|from|of)\s+)?
+    (?:
+        (?P<symbol>{_SYMBOL})\s*(?P<symbol_amount>{_NUMBER})
+        |
+        (?:(?P<amount>{_NUMBER})\s*)?(?P<from_currency>{_CURRENCY})
+    )
+    \s*(?:to|in|into|/|->|=|vs\.?)\s*
+    (?P<to_currency>{_CURRENCY})
+    (?:\s+(?:exchange\s+|conversion\s+)?rates?)?
+    (?:\s+(?:right\s+)?(?:now|today))?
+    \s*[?.!]*
+    $
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True)
+class ConversionIntent:
+    """A currency conversion request recognised without the LLM."""
+
+    from_currency: str
+    to_currency: str
+    amount: Optional[float] = None
+
+
+def _resolve_currency(token: str) -> str:
+    """Map a matched currency name or code to its ISO code."""
+    token = " ".join(token.split())
+    return CURRENCY_NAMES.get(token, token.upper())
+
+
+def _parse_amount(value: Optional[str]) -> Optional[float]:
+    """Parse a matched amount, treating 'a'/'an'/'one' as 1."""
+    if value is None:
+        return None
+    if value in ("a", "an", "one"):
+        return 1.0
+    return float(value.replace(",", ""))
+
+
+def parse_conversion_query(query: str) -> Optional[ConversionIntent]:
+    """Recognise simple 'amount FROM to TO' queries.
+
+    Returns None whenever the query does not fully match one of the known
+    shapes, so that anything ambiguous is left to the agent.
+    """
+    normalized = " ".join(query.lower().replace("’", "'").split())
+    match = _CONVERSION_PATTERN.match(normalized)
+    if match is None:
+        return None
+
+    if match.group("symbol"):
+        from_currency = CURRENCY_SYMBOLS[match.group("symbol")]
+        amount = _parse_amount(match.group("symbol_amount"))
+    else:
+        from_currency = _resolve_currency(match.group("from_currency"))
+        amount = _parse_amount(match.group("amount"))
+
+    return ConversionIntent(
+        from_currency=from_currency,
+        to_currency=_resolve_currency(match.group("to_currency")),
+        amount=amount,
+    )
+
+
+def conversion_answer(
+    intent: ConversionIntent, matrix: RateMatrix
+) -> Optional[RateAnswer]:
+    """Answer a parsed intent from the rate matrix as structured data.
+
+    Returns None if either currency is unknown, so the caller can fall back
+    to the agent.
+    """
+    if intent.from_currency not in matrix or intent.to_currency not in matrix:
+        return None
+
+    amount = 1.0 if intent.amount is None else intent.amount
+    return RateAnswer.from_matrix(
+        matrix, intent.from_currency, intent.to_currency, amount
+    )
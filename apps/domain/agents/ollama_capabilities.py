@@ -0,0 +1,24 @@
+import requests
+
+
+def ollama_supports_tools(base_url: str, model: str, timeout: float = 5.0) -> bool:
+    """Ask the Ollama server whether ``model`` supports native tool calling.
+
+    Newer servers list ``"tools"`` in the model's capabilities; older ones
+    only expose the chat template, which references ``.Tools`` when the model
+    was trained for tool calling. Any error counts as unsupported, so callers
+    fall back to text-based ReAct.
+    """
+    try:
+        response = requests.post(
+            f"{base_url.rstrip('/')}/api/show", json={"model": model}, timeout=timeout
+        )
+        response.raise_for_status()
+        info = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return False
+
+    capabilities = info.get("capabilities")
+    if capabilities is not None:
+        return "tools" in capabilities
+    return ".Tools" in info.get("template", "")
@@ -0,0 +1,298 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional
+
+from langchain_core.agents import AgentAction, AgentStep
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from apps.api.config import settings
+from apps.domain.agents.answer_cache import normalize_query
+from apps.domain.agents.token_usage import TRUNCATION_MARKER, estimate_tokens
+
+# Turns pushed out of a session's prompt budget are kept as one-line extracts
+# of this many characters at most.
+SUMMARY_LINE_CHARS = 240
+
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - len(TRUNCATION_MARKER)] + TRUNCATION_MARKER
+
+
+@dataclass
+class SessionTurn:
+    """One answered query of a session."""
+
+    query: str
+    response: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.query) + estimate_tokens(self.response)
+
+    def summarize(self) -> str:
+        return _clip(
+            f"User asked: {self.query} Answer: {self.response}", SUMMARY_LINE_CHARS
+        )
+
+
+class ToolResultMemo:
+    """Tool observations of one session, reused when the model repeats a call.
+
+    Results belong to the rate snapshot version they were computed from and
+    are dropped as soon as a run starts against a different one, so a reused
+    result is never staler than a fresh tool call would be.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.rate_version: Optional[str] = None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tool: str, tool_input: Any) -> str:
+        if isinstance(tool_input, str):
+            normalized: Any = normalize_query(tool_input)
+        elif isinstance(tool_input, dict):
+            normalized = {
+                name: normalize_query(value) if isinstance(value, str) else value
+                for name, value in tool_input.items()
+            }
+        else:
+            normalized = tool_input
+        return f"{tool}\x1f{json.dumps(normalized, sort_keys=True, default=str)}"
+
+    def set_rate_version(self, version: Optional[str]) -> None:
+        with self._lock:
+            if version != self.rate_version:
+                self._entries.clear()
+                self.rate_version = version
+
+    def get(self, tool: str, tool_input: Any) -> Optional[str]:
+        key = self.make_key(tool, tool_input)
+        with self._lock:
+            if self.rate_version is None:
+                return None
+            observation = self._entries.get(key)
+            if observation is not None:
+                self._entries.move_to_end(key)
+            return observation
+
+    def put(self, tool: str, tool_input: Any, observation: str) -> None:
+        if self.max_entries <= 0 or observation.startswith("Error"):
+            return
+        key = self.make_key(tool, tool_input)
+        with self._lock:
+            if self.rate_version is None:
+                return
+            self._entries[key] = observation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def tokens(self) -> int:
+        with self._lock:
+            return sum(
+                estimate_tokens(observation) for observation in self._entries.values()
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class Session:
+    """Conversation state of one session: recent turns plus a summary of older ones."""
+
+    def __init__(self, session_id: str, max_tool_results: int, now: float):
+        self.session_id = session_id
+        self.summary: List[str] = []
+        self.turns: List[SessionTurn] = []
+        self.tool_results = ToolResultMemo(max_tool_results)
+        self.last_used = now
+
+    @property
+    def has_history(self) -> bool:
+        return bool(self.turns or self.summary)
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Estimated tokens the session adds to every prompt."""
+        return sum(estimate_tokens(line) for line in self.summary) + sum(
+            turn.tokens for turn in self.turns
+        )
+
+    @property
+    def memory_tokens(self) -> int:
+        """Estimated size of everything the session holds, for the global bound."""
+        return self.prompt_tokens + self.tool_results.tokens
+
+    def compact(self, max_tokens: int) -> None:
+        """Shrink the session to ``max_tokens``.
+
+        Older turns are folded into the summary first and the oldest summary
+        lines dropped next; the newest turn is summarized only as a last resort.
+        """
+        while self.prompt_tokens > max_tokens:
+            if len(self.turns) > 1:
+                self.summary.append(self.turns.pop(0).summarize())
+            elif self.summary:
+                self.summary.pop(0)
+            elif self.turns:
+                self.summary.append(self.turns.pop(0).summarize())
+            else:
+                break
+
+    def history_messages(self) -> List[BaseMessage]:
+        """The session as chat messages for the tool-calling agents."""
+        messages: List[BaseMessage] = []
+        if self.summary:
+            messages.append(
+                SystemMessage(
+                    content="Earlier in this conversation:\n" + "\n".join(self.summary)
+                )
+            )
+        for turn in self.turns:
+            messages.append(HumanMessage(content=turn.query))
+            messages.append(AIMessage(content=turn.response))
+        return messages
+
+    def history_text(self) -> str:
+        """The session as plain text for the ReAct prompt; empty without history."""
+        if not self.has_history:
+            return ""
+        lines = ["Previous conversation:"]
+        lines.extend(self.summary)
+        for turn in self.turns:
+            lines.append(f"User: {turn.query}")
+            lines.append(f"Assistant: {turn.response}")
+        return "\n".join(lines) + "\n\n"
+
+
+class SessionStore:
+    """Process-local store of conversation sessions.
+
+    Each session's prompt contribution is capped at ``max_session_tokens`` by
+    :meth:`Session.compact`. Sessions idle for ``idle_ttl_seconds`` expire,
+    and the least recently used ones are evicted beyond ``max_sessions`` or
+    once all sessions together hold more than ``max_total_tokens``.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        max_session_tokens: int,
+        max_total_tokens: int,
+        idle_ttl_seconds: float,
+        max_tool_results: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.max_session_tokens = max_session_tokens
+        self.max_total_tokens = max_total_tokens
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_tool_results = max_tool_results
+        self.clock = clock
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire_idle(self, now: float) -> None:
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_used <= self.idle_ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+    def _enforce_bounds(self) -> None:
+        while len(self._sessions) > max(1, self.max_sessions):
+            self._sessions.popitem(last=False)
+
+        total = sum(session.memory_tokens for session in self._sessions.values())
+        while total > self.max_total_tokens and len(self._sessions) > 1:
+            _, evicted = self._sessions.popitem(last=False)
+            total -= evicted.memory_tokens
+
+    def get(self, session_id: str) -> Session:
+        """Return the session for ``session_id``, starting a new one if needed."""
+        now = self.clock()
+        with self._lock:
+            self._expire_idle(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.max_tool_results, now)
+                self._sessions[session_id] = session
+                self._enforce_bounds()
+            else:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def record(self, session: Session, query: str, response: str) -> None:
+        """Append an answered turn and compact the session to its budget."""
+        with self._lock:
+            session.turns.append(SessionTurn(query, response))
+            session.compact(self.max_session_tokens)
+            session.last_used = self.clock()
+            if self._sessions.get(session.session_id) is session:
+                self._sessions.move_to_end(session.session_id)
+                self._enforce_bounds()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+_active_tool_results: ContextVar[Optional[ToolResultMemo]] = ContextVar(
+    "session_tool_results", default=None
+)
+
+
+@contextmanager
+def reusing_tool_results(memo: Optional[ToolResultMemo]) -> Iterator[None]:
+    """Make tool calls inside the block reuse and record ``memo``'s results."""
+    token = _active_tool_results.set(memo)
+    try:
+        yield
+    finally:
+        _active_tool_results.reset(token)
+
+
+def reused_tool_step(action: AgentAction) -> Optional[AgentStep]:
+    """Return a step with the session's earlier result for ``action``, if any."""
+    memo = _active_tool_results.get()
+    if memo is None:
+        return None
+    observation = memo.get(action.tool, action.tool_input)
+    if observation is None:
+        return None
+    return AgentStep(action=action, observation=observation)
+
+
+def remember_tool_step(step: AgentStep) -> None:
+    """Record a tool result in the active session for later reuse."""
+    memo = _active_tool_results.get()
+    if memo is not None and isinstance(step.observation, str):
+        memo.put(step.action.tool, step.action.tool_input, step.observation)
+
+
+# Process-wide session store shared by every agent instance
+session_store = SessionStore(
+    max_sessions=settings.session_max_count,
+    max_session_tokens=settings.session_max_tokens,
+    max_total_tokens=settings.session_max_total_tokens,
+    idle_ttl_seconds=settings.session_idle_ttl_seconds,
+    max_tool_results=settings.session_max_tool_results,
+)
@@ -0,0 +1,180 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+from apps.domain.metrics import AGENT_REQUEST_TOKENS, reported_token_usage
+
+# Rough characters-per-token ratio used wherever the model does not report
+# counts itself (tool output, scratchpad trimming, models without usage data).
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " ..."
+
+IntermediateStep = Tuple[AgentAction, Any]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for budget decisions; not a real tokenizer."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _message_text(message: BaseMessage) -> str:
+    text = message.content if isinstance(message.content, str) else str(message.content)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        text += str(tool_calls)
+    return text
+
+
+@dataclass
+class TokenUsage:
+    """Token counts of one agent run.
+
+    ``base_prompt_tokens`` is the system prompt, examples and query sent with
+    every call; ``scratchpad_tokens`` is what earlier iterations added on top
+    of it, summed over all calls. ``tool_output_tokens`` is estimated.
+    """
+
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    base_prompt_tokens: int = 0
+    scratchpad_tokens: int = 0
+    tool_output_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def observe(self) -> None:
+        """Record this run's token counts in the ``agent_request_tokens`` histogram."""
+        for component, count in self.as_dict().items():
+            if component != "llm_calls":
+                AGENT_REQUEST_TOKENS.labels(
+                    component=component.replace("_tokens", "")
+                ).observe(count)
+
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """Accumulates a :class:`TokenUsage` for one agent run.
+
+    The prompt of the first call has no scratchpad, so its size is the base
+    prompt; anything later calls send beyond that is scratchpad.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.usage = TokenUsage()
+        self._estimated_prompts: Dict[UUID, int] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized,
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        self._estimated_prompts[run_id] = sum(
+            estimate_tokens(_message_text(message))
+            for batch in messages
+            for message in batch
+        )
+
+    def on_llm_start(
+        self, serialized, prompts: List[str], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._estimated_prompts[run_id] = sum(
+            estimate_tokens(prompt) for prompt in prompts
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        estimated_prompt = self._estimated_prompts.pop(run_id, 0)
+        reported = reported_token_usage(response)
+        if reported:
+            prompt, completion = reported["prompt"], reported["completion"]
+        else:
+            prompt = estimated_prompt
+            completion = sum(
+                estimate_tokens(generation.text)
+                for generations in response.generations
+                for generation in generations
+            )
+
+        usage = self.usage
+        if usage.llm_calls == 0:
+            usage.base_prompt_tokens = prompt
+        else:
+            usage.scratchpad_tokens += max(0, prompt - usage.base_prompt_tokens)
+        usage.llm_calls += 1
+        usage.prompt_tokens += prompt
+        usage.completion_tokens += completion
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._estimated_prompts.pop(run_id, None)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        content = getattr(output, "content", output)
+        self.usage.tool_output_tokens += estimate_tokens(str(content))
+
+
+def _truncate(observation: Any, max_chars: int) -> Any:
+    if not isinstance(observation, str) or len(observation) <= max_chars:
+        return observation
+    return observation[: max(0, max_chars - len(TRUNCATION_MARKER))] + TRUNCATION_MARKER
+
+
+def trim_intermediate_steps(
+    steps: Sequence[IntermediateStep], max_tokens: int
+) -> List[IntermediateStep]:
+    """Keep the most recent steps whose actions and observations fit ``max_tokens``.
+
+    Steps produced by one model turn (parallel tool calls share a message log)
+    are kept or dropped together so every tool call keeps its result. The
+    newest turn is always kept, with its observations truncated if it alone
+    exceeds the budget.
+    """
+    if max_tokens <= 0 or not steps:
+        return list(steps)
+
+    turns: List[List[IntermediateStep]] = []
+    for step in steps:
+        message_log = getattr(step[0], "message_log", None)
+        if (
+            turns
+            and message_log
+            and getattr(turns[-1][0][0], "message_log", None) == message_log
+        ):
+            turns[-1].append(step)
+        else:
+            turns.append([step])
+
+    def cost(turn: List[IntermediateStep]) -> int:
+        return sum(
+            estimate_tokens(action.log) + estimate_tokens(str(observation))
+            for action, observation in turn
+        )
+
+    newest = turns[-1]
+    if cost(newest) > max_tokens:
+        max_chars = max_tokens * CHARS_PER_TOKEN // len(newest)
+        return [
+            (action, _truncate(observation, max_chars))
+            for action, observation in newest
+        ]
+
+    kept: List[List[IntermediateStep]] = []
+    total = 0
+    for turn in reversed(turns):
+        turn_cost = cost(turn)
+        if total + turn_cost > max_tokens:
+            break
+        kept.append(turn)
+        total += turn_cost
+
+    return [step for turn in reversed(kept) for step in turn]
@@ -1,2 +1,59 @@
+from typing import List, Optional
+
+
 class NotFoundError(Exception):
     pass
+
+
+class RateProviderError(Exception):
+    """Raised when the exchange rate provider returns an unusable response."""
+
+    pass
+
+
+class RateFetchError(RateProviderError):
+    """Raised when the exchange rate provider cannot be reached."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code  # HTTP status the provider answered with, if any
+
+
+class RateProviderUnavailableError(RateFetchError):
+    """Raised without a request while the rate provider's circuit breaker is open."""
+
+    pass
+
+
+class UnknownCurrencyError(ValueError):
+    """Raised when a currency argument names no currency, or several."""
+
+    def __init__(self, message: str, suggestions: List[str]):
+        super().__init__(message)
+        self.suggestions = suggestions  # closest codes, best first
+
+
+class OverloadedError(Exception):
+    """Raised when the agent cannot take on more work right now."""
+
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdmissionQueueFullError(OverloadedError):
+    """Raised when every agent slot is busy and the wait queue is full."""
+
+    pass
+
+
+class AdmissionTimeoutError(OverloadedError):
+    """Raised when an agent run waited longer than the queue timeout for a slot."""
+
+    pass
+
+
+class ModelRateLimitError(OverloadedError):
+    """Raised when the model provider rejects a call as rate limited."""
+
+    pass
@@ -0,0 +1,206 @@
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets for stages that range from sub-millisecond cache reads to multi-second
+# LLM calls.
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "End-to-end HTTP request time, until the response body is fully sent.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "Latency of a single chat model call.",
+    ["status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "Tokens reported by the chat model.",
+    ["type"],  # "prompt" or "completion"
+)
+TOOL_CALL_DURATION = Histogram(
+    "tool_call_duration_seconds",
+    "Latency of a single tool call.",
+    ["tool", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_FETCH_DURATION = Histogram(
+    "rate_fetch_duration_seconds",
+    "Latency of rate provider fetches.",
+    ["status"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_CACHE_LOOKUPS = Counter(
+    "rate_cache_lookups",
+    "Rate snapshot cache lookups.",
+    ["result"],  # "hit", "stale" or "miss"
+)
+RATE_PROVIDER_CIRCUIT_OPEN = Gauge(
+    "rate_provider_circuit_open",
+    "1 while the rate provider circuit breaker fails calls fast.",
+    multiprocess_mode="livemax",
+)
+AGENT_REQUEST_TOKENS = Histogram(
+    "agent_request_tokens",
+    "Tokens used by one agent run, by prompt component.",
+    ["component"],  # see TokenUsage.as_dict
+    buckets=(50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000),
+)
+AGENT_ITERATIONS = Histogram(
+    "agent_iterations",
+    "Chat model calls made by one agent run.",
+    ["agent_type"],  # "openai_tools", "tool_calling" or "react"
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10),
+)
+
+AGENT_ADMISSION_QUEUE_DEPTH = Gauge(
+    "agent_admission_queue_depth",
+    "Agent runs waiting for a free slot.",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+AGENT_ADMISSION_WAIT = Histogram(
+    "agent_admission_wait_seconds",
+    "Time an agent run waited for a slot.",
+    ["provider", "outcome"],  # "admitted", "queue_full" or "timeout"
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def reported_token_usage(response: LLMResult) -> Optional[Dict[str, int]]:
+    """Return prompt/completion token counts from a chat model result, if reported."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if usage:
+                return {
+                    "prompt": usage.get("input_tokens", 0),
+                    "completion": usage.get("output_tokens", 0),
+                }
+
+    token_usage = (response.llm_output or {}).get("token_usage")
+    if token_usage:
+        return {
+            "prompt": token_usage.get("prompt_tokens", 0),
+            "completion": token_usage.get("completion_tokens", 0),
+        }
+    return None
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Records LLM, tool and iteration metrics for one agent run.
+
+    Create a new handler per invocation and pass it in the run config; the
+    iteration count is observed when the outermost chain finishes, labelled
+    with ``agent_type`` so agent flavours can be compared.
+    """
+
+    run_inline = True
+
+    def __init__(self, agent_type: str = "unknown"):
+        self.agent_type = agent_type
+        self._started: Dict[UUID, float] = {}
+        self._tool_names: Dict[UUID, str] = {}
+        self.llm_calls = 0
+
+    def _elapsed(self, run_id: UUID) -> Optional[float]:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return None
+        return time.perf_counter() - started
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self.llm_calls += 1
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+        self.llm_calls += 1
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            LLM_CALL_DURATION.labels(status="ok").observe(elapsed)
+
+        usage = reported_token_usage(response)
+        if usage:
+            for token_type, count in usage.items():
+                LLM_TOKENS.labels(type=token_type).inc(count)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            LLM_CALL_DURATION.labels(status="error").observe(elapsed)
+
+    def on_tool_start(
+        self, serialized, input_str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._tool_names[run_id] = (serialized or {}).get("name") or kwargs.get(
+            "name", "unknown"
+        )
+        self._started[run_id] = time.perf_counter()
+
+    def _observe_tool(self, run_id: UUID, status: str) -> None:
+        tool = self._tool_names.pop(run_id, "unknown")
+        elapsed = self._elapsed(run_id)
+        if elapsed is not None:
+            TOOL_CALL_DURATION.labels(tool=tool, status=status).observe(elapsed)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._observe_tool(run_id, "ok")
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._observe_tool(run_id, "error")
+
+    def on_chain_end(
+        self,
+        outputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        if parent_run_id is None:
+            AGENT_ITERATIONS.labels(agent_type=self.agent_type).observe(self.llm_calls)
+
+    def on_chain_error(
+        self,
+        error: BaseException,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        if parent_run_id is None:
+            AGENT_ITERATIONS.labels(agent_type=self.agent_type).observe(self.llm_calls)
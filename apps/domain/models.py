@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 
 # Pydantic models for request/response
@@ -7,19 +7,41 @@ class QueryRequest(BaseModel):
     """Request model for currency queries."""
 
     message: str
+    session_id: Optional[str] = Field(
+        default=None, min_length=1, max_length=128
+    )  # follow-ups with the same id share the conversation
 
     class Config:
         json_schema_extra = {
-            "example": {"message": "What's the current USD to EUR exchange rate?"}
+            "example": {
+                "message": "What's the current USD to EUR exchange rate?",
+                "session_id": "4f9c2a7e",
+            }
         }
 
 
+class StructuredAnswer(BaseModel):
+    """Machine-readable answer to a query that is a single rate lookup or conversion."""
+
+    from_currency: str
+    to_currency: str
+    amount: float
+    rate: float  # to_currency units per from_currency unit
+    converted_amount: float
+    last_updated: str  # the provider's publication time
+    stale: bool = False  # served from an expired snapshot while rates are refreshed
+
+
 class QueryResponse(BaseModel):
     """Response model for currency queries."""
 
     success: bool
     response: str
     error: Optional[str] = None
+    served_by: str = "agent"  # "fast_path", "cache" or "agent"
+    token_usage: Optional[Dict[str, int]] = None  # only when the agent ran
+    session_id: Optional[str] = None  # echoed from the request
+    answer: Optional[StructuredAnswer] = None  # set when the query was one rate lookup
 
     class Config:
         json_schema_extra = {
@@ -27,5 +49,37 @@ class QueryResponse(BaseModel):
                 "success": True,
                 "response": "The current USD to EUR exchange rate is 0.8599. This means 1 USD equals 0.8599 EUR. The rates were last updated on Mon, 21 Jul 2025 00:00:01 +0000.",
                 "error": None,
+                "served_by": "agent",
+                "answer": {
+                    "from_currency": "USD",
+                    "to_currency": "EUR",
+                    "amount": 1.0,
+                    "rate": 0.8599,
+                    "converted_amount": 0.8599,
+                    "last_updated": "Mon, 21 Jul 2025 00:00:01 +0000",
+                    "stale": False,
+                },
             }
         }
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for answering several currency queries at once."""
+
+    queries: List[QueryRequest] = Field(..., min_length=1)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": [
+                    {"message": "What's the current USD to EUR exchange rate?"},
+                    {"message": "How much is 100 GBP in JPY?"},
+                ]
+            }
+        }
+
+
+class BatchQueryResponse(BaseModel):
+    """Response model for batch queries, in the same order as the request."""
+
+    results: List[QueryResponse]
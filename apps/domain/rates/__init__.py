@@ -0,0 +1,6 @@
+"""Rates package for fetching and caching currency exchange rate data."""
+
+from .cache import RateCache, RateSnapshot
+from .matrix import RateMatrix
+
+__all__ = ["RateCache", "RateMatrix", "RateSnapshot"]
@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from apps.domain.exceptions import RateProviderUnavailableError
+from apps.domain.metrics import RATE_PROVIDER_CIRCUIT_OPEN
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for the rate provider.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    :meth:`before_call` raises :class:`RateProviderUnavailableError` at once
+    instead of letting callers wait on timeouts. Once ``reset_seconds`` have
+    passed a single probe call is let through: success closes the circuit,
+    failure keeps it open for another ``reset_seconds``.
+
+    A ``failure_threshold`` of 0 disables the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def seconds_until_probe(self) -> float:
+        """Return how long calls will keep failing fast, 0 if one may go through now."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_seconds - self.clock())
+
+    def before_call(self) -> None:
+        """Admit a call, or raise while the circuit is open or a probe is in flight."""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            wait = self._opened_at + self.reset_seconds - self.clock()
+            if wait <= 0 and not self._probing:
+                self._probing = True
+                return
+        raise RateProviderUnavailableError(
+            f"Exchange rate provider is unavailable after {self.failures} failed "
+            f"requests; next attempt in {max(wait, 0):.0f} seconds"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self._opened_at is not None:
+                self._opened_at = None
+                RATE_PROVIDER_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if 0 < self.failure_threshold <= self.failures:
+                if self._opened_at is None:
+                    print(
+                        "Rate provider circuit opened after "
+                        f"{self.failures} failed requests"
+                    )
+                    RATE_PROVIDER_CIRCUIT_OPEN.set(1)
+                self._opened_at = self.clock()
+
+    def reset(self) -> None:
+        """Close the circuit and forget earlier failures."""
+        self.record_success()
+
+    def release(self) -> None:
+        """Free the probe slot of a call that ended without a verdict (cancelled)."""
+        with self._lock:
+            self._probing = False
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# Lower bound on how long a snapshot is kept, so a provider that is late
+# publishing its next update does not turn every lookup into a refetch.
+MIN_TTL_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """Conversion rates for one base currency as returned by the provider."""
+
+    base_code: str
+    rates: Dict[str, float]
+    time_last_update_utc: str = "Unknown"
+    time_next_update_unix: Optional[float] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_api_response(cls, data: Dict[str, Any]) -> "RateSnapshot":
+        """Build a snapshot from an ExchangeRate API ``latest`` payload."""
+        next_update = data.get("time_next_update_unix")
+        if next_update is None and data.get("time_next_update_utc"):
+            try:
+                next_update = parsedate_to_datetime(
+                    data["time_next_update_utc"]
+                ).timestamp()
+            except (TypeError, ValueError):
+                next_update = None
+
+        return cls(
+            base_code=str(data.get("base_code", "")).upper(),
+            rates=dict(data.get("conversion_rates", {})),
+            time_last_update_utc=data.get("time_last_update_utc", "Unknown"),
+            time_next_update_unix=(
+                float(next_update) if next_update is not None else None
+            ),
+        )
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this snapshot was fetched from the provider."""
+        return time.time() - self.fetched_at
+
+    @property
+    def version(self) -> str:
+        """Identify the provider publication this snapshot came from."""
+        return f"{self.base_code}@{self.time_last_update_utc}"
+
+    def expires_at(self, max_ttl: float) -> float:
+        """Return the unix time after which this snapshot should be refetched."""
+        expires = self.fetched_at + max_ttl
+        if self.time_next_update_unix is not None:
+            expires = min(expires, self.time_next_update_unix)
+        return max(expires, self.fetched_at + min(MIN_TTL_SECONDS, max_ttl))
+
+
+class RateCache:
+    """Thread-safe LRU cache of rate snapshots keyed by base currency.
+
+    Entries expire at the provider's advertised next update time, capped by
+    ``max_ttl`` seconds, and the least recently used base is evicted once
+    ``max_size`` entries are held.
+
+    Expired entries are kept aside as the base's last good snapshot, which
+    :meth:`get_stale` hands out for up to ``max_stale_age`` seconds after it
+    was fetched, so callers can keep answering while a refresh is pending.
+    """
+
+    def __init__(
+        self, max_ttl: float = 3600.0, max_size: int = 32, max_stale_age: float = 0.0
+    ):
+        self.max_ttl = max_ttl
+        self.max_size = max_size
+        self.max_stale_age = max_stale_age
+        self._entries: "OrderedDict[str, RateSnapshot]" = OrderedDict()
+        self._stale: "OrderedDict[str, RateSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _put(
+        entries: "OrderedDict[str, RateSnapshot]", snapshot: RateSnapshot, max_size: int
+    ) -> None:
+        key = snapshot.base_code.upper()
+        entries[key] = snapshot
+        entries.move_to_end(key)
+        while len(entries) > max_size:
+            entries.popitem(last=False)
+
+    def is_expired(self, snapshot: RateSnapshot) -> bool:
+        return time.time() >= snapshot.expires_at(self.max_ttl)
+
+    def get(self, base_code: str) -> Optional[RateSnapshot]:
+        """Return the cached snapshot for ``base_code`` if it is still fresh."""
+        key = base_code.upper()
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None:
+                return None
+            if self.is_expired(snapshot):
+                del self._entries[key]
+                self._retain(snapshot)
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, snapshot: RateSnapshot) -> None:
+        """Store a snapshot, evicting the least recently used entries if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._stale.pop(snapshot.base_code.upper(), None)
+            self._put(self._entries, snapshot, self.max_size)
+
+    def _retain(self, snapshot: RateSnapshot) -> None:
+        if self.max_stale_age > 0 and self.max_size > 0:
+            self._put(self._stale, snapshot, self.max_size)
+
+    def retain(self, snapshot: RateSnapshot) -> None:
+        """Keep an already expired snapshot as the last good one for its base."""
+        with self._lock:
+            if snapshot.base_code.upper() not in self._entries:
+                self._retain(snapshot)
+
+    def get_stale(self, base_code: str) -> Optional[RateSnapshot]:
+        """Return the last good snapshot for ``base_code`` once the fresh one expired.
+
+        Returns None while a fresh snapshot is cached, and for snapshots older
+        than ``max_stale_age``.
+        """
+        key = base_code.upper()
+        with self._lock:
+            snapshot = self._stale.get(key)
+            if snapshot is None:
+                return None
+            if snapshot.age_seconds > self.max_stale_age:
+                del self._stale[key]
+                return None
+            self._stale.move_to_end(key)
+            return snapshot
+
+    def clear(self) -> None:
+        """Drop every cached snapshot."""
+        with self._lock:
+            self._entries.clear()
+            self._stale.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
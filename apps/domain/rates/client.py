@@ -0,0 +1,369 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Optional, Set
+
+from apps.api.config import settings
+from apps.domain.exceptions import RateFetchError, RateProviderError
+from apps.domain.metrics import RATE_CACHE_LOOKUPS, RATE_FETCH_DURATION
+from .breaker import CircuitBreaker
+from .cache import RateCache, RateSnapshot
+from .history import RateHistory
+from .matrix import RateMatrix
+from .providers import ExchangeRateApiProvider, RateProvider, load_provider
+from .shared_store import SharedRateStore
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+
+class RateClient:
+    """Cached rate client in front of a :class:`RateProvider`.
+
+    Both the sync and async paths read through the shared :class:`RateCache`
+    and only go to the provider on a miss. The provider (the ExchangeRate API
+    by default, see ``RATE_PROVIDER``) is opened and closed by the FastAPI app
+    lifespan; the HTTP one also connects lazily when the client runs outside
+    the app (scripts, tests).
+
+    Cross rates for arbitrary pairs come from a :class:`RateMatrix` built from
+    the ``matrix_base`` snapshot, so only one base table is fetched per refresh.
+
+    Concurrent cache misses for the same base share a single in-flight fetch,
+    per thread pool on the sync path and per event loop on the async path.
+    With a :class:`SharedRateStore`, a miss first looks for a fresh snapshot
+    another worker process already fetched, and every fetch is published there.
+    With a :class:`RateHistory`, every fetched snapshot is also appended to
+    the local daily history.
+
+    When a base's snapshot has expired but the cache still holds its last
+    good one, that snapshot is served at once (see :meth:`stale_age`) and a
+    background refresh retries with jittered exponential backoff; only
+    callers with nothing to fall back on wait for the provider. A
+    :class:`CircuitBreaker` makes those callers fail fast while the provider
+    keeps failing.
+    """
+
+    def __init__(
+        self,
+        cache: RateCache,
+        provider: Optional[RateProvider] = None,
+        matrix_base: str = "USD",
+        store: Optional[SharedRateStore] = None,
+        history: Optional[RateHistory] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_attempts: int = 4,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 30.0,
+    ):
+        self.cache = cache
+        self.provider = provider or ExchangeRateApiProvider()
+        self.store = store
+        self.history = history
+        self.breaker = breaker or CircuitBreaker(failure_threshold=0)
+        self.retry_attempts = retry_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.matrix_base = matrix_base.upper()
+        self._matrix: Optional[RateMatrix] = None
+        self._flights = SingleFlight()
+        self._async_flights = AsyncSingleFlight()
+        self._revalidating: Set[str] = set()
+        self._revalidate_lock = threading.Lock()
+        self._background_tasks: Set["asyncio.Task[None]"] = set()
+
+    async def startup(self) -> None:
+        """Let the provider open its connections ahead of the first request."""
+        await self.provider.startup()
+
+    async def aclose(self) -> None:
+        """Stop background refreshes and close the provider."""
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.provider.aclose()
+
+    @staticmethod
+    def _observe_fetch(started: float, status: str) -> None:
+        """Record the latency of an upstream rate request."""
+        RATE_FETCH_DURATION.labels(status=status).observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _is_outage_status(status_code: Optional[int]) -> bool:
+        """Tell provider outages apart from requests the provider rejected."""
+        return status_code is None or status_code >= 500 or status_code == 429
+
+    def _settle_fetch(self, started: float, error: Optional[RateProviderError]) -> None:
+        """Record a fetch's latency and tell the breaker if the provider answered."""
+        if isinstance(error, RateFetchError):
+            self._observe_fetch(started, "error")
+            if self._is_outage_status(error.status_code):
+                self.breaker.record_failure()
+                return
+        else:
+            self._observe_fetch(started, "ok")
+        self.breaker.record_success()
+
+    def fetch_snapshot(self, base_currency: str) -> RateSnapshot:
+        """Fetch a fresh rate snapshot from the provider, bypassing the cache.
+
+        Raises :class:`RateProviderUnavailableError` without a request while
+        the circuit breaker is open.
+        """
+        self.breaker.before_call()
+        started = time.perf_counter()
+        try:
+            snapshot = self.provider.fetch(base_currency)
+        except RateProviderError as e:
+            self._settle_fetch(started, e)
+            raise
+        finally:
+            self.breaker.release()
+        self._settle_fetch(started, None)
+        return snapshot
+
+    async def afetch_snapshot(self, base_currency: str) -> RateSnapshot:
+        """Async version of fetch_snapshot."""
+        self.breaker.before_call()
+        started = time.perf_counter()
+        try:
+            snapshot = await self.provider.afetch(base_currency)
+        except RateProviderError as e:
+            self._settle_fetch(started, e)
+            raise
+        finally:
+            self.breaker.release()
+        self._settle_fetch(started, None)
+        return snapshot
+
+    def _from_store(self, base_currency: str) -> Optional[RateSnapshot]:
+        """Return a fresh snapshot from the cache or the shared store, if any."""
+        snapshot = self.cache.get(base_currency)
+        if snapshot is None and self.store is not None:
+            snapshot = self.store.get(base_currency, self.cache.max_ttl)
+            if snapshot is not None:
+                self.cache.set(snapshot)
+        return snapshot
+
+    def _publish(self, snapshot: RateSnapshot) -> None:
+        """Share a freshly fetched snapshot with other worker processes."""
+        try:
+            self.store.publish(snapshot)
+        except OSError as e:
+            print(f"Could not publish rates to shared store {self.store.path}: {e}")
+
+    def _record_history(self, snapshot: RateSnapshot) -> None:
+        """Append a freshly fetched snapshot to the local rate history."""
+        try:
+            self.history.record(snapshot)
+        except (OSError, ValueError) as e:
+            print(f"Could not record rate history in {self.history.path}: {e}")
+
+    def _refresh(self, base_currency: str) -> RateSnapshot:
+        """Fetch and cache a snapshot unless another caller just did."""
+        snapshot = self._from_store(base_currency)
+        if snapshot is None:
+            snapshot = self.fetch_snapshot(base_currency)
+            self.cache.set(snapshot)
+            if self.store is not None:
+                self._publish(snapshot)
+            if self.history is not None:
+                self._record_history(snapshot)
+        return snapshot
+
+    async def _arefresh(self, base_currency: str) -> RateSnapshot:
+        """Async version of _refresh."""
+        snapshot = self._from_store(base_currency)
+        if snapshot is None:
+            snapshot = await self.afetch_snapshot(base_currency)
+            self.cache.set(snapshot)
+            if self.store is not None:
+                await asyncio.to_thread(self._publish, snapshot)
+            if self.history is not None:
+                await asyncio.to_thread(self._record_history, snapshot)
+        return snapshot
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff, at least an open circuit's wait."""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * 2**attempt)
+        return max(random.uniform(0, ceiling), self.breaker.seconds_until_probe())
+
+    def _start_revalidation(self, base_currency: str) -> bool:
+        """Claim the background refresh of a base, False if one is already running."""
+        with self._revalidate_lock:
+            if base_currency in self._revalidating:
+                return False
+            self._revalidating.add(base_currency)
+            return True
+
+    def _finish_revalidation(self, base_currency: str) -> None:
+        with self._revalidate_lock:
+            self._revalidating.discard(base_currency)
+
+    def _revalidate(self, base_currency: str) -> None:
+        """Refresh a stale base off the request path, retrying transport failures."""
+        try:
+            for attempt in range(max(1, self.retry_attempts)):
+                if attempt:
+                    time.sleep(self._retry_delay(attempt - 1))
+                try:
+                    self._flights.do(
+                        base_currency, lambda: self._refresh(base_currency)
+                    )
+                    return
+                except RateFetchError as e:
+                    error: RateProviderError = e
+                except RateProviderError as e:
+                    error = e
+                    break  # the provider answered; retrying will not change it
+            print(f"Background rate refresh for {base_currency} failed: {error}")
+        finally:
+            self._finish_revalidation(base_currency)
+
+    async def _arevalidate(self, base_currency: str) -> None:
+        """Async version of _revalidate."""
+        try:
+            for attempt in range(max(1, self.retry_attempts)):
+                if attempt:
+                    await asyncio.sleep(self._retry_delay(attempt - 1))
+                try:
+                    await self._async_flights.do(
+                        base_currency, lambda: self._arefresh(base_currency)
+                    )
+                    return
+                except RateFetchError as e:
+                    error: RateProviderError = e
+                except RateProviderError as e:
+                    error = e
+                    break
+            print(f"Background rate refresh for {base_currency} failed: {error}")
+        finally:
+            self._finish_revalidation(base_currency)
+
+    def _serve_stale(self, base_currency: str) -> Optional[RateSnapshot]:
+        """Return the last good snapshot of an expired base, if it may be served."""
+        snapshot = self.cache.get_stale(base_currency)
+        if snapshot is not None:
+            RATE_CACHE_LOOKUPS.labels(result="stale").inc()
+        return snapshot
+
+    def get_snapshot(
+        self, base_currency: str, allow_stale: bool = True
+    ) -> RateSnapshot:
+        """Return the rate snapshot for a base currency, fetching it on a cache miss.
+
+        With ``allow_stale``, an expired base that still has a last good
+        snapshot is answered from it while a background thread refreshes it.
+        """
+        base_currency = base_currency.upper()
+        snapshot = self.cache.get(base_currency)
+        if snapshot is not None:
+            RATE_CACHE_LOOKUPS.labels(result="hit").inc()
+            return snapshot
+
+        stale = self._serve_stale(base_currency) if allow_stale else None
+        if stale is not None:
+            if self._start_revalidation(base_currency):
+                threading.Thread(
+                    target=self._revalidate,
+                    args=(base_currency,),
+                    name=f"rate-revalidate-{base_currency}",
+                    daemon=True,
+                ).start()
+            return stale
+
+        RATE_CACHE_LOOKUPS.labels(result="miss").inc()
+        return self._flights.do(base_currency, lambda: self._refresh(base_currency))
+
+    async def aget_snapshot(
+        self, base_currency: str, allow_stale: bool = True
+    ) -> RateSnapshot:
+        """Async version of get_snapshot; refreshes run as tasks on the running loop."""
+        base_currency = base_currency.upper()
+        snapshot = self.cache.get(base_currency)
+        if snapshot is not None:
+            RATE_CACHE_LOOKUPS.labels(result="hit").inc()
+            return snapshot
+
+        stale = self._serve_stale(base_currency) if allow_stale else None
+        if stale is not None:
+            if self._start_revalidation(base_currency):
+                task = asyncio.ensure_future(self._arevalidate(base_currency))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return stale
+
+        RATE_CACHE_LOOKUPS.labels(result="miss").inc()
+        return await self._async_flights.do(
+            base_currency, lambda: self._arefresh(base_currency)
+        )
+
+    def stale_age(self, snapshot: RateSnapshot) -> Optional[float]:
+        """Return a snapshot's age in seconds if it has expired, None while fresh."""
+        if not self.cache.is_expired(snapshot):
+            return None
+        return snapshot.age_seconds
+
+    def describe_update(self, matrix: RateMatrix) -> str:
+        """Return the matrix's last update time, flagged with its age if stale."""
+        return format_last_update(
+            matrix.time_last_update_utc, self.stale_age(matrix.snapshot)
+        )
+
+    def _matrix_for(self, snapshot: RateSnapshot) -> RateMatrix:
+        """Return the matrix for ``snapshot``, rebuilding it only when it changed."""
+        matrix = self._matrix
+        if matrix is None or matrix.snapshot is not snapshot:
+            matrix = RateMatrix(snapshot)
+            self._matrix = matrix
+        return matrix
+
+    def get_matrix(self) -> RateMatrix:
+        """Return the cross-rate matrix built from the ``matrix_base`` snapshot."""
+        return self._matrix_for(self.get_snapshot(self.matrix_base))
+
+    async def aget_matrix(self) -> RateMatrix:
+        """Async version of get_matrix."""
+        return self._matrix_for(await self.aget_snapshot(self.matrix_base))
+
+
+def format_last_update(last_update: str, stale_age: Optional[float]) -> str:
+    """Render a snapshot's update time, with its age if it is being served stale."""
+    if stale_age is None:
+        return last_update
+    minutes = int(stale_age // 60)
+    age_text = f"{minutes // 60}h {minutes % 60}m" if minutes >= 60 else f"{minutes}m"
+    return f"{last_update} (STALE: fetched {age_text} ago, refresh pending)"
+
+
+# Process-wide cache and client shared by every tool instance
+rate_cache = RateCache(
+    max_ttl=settings.rate_cache_max_ttl_seconds,
+    max_size=settings.rate_cache_max_size,
+    max_stale_age=settings.rate_stale_max_age_seconds,
+)
+
+rate_client = RateClient(
+    rate_cache,
+    provider=load_provider(settings.rate_provider),
+    matrix_base=settings.rate_matrix_base_currency,
+    store=(
+        SharedRateStore(settings.rate_snapshot_path)
+        if settings.rate_snapshot_path
+        else None
+    ),
+    history=(
+        RateHistory(
+            settings.rate_history_path, base_code=settings.rate_matrix_base_currency
+        )
+        if settings.rate_history_path
+        else None
+    ),
+    breaker=CircuitBreaker(
+        failure_threshold=settings.rate_breaker_failure_threshold,
+        reset_seconds=settings.rate_breaker_reset_seconds,
+    ),
+    retry_attempts=settings.rate_refresh_retry_attempts,
+    retry_base_seconds=settings.rate_refresh_retry_base_seconds,
+    retry_max_seconds=settings.rate_refresh_retry_max_seconds,
+)
@@ -0,0 +1,254 @@
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+from .cache import RateSnapshot
+from .shared_store import exclusive_file_lock
+
+# Layout of a history directory:
+#   meta.json     base currency and the first and last recorded day, as days
+#                 since 1970-01-01
+#   <CODE>.f64    one little-endian float64 per day from the first day on: the
+#                 rate of CODE against the base, NaN where nothing was recorded
+# Every currency is one contiguous column, so a date range for one pair reads
+# two short slices of two memory-mapped files.
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+_VALUE = struct.Struct("<d")
+_NAN = _VALUE.pack(math.nan)
+_EPOCH = date(1970, 1, 1)
+_CURRENCY_CODE = re.compile(r"^[A-Z]{3}$")
+
+
+def snapshot_date(snapshot: RateSnapshot) -> date:
+    """Return the provider's publication date of a snapshot.
+
+    Falls back to the fetch date when the publication time is unknown.
+    """
+    try:
+        published = parsedate_to_datetime(snapshot.time_last_update_utc)
+    except (TypeError, ValueError):
+        return datetime.fromtimestamp(snapshot.fetched_at, timezone.utc).date()
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc)
+    return published.date()
+
+
+class RateHistory:
+    """Append-only local store of daily rates, read through memory-mapped columns.
+
+    ``record`` appends one row per publication day; days at or before the
+    last recorded one are ignored, so it is cheap to call on every fetch.
+    Writers from several worker processes are serialized with ``flock``, and
+    ``meta.json`` is replaced last, so readers never see a half-written day.
+    All rates are stored against ``base_code``; cross rates are derived on
+    read like :class:`RateMatrix` does.
+    """
+
+    def __init__(self, path: str, base_code: str = "USD"):
+        self.path = path
+        self.base_code = base_code.upper()
+        self._lock = threading.Lock()
+        self._meta: Optional[Dict[str, int]] = None
+        self._meta_signature: Optional[Tuple[int, int]] = None
+        self._columns: Dict[str, Tuple[int, Optional[mmap.mmap]]] = {}
+
+    def _column_path(self, code: str) -> Optional[str]:
+        if not _CURRENCY_CODE.match(code):
+            return None
+        return os.path.join(self.path, f"{code}.f64")
+
+    def _load_meta(self) -> Optional[Dict[str, int]]:
+        """Return the recorded day range, re-reading it only when it changed on disk."""
+        meta_path = os.path.join(self.path, META_FILE)
+        try:
+            stat = os.stat(meta_path)
+        except FileNotFoundError:
+            return None
+
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature != self._meta_signature:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["base_code"] != self.base_code:
+                raise ValueError(
+                    f"{self.path} holds {meta['base_code']} rates, not {self.base_code}"
+                )
+            self._meta = meta
+            self._meta_signature = signature
+        return self._meta
+
+    def _write_meta(self, meta: Dict[str, object]) -> None:
+        meta_path = os.path.join(self.path, META_FILE)
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+
+    def _rates_against_base(self, snapshot: RateSnapshot) -> Optional[Dict[str, float]]:
+        if snapshot.base_code == self.base_code:
+            return snapshot.rates
+        base_rate = snapshot.rates.get(self.base_code)
+        if not base_rate:
+            return None
+        return {code: rate / base_rate for code, rate in snapshot.rates.items()}
+
+    def _write_value(self, code: str, row: int, rate: float) -> None:
+        path = self._column_path(code)
+        if path is None:
+            return
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+            f.seek(0, os.SEEK_END)
+            rows = f.tell() // _VALUE.size
+            if rows < row:
+                f.write(_NAN * (row - rows))
+            f.seek(row * _VALUE.size)
+            f.write(_VALUE.pack(rate))
+
+    def record(self, snapshot: RateSnapshot) -> bool:
+        """Append ``snapshot`` as its publication day.
+
+        Returns False, recording nothing, if that day is already recorded.
+        """
+        rates = self._rates_against_base(snapshot)
+        if not rates:
+            return False
+        day = (snapshot_date(snapshot) - _EPOCH).days
+
+        with self._lock:
+            meta = self._load_meta()
+            if meta is not None and day <= meta["last_day"]:
+                return False
+
+            os.makedirs(self.path, exist_ok=True)
+            with exclusive_file_lock(os.path.join(self.path, LOCK_FILE)):
+                meta = self._load_meta()  # another worker may have appended meanwhile
+                if meta is not None and day <= meta["last_day"]:
+                    return False
+
+                first_day = meta["first_day"] if meta is not None else day
+                for code, rate in rates.items():
+                    self._write_value(code, day - first_day, float(rate))
+                self._write_meta(
+                    {
+                        "base_code": self.base_code,
+                        "first_day": first_day,
+                        "last_day": day,
+                    }
+                )
+        return True
+
+    def _column(self, code: str) -> Optional[mmap.mmap]:
+        """Map a currency's column, remapping it once it has grown."""
+        path = self._column_path(code)
+        if path is None:
+            return None
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+
+        cached = self._columns.get(code)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        if cached is not None and cached[1] is not None:
+            cached[1].close()
+
+        mapped = None
+        if size:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._columns[code] = (size, mapped)
+        return mapped
+
+    def _slice(self, code: str, start_row: int, rows: int) -> Optional[array]:
+        """Read ``rows`` values of a column from ``start_row``, NaN past its end."""
+        mapped = self._column(code)
+        if mapped is None:
+            return None
+
+        values = array(
+            "d", mapped[start_row * _VALUE.size : (start_row + rows) * _VALUE.size]
+        )
+        if sys.byteorder == "big":
+            values.byteswap()
+        if len(values) < rows:
+            values.extend([math.nan] * (rows - len(values)))
+        return values
+
+    def has_currency(self, code: str) -> bool:
+        path = self._column_path(code)
+        return path is not None and os.path.exists(path)
+
+    def date_range(self) -> Optional[Tuple[date, date]]:
+        """Return the first and last recorded day, or None while history is empty."""
+        with self._lock:
+            meta = self._load_meta()
+        if meta is None:
+            return None
+        return (
+            _EPOCH + timedelta(days=meta["first_day"]),
+            _EPOCH + timedelta(days=meta["last_day"]),
+        )
+
+    def series(
+        self, from_currency: str, to_currency: str, start: date, end: date
+    ) -> List[Tuple[date, float]]:
+        """Return the recorded ``from``→``to`` rate for each day in ``[start, end]``.
+
+        Only the two currencies' columns are touched, and only the rows of the
+        requested days are read. Days without data for either currency are
+        left out.
+        """
+        with self._lock:
+            meta = self._load_meta()
+            if meta is None:
+                return []
+
+            first_day = meta["first_day"]
+            low = max((start - _EPOCH).days, first_day)
+            high = min((end - _EPOCH).days, meta["last_day"])
+            if low > high:
+                return []
+
+            rows = high - low + 1
+            from_values = self._slice(from_currency, low - first_day, rows)
+            to_values = self._slice(to_currency, low - first_day, rows)
+
+        if from_values is None or to_values is None:
+            return []
+
+        return [
+            (_EPOCH + timedelta(days=low + offset), to_value / from_value)
+            for offset, (from_value, to_value) in enumerate(zip(from_values, to_values))
+            if not math.isnan(from_value) and not math.isnan(to_value) and from_value
+        ]
+
+    def rate_on(
+        self, from_currency: str, to_currency: str, day: date, lookback_days: int = 7
+    ) -> Optional[Tuple[date, float]]:
+        """Return the rate recorded on ``day``, or on the latest day before it
+        within ``lookback_days`` (weekends and gaps have no publication)."""
+        points = self.series(
+            from_currency, to_currency, day - timedelta(days=lookback_days), day
+        )
+        return points[-1] if points else None
+
+    def close(self) -> None:
+        """Unmap every column."""
+        with self._lock:
+            for _, mapped in self._columns.values():
+                if mapped is not None:
+                    mapped.close()
+            self._columns.clear()
@@ -0,0 +1,82 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import RateSnapshot
+
+
+class RateMatrix:
+    """Cross-rate table derived from a single base currency snapshot.
+
+    Rates are held in one compact ``array('d')`` indexed through a code→index
+    map, so the rate for any pair is ``rates[to] / rates[from]`` and needs no
+    further API calls. A matrix is immutable and rebuilt whenever its source
+    snapshot is refreshed.
+    """
+
+    __slots__ = ("snapshot", "codes", "index", "values")
+
+    def __init__(self, snapshot: RateSnapshot):
+        self.snapshot = snapshot
+        self.codes: Tuple[str, ...] = tuple(snapshot.rates)
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+        self.values = array("d", (float(snapshot.rates[code]) for code in self.codes))
+
+    @property
+    def base_code(self) -> str:
+        return self.snapshot.base_code
+
+    @property
+    def time_last_update_utc(self) -> str:
+        return self.snapshot.time_last_update_utc
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Return how many ``to_currency`` units one ``from_currency`` buys.
+
+        Raises:
+            KeyError: If either currency is not in the matrix.
+        """
+        values = self.values
+        return values[self.index[to_currency]] / values[self.index[from_currency]]
+
+    def row(self, from_currency: str) -> array:
+        """Return the rates from ``from_currency`` to every code, in ``codes`` order."""
+        scale = 1.0 / self.values[self.index[from_currency]]
+        return array("d", (value * scale for value in self.values))
+
+    def rates_for(self, from_currency: str) -> Dict[str, float]:
+        """Return the full conversion table for ``from_currency`` as a dict."""
+        return dict(zip(self.codes, self.row(from_currency)))
+
+    def convert(
+        self,
+        amount: float,
+        from_currency: str,
+        to_currencies: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Convert ``amount`` into each target currency in a single pass.
+
+        Targets default to every currency in the matrix. Unknown targets are
+        skipped; callers that need to report them should check membership first.
+        """
+        scale = amount / self.values[self.index[from_currency]]
+        values = self.values
+        index = self.index
+
+        if to_currencies is None:
+            return [(code, value * scale) for code, value in zip(self.codes, values)]
+
+        return [
+            (code, values[index[code]] * scale)
+            for code in to_currencies
+            if code in index
+        ]
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Iterable, List, Optional
+
+from apps.domain.exceptions import RateProviderError
+from .cache import RateSnapshot
+from .client import RateClient
+
+
+class RatePrefetcher:
+    """Background refresher that keeps configured base currencies warm.
+
+    Each cycle fetches any base whose cached snapshot has expired and then
+    sleeps until the earliest snapshot expires, which follows the provider's
+    own update time. Fetched snapshots are persisted by the client's
+    :class:`SharedRateStore`; ``load`` seeds the cache from it so a fresh
+    worker can serve rates before its first network call, or stale rates if
+    the provider is down when it starts.
+    """
+
+    def __init__(
+        self,
+        client: RateClient,
+        base_currencies: Iterable[str] = (),
+        retry_seconds: float = 300.0,
+        delay_seconds: float = 5.0,
+    ):
+        bases = [client.matrix_base] + [
+            code.strip().upper() for code in base_currencies
+        ]
+        self.client = client
+        self.base_currencies: List[str] = list(
+            dict.fromkeys(code for code in bases if code)
+        )
+        self.retry_seconds = retry_seconds
+        self.delay_seconds = delay_seconds
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def load(self) -> int:
+        """Seed the rate cache from the on-disk store.
+
+        Returns how many snapshots were still fresh. Expired snapshots are kept
+        as last good ones for stale serving.
+        """
+        if self.client.store is None:
+            return 0
+
+        loaded = 0
+        for snapshot in self.client.store.snapshots():
+            if self.client.cache.is_expired(snapshot):
+                self.client.cache.retain(snapshot)
+            else:
+                self.client.cache.set(snapshot)
+                loaded += 1
+        return loaded
+
+    def _cached_snapshots(self) -> List[RateSnapshot]:
+        snapshots = (self.client.cache.get(code) for code in self.base_currencies)
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
+    async def refresh(self) -> bool:
+        """Fetch every expired base, returning True if all of them are now cached."""
+        complete = True
+        for code in self.base_currencies:
+            if self.client.cache.get(code) is not None:
+                continue
+            try:
+                await self.client.aget_snapshot(code, allow_stale=False)
+            except RateProviderError as e:
+                complete = False
+                print(f"Rate prefetch failed for {code}: {e}")
+        return complete
+
+    def _seconds_until_next_refresh(self, complete: bool) -> float:
+        now = time.time()
+        expiries = [
+            snapshot.expires_at(self.client.cache.max_ttl)
+            for snapshot in self._cached_snapshots()
+        ]
+        delay = (
+            min(expiries) - now + self.delay_seconds if expiries else self.retry_seconds
+        )
+        if not complete:
+            delay = min(delay, self.retry_seconds)
+        return max(delay, 1.0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                complete = await self.refresh()
+            except Exception as e:
+                complete = False
+                print(f"Rate prefetch cycle failed: {e}")
+            await asyncio.sleep(self._seconds_until_next_refresh(complete))
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
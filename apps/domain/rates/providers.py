@@ -0,0 +1,355 @@
+import asyncio
+import csv
+import importlib
+import json
+import math
+import os
+import threading
+import xml.etree.ElementTree as ElementTree
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from apps.api.config import settings
+from apps.domain.exceptions import RateFetchError, RateProviderError
+from .cache import RateSnapshot
+from .matrix import RateMatrix
+
+
+class RateProvider(ABC):
+    """Source of rate tables for :class:`RateClient`.
+
+    ``fetch`` returns a fresh snapshot for one base currency. It raises
+    :class:`RateFetchError` when the source cannot be reached (with the HTTP
+    status, if any, so the client can tell outages from rejected requests)
+    and :class:`RateProviderError` when it answered with something unusable.
+    Caching, retries and the circuit breaker stay in the client, so a
+    provider only has to know how to read its source.
+
+    Subclass this to add a provider and point ``RATE_PROVIDER`` at the class.
+    """
+
+    @abstractmethod
+    def fetch(self, base_currency: str) -> RateSnapshot: ...
+
+    async def afetch(self, base_currency: str) -> RateSnapshot:
+        """Async version of fetch; runs it in a worker thread unless overridden."""
+        return await asyncio.to_thread(self.fetch, base_currency)
+
+    async def startup(self) -> None:
+        """Open connections or files ahead of the first fetch."""
+
+    async def aclose(self) -> None:
+        """Release whatever the provider holds open."""
+
+
+class ExchangeRateApiProvider(RateProvider):
+    """ExchangeRate API ``latest`` endpoint over pooled keep-alive transports.
+
+    The async client is opened by :meth:`startup` and created lazily on first
+    use otherwise. The URL is built from the settings on every request.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_connections: int = 20):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._session: Optional[requests.Session] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._session_lock = threading.Lock()
+
+    def _latest_url(self, base_currency: str) -> str:
+        """Build the ExchangeRate API ``latest`` URL for a base currency."""
+        return (
+            f"{settings.exchangerate_base_url}/{settings.exchangerate_api_key}"
+            f"/latest/{base_currency}"
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the pooled ``requests`` session used by the sync path."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.max_connections
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Return the pooled ``httpx`` client used by the async path."""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._async_client
+
+    async def startup(self) -> None:
+        _ = self.async_client
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _parse_response(base_currency: str, data: Dict[str, Any]) -> RateSnapshot:
+        """Validate an API payload and turn it into a snapshot."""
+        if data.get("result") != "success":
+            raise RateProviderError(f"API returned result '{data.get('result')}'")
+
+        data.setdefault("base_code", base_currency)
+        return RateSnapshot.from_api_response(data)
+
+    def fetch(self, base_currency: str) -> RateSnapshot:
+        try:
+            response = self.session.get(
+                self._latest_url(base_currency), timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            status_code = getattr(e.response, "status_code", None)
+            raise RateFetchError(str(e), status_code=status_code) from e
+
+        return self._parse_response(base_currency, data)
+
+    async def afetch(self, base_currency: str) -> RateSnapshot:
+        try:
+            response = await self.async_client.get(self._latest_url(base_currency))
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            status_code = (
+                e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            )
+            raise RateFetchError(str(e), status_code=status_code) from e
+        except ValueError as e:  # a non-JSON body, which requests already wraps
+            raise RateFetchError(f"Invalid JSON in rate response: {e}") from e
+
+        return self._parse_response(base_currency, data)
+
+
+# File extensions FileRateProvider recognizes when no format is given
+FILE_FORMATS = {".json": "json", ".csv": "csv", ".xml": "ecb_xml"}
+
+
+class FileRateProvider(RateProvider):
+    """Serves every base currency from one local rate table file.
+
+    The whole file is read and parsed in a single pass into a
+    :class:`RateMatrix`, and parsed again only when its size or modification
+    time changes, so a refresh between updates costs one ``stat``. Snapshots
+    for any base are derived from that one table. This keeps high-throughput,
+    air-gapped and benchmark deployments off the network entirely.
+
+    Supported formats:
+
+    - ``json``: an ExchangeRate API ``latest`` payload, or
+      ``{"base": ..., "date": ..., "rates": {...}}``
+    - ``csv``: ``currency,rate`` rows (an optional header is skipped) against
+      ``base_code``
+    - ``ecb_xml``: the European Central Bank's ``eurofxref`` daily file,
+      against EUR
+
+    Without a publication time in the file, the file's modification time is
+    reported as the last update.
+    """
+
+    def __init__(self, path: str, file_format: str = "", base_code: str = "USD"):
+        if not path:
+            raise ValueError("A rate file path is required for the file rate provider")
+        file_format = file_format.lower() or FILE_FORMATS.get(
+            os.path.splitext(path)[1].lower(), ""
+        )
+        if file_format not in FILE_FORMATS.values():
+            raise ValueError(
+                f"Unsupported rate file format for {path}; "
+                f"expected one of {', '.join(sorted(FILE_FORMATS.values()))}"
+            )
+        self.path = path
+        self.file_format = file_format
+        self.base_code = base_code.upper()
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._table: Optional[RateMatrix] = None
+
+    def fetch(self, base_currency: str) -> RateSnapshot:
+        table = self._current_table()
+        if base_currency not in table:
+            raise RateProviderError(
+                f"Currency '{base_currency}' is not in the rate file"
+            )
+        return RateSnapshot(
+            base_code=base_currency,
+            rates=table.rates_for(base_currency),
+            time_last_update_utc=table.time_last_update_utc,
+            time_next_update_unix=table.snapshot.time_next_update_unix,
+        )
+
+    def _current_table(self) -> RateMatrix:
+        """Return the parsed table, re-reading the file only if it changed."""
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            raise RateFetchError(f"Could not read rate file {self.path}: {e}") from e
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if self._table is None or self._signature != signature:
+                self._table = RateMatrix(self._load(stat.st_mtime))
+                self._signature = signature
+            return self._table
+
+    def _load(self, modified_at: float) -> RateSnapshot:
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            raise RateFetchError(f"Could not read rate file {self.path}: {e}") from e
+
+        try:
+            if self.file_format == "json":
+                snapshot = self._parse_json(data)
+            elif self.file_format == "csv":
+                snapshot = self._parse_csv(data)
+            else:
+                snapshot = self._parse_ecb_xml(data)
+        except (
+            ValueError,
+            TypeError,
+            KeyError,
+            AttributeError,
+            ElementTree.ParseError,
+        ) as e:
+            raise RateProviderError(
+                f"Could not parse rate file {self.path}: {e}"
+            ) from e
+
+        rates = snapshot.rates
+        if not rates or any(not (0 < rate < math.inf) for rate in rates.values()):
+            raise RateProviderError(f"Rate file {self.path} has no usable rates")
+        if snapshot.time_last_update_utc == "Unknown":
+            published = datetime.fromtimestamp(modified_at, timezone.utc)
+            snapshot = RateSnapshot(
+                base_code=snapshot.base_code,
+                rates=rates,
+                time_last_update_utc=format_datetime(published),
+                time_next_update_unix=snapshot.time_next_update_unix,
+            )
+        return snapshot
+
+    @staticmethod
+    def _with_base(
+        base_code: str,
+        rates: Dict[str, float],
+        published: str = "Unknown",
+        next_update: Optional[float] = None,
+    ) -> RateSnapshot:
+        base_code = base_code.upper()
+        rates.setdefault(base_code, 1.0)
+        return RateSnapshot(
+            base_code=base_code,
+            rates=rates,
+            time_last_update_utc=published,
+            time_next_update_unix=next_update,
+        )
+
+    @staticmethod
+    def _published_on(day: Optional[str]) -> str:
+        """Render an ISO publication date the way the ExchangeRate API reports times."""
+        if not day:
+            return "Unknown"
+        published = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return format_datetime(published)
+
+    def _parse_json(self, data: bytes) -> RateSnapshot:
+        payload = json.loads(data)
+        if "conversion_rates" in payload:
+            payload.setdefault("base_code", self.base_code)
+            snapshot = RateSnapshot.from_api_response(payload)
+            return self._with_base(
+                snapshot.base_code,
+                {code.upper(): float(rate) for code, rate in snapshot.rates.items()},
+                snapshot.time_last_update_utc,
+                snapshot.time_next_update_unix,
+            )
+
+        return self._with_base(
+            payload.get("base", self.base_code),
+            {code.upper(): float(rate) for code, rate in payload["rates"].items()},
+            self._published_on(payload.get("date")),
+        )
+
+    def _parse_csv(self, data: bytes) -> RateSnapshot:
+        rates: Dict[str, float] = {}
+        for line, row in enumerate(
+            csv.reader(data.decode("utf-8-sig").splitlines()), 1
+        ):
+            if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) < 2:
+                raise ValueError(f"line {line} needs a currency and a rate")
+            try:
+                rate = float(row[1])
+            except ValueError:
+                if rates:
+                    raise ValueError(f"line {line} has a non-numeric rate {row[1]!r}")
+                continue  # header row
+            rates[row[0].strip().upper()] = rate
+        return self._with_base(self.base_code, rates)
+
+    def _parse_ecb_xml(self, data: bytes) -> RateSnapshot:
+        rates: Dict[str, float] = {}
+        published = None
+        # Elements are namespaced ("{...eurofxref}Cube"); match on attributes only.
+        for element in ElementTree.fromstring(data).iter():
+            currency = element.get("currency")
+            if currency is not None:
+                rates[currency.upper()] = float(element.get("rate"))
+            elif published is None and element.get("time"):
+                published = element.get("time")
+        return self._with_base("EUR", rates, self._published_on(published))
+
+
+def load_provider(name: str) -> RateProvider:
+    """Instantiate the provider named by ``RATE_PROVIDER``.
+
+    ``exchangerate_api`` and ``file`` are built in; anything else is taken
+    as ``module:ClassName`` of a :class:`RateProvider` subclass.
+    """
+    name = name or "exchangerate_api"
+    if name == "exchangerate_api":
+        return ExchangeRateApiProvider(
+            timeout=settings.exchangerate_timeout_seconds,
+            max_connections=settings.exchangerate_max_connections,
+        )
+    if name == "file":
+        return FileRateProvider(
+            settings.rate_file_path,
+            file_format=settings.rate_file_format,
+            base_code=settings.rate_file_base_currency,
+        )
+
+    module_name, _, class_name = name.partition(":")
+    provider_class = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(provider_class, type) or not issubclass(
+        provider_class, RateProvider
+    ):
+        raise TypeError(f"{name} is not a RateProvider subclass")
+    return provider_class()
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .cache import RateSnapshot
+from .snapshot_file import read_snapshot_file, write_snapshot_file
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+
+@contextmanager
+def exclusive_file_lock(lock_path: str) -> Iterator[None]:
+    """Serialize writers across processes (best effort where flock is missing)."""
+    if fcntl is None:
+        yield
+        return
+
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class SharedRateStore:
+    """Rate snapshots shared between worker processes through one local file.
+
+    Writers merge their snapshot into the file under an exclusive ``flock``
+    and swap it in atomically with ``os.replace``, so readers always see a
+    complete file. Readers only re-read the file when its inode, size or
+    mtime changed, so a lookup is usually a single ``stat`` call. Put the file
+    on a tmpfs such as ``/dev/shm`` to keep it in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._snapshots: Dict[str, RateSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def _reload_if_changed(self) -> None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return
+
+        try:
+            snapshots = read_snapshot_file(self.path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable shared rate store {self.path}: {e}")
+            return
+
+        self._snapshots = {snapshot.base_code: snapshot for snapshot in snapshots}
+        self._signature = signature
+
+    def get(self, base_code: str, max_ttl: float) -> Optional[RateSnapshot]:
+        """Return the shared snapshot for ``base_code`` if a fresh one is stored."""
+        with self._lock:
+            self._reload_if_changed()
+            snapshot = self._snapshots.get(base_code.upper())
+
+        if snapshot is None or time.time() >= snapshot.expires_at(max_ttl):
+            return None
+        return snapshot
+
+    def snapshots(self) -> List[RateSnapshot]:
+        """Return every snapshot currently in the store."""
+        with self._lock:
+            self._reload_if_changed()
+            return list(self._snapshots.values())
+
+    def publish(self, snapshot: RateSnapshot) -> None:
+        """Merge ``snapshot`` into the shared file."""
+        with self._lock, exclusive_file_lock(self.lock_path):
+            self._reload_if_changed()
+            merged = dict(self._snapshots)
+            merged[snapshot.base_code] = snapshot
+            write_snapshot_file(self.path, merged.values())
+            self._snapshots = merged
+            stat = os.stat(self.path)
+            self._signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
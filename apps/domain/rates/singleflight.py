@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Async calls are shared per (event loop, key).
+_Flight = Tuple[asyncio.AbstractEventLoop, str]
+
+
+class _Call(Generic[T]):
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key from multiple threads.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight block until it finishes and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[Any]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent coroutine calls with the same key on one event loop.
+
+    Calls are only shared between callers on the same loop; a caller on
+    another loop (another thread, or a later ``asyncio.run``) starts its own.
+    The shared call runs as its own task, so cancelling one waiter (for
+    example when its client disconnects) does not cancel the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[_Flight, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(flight)
+        if task is None:
+            self._forget_closed_loops()
+            task = asyncio.ensure_future(fn())
+            self._tasks[flight] = task
+            task.add_done_callback(lambda done: self._finish(flight, done))
+        return await asyncio.shield(task)
+
+    def _forget_closed_loops(self) -> None:
+        """Drop calls left behind by loops that closed before they finished."""
+        for flight in [flight for flight in self._tasks if flight[0].is_closed()]:
+            self._tasks.pop(flight, None)
+
+    def _finish(self, flight: _Flight, task: "asyncio.Task[Any]") -> None:
+        if self._tasks.get(flight) is task:
+            del self._tasks[flight]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
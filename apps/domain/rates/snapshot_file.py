@@ -0,0 +1,107 @@
+import json
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, List
+
+from .cache import RateSnapshot
+
+# File layout (little-endian):
+#   8 bytes   magic
+#   uint32    length of the JSON header
+#   bytes     JSON header: shared currency code list and per-snapshot metadata
+#   padding   to an 8-byte boundary
+#   float64   one row of len(codes) rates per snapshot, NaN where missing
+MAGIC = b"RATESNP1"
+_HEADER_LENGTH = struct.Struct("<I")
+_PREAMBLE_SIZE = len(MAGIC) + _HEADER_LENGTH.size
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_snapshot_file(path: str, snapshots: Iterable[RateSnapshot]) -> None:
+    """Persist snapshots to ``path``, atomically replacing any previous file."""
+    snapshots = list(snapshots)
+    codes = sorted({code for snapshot in snapshots for code in snapshot.rates})
+    header = json.dumps(
+        {
+            "codes": codes,
+            "snapshots": [
+                {
+                    "base_code": snapshot.base_code,
+                    "time_last_update_utc": snapshot.time_last_update_utc,
+                    "time_next_update_unix": snapshot.time_next_update_unix,
+                    "fetched_at": snapshot.fetched_at,
+                }
+                for snapshot in snapshots
+            ],
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    preamble = MAGIC + _HEADER_LENGTH.pack(len(header)) + header
+    padding = b"\0" * (_align(len(preamble)) - len(preamble))
+    row = struct.Struct(f"<{len(codes)}d")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(preamble)
+        f.write(padding)
+        for snapshot in snapshots:
+            f.write(row.pack(*(snapshot.rates.get(code, math.nan) for code in codes)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_file(path: str) -> List[RateSnapshot]:
+    """Load every snapshot from a file written by :func:`write_snapshot_file`.
+
+    The file is memory-mapped and only the rate rows are unpacked, so loading
+    does not copy the whole file through Python buffers first.
+
+    Raises:
+        ValueError: If the file is not a rate snapshot file.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _PREAMBLE_SIZE:
+            raise ValueError(f"{path} is not a rate snapshot file")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a rate snapshot file")
+
+            (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(MAGIC))
+            header_end = _PREAMBLE_SIZE + header_length
+            header = json.loads(mapped[_PREAMBLE_SIZE:header_end])
+
+            codes = header["codes"]
+            row = struct.Struct(f"<{len(codes)}d")
+            offset = _align(header_end)
+
+            snapshots = []
+            for meta in header["snapshots"]:
+                values = row.unpack_from(mapped, offset)
+                offset += row.size
+                snapshots.append(
+                    RateSnapshot(
+                        base_code=meta["base_code"],
+                        rates={
+                            code: value
+                            for code, value in zip(codes, values)
+                            if not math.isnan(value)
+                        },
+                        time_last_update_utc=meta["time_last_update_utc"],
+                        time_next_update_unix=meta["time_next_update_unix"],
+                        fetched_at=meta["fetched_at"],
+                    )
+                )
+
+    return snapshots
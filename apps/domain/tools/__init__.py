@@ -1,5 +1,15 @@
 """Tools package for the LangChain currency exchange agent."""
 
-from .currency_tool import CurrencyRateTool, SpecificCurrencyRateTool
+from .currency_tool import (
+    CurrencyConversionTool,
+    CurrencyRateTool,
+    HistoricalRateTool,
+    SpecificCurrencyRateTool,
+)
 
-__all__ = ["CurrencyRateTool", "SpecificCurrencyRateTool"]
+__all__ = [
+    "CurrencyConversionTool",
+    "CurrencyRateTool",
+    "HistoricalRateTool",
+    "SpecificCurrencyRateTool",
+]
@@ -0,0 +1,403 @@
+import difflib
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from apps.domain.exceptions import UnknownCurrencyError
+
+# ISO 4217 codes in circulation with their English names.
+ISO_4217: Dict[str, str] = {
+    "AED": "UAE Dirham",
+    "AFN": "Afghan Afghani",
+    "ALL": "Albanian Lek",
+    "AMD": "Armenian Dram",
+    "ANG": "Netherlands Antillean Guilder",
+    "AOA": "Angolan Kwanza",
+    "ARS": "Argentine Peso",
+    "AUD": "Australian Dollar",
+    "AWG": "Aruban Florin",
+    "AZN": "Azerbaijani Manat",
+    "BAM": "Bosnia-Herzegovina Convertible Mark",
+    "BBD": "Barbadian Dollar",
+    "BDT": "Bangladeshi Taka",
+    "BGN": "Bulgarian Lev",
+    "BHD": "Bahraini Dinar",
+    "BIF": "Burundian Franc",
+    "BMD": "Bermudian Dollar",
+    "BND": "Brunei Dollar",
+    "BOB": "Bolivian Boliviano",
+    "BRL": "Brazilian Real",
+    "BSD": "Bahamian Dollar",
+    "BTN": "Bhutanese Ngultrum",
+    "BWP": "Botswana Pula",
+    "BYN": "Belarusian Ruble",
+    "BZD": "Belize Dollar",
+    "CAD": "Canadian Dollar",
+    "CDF": "Congolese Franc",
+    "CHF": "Swiss Franc",
+    "CLP": "Chilean Peso",
+    "CNY": "Chinese Yuan",
+    "COP": "Colombian Peso",
+    "CRC": "Costa Rican Colon",
+    "CUP": "Cuban Peso",
+    "CVE": "Cape Verdean Escudo",
+    "CZK": "Czech Koruna",
+    "DJF": "Djiboutian Franc",
+    "DKK": "Danish Krone",
+    "DOP": "Dominican Peso",
+    "DZD": "Algerian Dinar",
+    "EGP": "Egyptian Pound",
+    "ERN": "Eritrean Nakfa",
+    "ETB": "Ethiopian Birr",
+    "EUR": "Euro",
+    "FJD": "Fijian Dollar",
+    "FKP": "Falkland Islands Pound",
+    "GBP": "British Pound",
+    "GEL": "Georgian Lari",
+    "GHS": "Ghanaian Cedi",
+    "GIP": "Gibraltar Pound",
+    "GMD": "Gambian Dalasi",
+    "GNF": "Guinean Franc",
+    "GTQ": "Guatemalan Quetzal",
+    "GYD": "Guyanese Dollar",
+    "HKD": "Hong Kong Dollar",
+    "HNL": "Honduran Lempira",
+    "HRK": "Croatian Kuna",
+    "HTG": "Haitian Gourde",
+    "HUF": "Hungarian Forint",
+    "IDR": "Indonesian Rupiah",
+    "ILS": "Israeli New Shekel",
+    "INR": "Indian Rupee",
+    "IQD": "Iraqi Dinar",
+    "IRR": "Iranian Rial",
+    "ISK": "Icelandic Krona",
+    "JMD": "Jamaican Dollar",
+    "JOD": "Jordanian Dinar",
+    "JPY": "Japanese Yen",
+    "KES": "Kenyan Shilling",
+    "KGS": "Kyrgyzstani Som",
+    "KHR": "Cambodian Riel",
+    "KMF": "Comorian Franc",
+    "KPW": "North Korean Won",
+    "KRW": "South Korean Won",
+    "KWD": "Kuwaiti Dinar",
+    "KYD": "Cayman Islands Dollar",
+    "KZT": "Kazakhstani Tenge",
+    "LAK": "Lao Kip",
+    "LBP": "Lebanese Pound",
+    "LKR": "Sri Lankan Rupee",
+    "LRD": "Liberian Dollar",
+    "LSL": "Lesotho Loti",
+    "LYD": "Libyan Dinar",
+    "MAD": "Moroccan Dirham",
+    "MDL": "Moldovan Leu",
+    "MGA": "Malagasy Ariary",
+    "MKD": "Macedonian Denar",
+    "MMK": "Myanmar Kyat",
+    "MNT": "Mongolian Tugrik",
+    "MOP": "Macanese Pataca",
+    "MRU": "Mauritanian Ouguiya",
+    "MUR": "Mauritian Rupee",
+    "MVR": "Maldivian Rufiyaa",
+    "MWK": "Malawian Kwacha",
+    "MXN": "Mexican Peso",
+    "MYR": "Malaysian Ringgit",
+    "MZN": "Mozambican Metical",
+    "NAD": "Namibian Dollar",
+    "NGN": "Nigerian Naira",
+    "NIO": "Nicaraguan Cordoba",
+    "NOK": "Norwegian Krone",
+    "NPR": "Nepalese Rupee",
+    "NZD": "New Zealand Dollar",
+    "OMR": "Omani Rial",
+    "PAB": "Panamanian Balboa",
+    "PEN": "Peruvian Sol",
+    "PGK": "Papua New Guinean Kina",
+    "PHP": "Philippine Peso",
+    "PKR": "Pakistani Rupee",
+    "PLN": "Polish Zloty",
+    "PYG": "Paraguayan Guarani",
+    "QAR": "Qatari Riyal",
+    "RON": "Romanian Leu",
+    "RSD": "Serbian Dinar",
+    "RUB": "Russian Ruble",
+    "RWF": "Rwandan Franc",
+    "SAR": "Saudi Riyal",
+    "SBD": "Solomon Islands Dollar",
+    "SCR": "Seychellois Rupee",
+    "SDG": "Sudanese Pound",
+    "SEK": "Swedish Krona",
+    "SGD": "Singapore Dollar",
+    "SHP": "Saint Helena Pound",
+    "SLE": "Sierra Leonean Leone",
+    "SLL": "Old Sierra Leonean Leone",
+    "SOS": "Somali Shilling",
+    "SRD": "Surinamese Dollar",
+    "SSP": "South Sudanese Pound",
+    "STN": "Sao Tome and Principe Dobra",
+    "SYP": "Syrian Pound",
+    "SZL": "Eswatini Lilangeni",
+    "THB": "Thai Baht",
+    "TJS": "Tajikistani Somoni",
+    "TMT": "Turkmenistani Manat",
+    "TND": "Tunisian Dinar",
+    "TOP": "Tongan Pa'anga",
+    "TRY": "Turkish Lira",
+    "TTD": "Trinidad and Tobago Dollar",
+    "TWD": "New Taiwan Dollar",
+    "TZS": "Tanzanian Shilling",
+    "UAH": "Ukrainian Hryvnia",
+    "UGX": "Ugandan Shilling",
+    "USD": "US Dollar",
+    "UYU": "Uruguayan Peso",
+    "UZS": "Uzbekistani Som",
+    "VES": "Venezuelan Bolivar",
+    "VND": "Vietnamese Dong",
+    "VUV": "Vanuatu Vatu",
+    "WST": "Samoan Tala",
+    "XAF": "Central African CFA Franc",
+    "XCD": "East Caribbean Dollar",
+    "XCG": "Caribbean Guilder",
+    "XDR": "IMF Special Drawing Rights",
+    "XOF": "West African CFA Franc",
+    "XPF": "CFP Franc",
+    "YER": "Yemeni Rial",
+    "ZAR": "South African Rand",
+    "ZMW": "Zambian Kwacha",
+    "ZWL": "Zimbabwean Dollar",
+}
+
+# Codes the ExchangeRate API publishes that ISO 4217 does not assign; each
+# is pegged one to one to its parent currency.
+NON_ISO_CURRENCIES: Dict[str, str] = {
+    "FOK": "Faroese Krona",
+    "GGP": "Guernsey Pound",
+    "IMP": "Manx Pound",
+    "JEP": "Jersey Pound",
+    "KID": "Kiribati Dollar",
+    "TVD": "Tuvaluan Dollar",
+}
+
+# Everyday names and symbols. A bare unit that several currencies share maps
+# to the one people usually mean (dollar, pound, franc); the other shared
+# units (peso, krona, dinar, ...) are rejected with the candidates listed.
+ALIASES: Dict[str, str] = {
+    "dollar": "USD",
+    "american dollar": "USD",
+    "united states dollar": "USD",
+    "buck": "USD",
+    "greenback": "USD",
+    "$": "USD",
+    "us$": "USD",
+    "usd$": "USD",
+    "€": "EUR",
+    "pound": "GBP",
+    "pound sterling": "GBP",
+    "pounds sterling": "GBP",
+    "sterling": "GBP",
+    "quid": "GBP",
+    "£": "GBP",
+    "yen": "JPY",
+    "¥": "JPY",
+    "jp¥": "JPY",
+    "yuan": "CNY",
+    "renminbi": "CNY",
+    "rmb": "CNY",
+    "cn¥": "CNY",
+    "franc": "CHF",
+    "rupee": "INR",
+    "₹": "INR",
+    "won": "KRW",
+    "korean won": "KRW",
+    "₩": "KRW",
+    "ruble": "RUB",
+    "rouble": "RUB",
+    "₽": "RUB",
+    "lira": "TRY",
+    "₺": "TRY",
+    "₴": "UAH",
+    "shekel": "ILS",
+    "israeli shekel": "ILS",
+    "₪": "ILS",
+    "₫": "VND",
+    "฿": "THB",
+    "₱": "PHP",
+    "₦": "NGN",
+    "zł": "PLN",
+    "złoty": "PLN",
+    "kč": "CZK",
+    "r$": "BRL",
+    "c$": "CAD",
+    "ca$": "CAD",
+    "a$": "AUD",
+    "au$": "AUD",
+    "nz$": "NZD",
+    "hk$": "HKD",
+    "s$": "SGD",
+    "mx$": "MXN",
+    "nt$": "TWD",
+    "taiwan dollar": "TWD",
+    "loonie": "CAD",
+    "aussie dollar": "AUD",
+    "kiwi dollar": "NZD",
+}
+
+# Fuzzy name matches need this similarity (difflib ratio) to be accepted, and
+# suggestions for rejected input at least SUGGEST_CUTOFF.
+RESOLVE_CUTOFF = 0.85
+SUGGEST_CUTOFF = 0.6
+
+_CODE_WORD = re.compile(r"\b[A-Z]{3}\b")
+_NAME_WORD = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+
+
+def _normalize(text: str) -> str:
+    """Casefold, drop accents, quotes, trailing punctuation and surplus whitespace."""
+    text = unicodedata.normalize("NFKD", text.strip().strip("'\"`").strip())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().replace("’", "'").rstrip(".?!").split())
+
+
+class CurrencyIndex:
+    """In-memory index of currency codes, names, aliases and symbols.
+
+    Everything is precomputed into one dict at construction, so resolving an
+    exact code, name ("Japanese yen", "euros"), alias ("quid") or symbol
+    ("US$") is a single lookup. Misspelled names are matched fuzzily and
+    accepted only when every close match is the same currency. Anything else
+    is rejected with the closest candidates, so a bad argument is caught
+    before any rates are fetched or a model turn is spent on it.
+    """
+
+    def __init__(
+        self,
+        currencies: Optional[Dict[str, str]] = None,
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        if currencies is None:
+            currencies = {**ISO_4217, **NON_ISO_CURRENCIES}
+        if aliases is None:
+            aliases = ALIASES
+        self.names: Dict[str, str] = dict(currencies)
+        self._keys: Dict[str, str] = {}
+        self._shared: Dict[str, Tuple[str, ...]] = {}
+
+        units = defaultdict(list)
+        for code, name in currencies.items():
+            key = _normalize(name)
+            self._add(key, code)
+            units[key.split()[-1]].append(code)
+        for unit, codes in units.items():
+            if len(codes) == 1:
+                if unit not in self._keys:
+                    self._add(unit, codes[0])
+            else:
+                self._shared[unit] = tuple(sorted(codes))
+                self._shared[unit + "s"] = self._shared[unit]
+        for alias, code in aliases.items():
+            self._add(_normalize(alias), code)
+        for code in currencies:
+            self._keys[code.casefold()] = code
+
+        self._name_keys: List[str] = [key for key in self._keys if len(key) > 3]
+        self._max_name_words = max(len(key.split()) for key in self._keys)
+
+    def _add(self, key: str, code: str) -> None:
+        """Index a name and its plural form."""
+        self._keys[key] = code
+        if not key.endswith("s") and key[-1:].isalpha():
+            self._keys.setdefault(key + "s", code)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.names
+
+    def names_for(self, codes: Iterable[str]) -> Dict[str, str]:
+        """Return the indexed names, aliases and symbols of ``codes``, by key."""
+        wanted = set(codes)
+        return {
+            key: code
+            for key, code in self._keys.items()
+            if code in wanted and key != code.casefold()
+        }
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Return the code ``text`` names, or None if it is unknown or ambiguous."""
+        key = _normalize(text)
+        code = self._keys.get(key)
+        if code is not None or not key or key in self._shared or len(key) <= 3:
+            return code
+
+        matches = difflib.get_close_matches(
+            key, self._name_keys, n=3, cutoff=RESOLVE_CUTOFF
+        )
+        codes = {self._keys[match] for match in matches}
+        return codes.pop() if len(codes) == 1 else None
+
+    def mentions(self, text: str) -> Set[str]:
+        """Return the codes free text names, exactly and without fuzzy matching.
+
+        Codes count only when written in capitals, so words such as "all" or
+        "try" are not read as currencies; names and aliases match the longest
+        phrase first, so "Hong Kong dollar" is not also read as "dollar".
+        """
+        codes = {code for code in _CODE_WORD.findall(text) if code in self.names}
+        words = _NAME_WORD.findall(_normalize(text))
+        start = 0
+        while start < len(words):
+            for length in range(min(self._max_name_words, len(words) - start), 0, -1):
+                phrase = " ".join(words[start : start + length])
+                code = self._keys.get(phrase)
+                if code is not None and phrase != code.casefold():
+                    codes.add(code)
+                    start += length
+                    break
+            else:
+                start += 1
+        return codes
+
+    def suggest(self, text: str, limit: int = 3) -> List[str]:
+        """Return the codes ``text`` most plausibly meant, best first."""
+        key = _normalize(text)
+        if key in self._shared:
+            return list(self._shared[key])
+
+        candidates = self._name_keys if len(key) > 3 else list(self.names)
+        if len(key) <= 3:
+            key = key.upper()
+        suggestions: List[str] = []
+        for match in difflib.get_close_matches(
+            key, candidates, n=limit * 3, cutoff=SUGGEST_CUTOFF
+        ):
+            code = self._keys.get(match, match)
+            if code not in suggestions:
+                suggestions.append(code)
+        return suggestions[:limit]
+
+    def code_for(self, text: str) -> str:
+        """Resolve ``text`` to a code.
+
+        Raises:
+            UnknownCurrencyError: If ``text`` is unknown or names several
+                currencies; the message lists the closest candidates.
+        """
+        code = self.resolve(text)
+        if code is not None:
+            return code
+
+        label = " ".join(text.strip().strip("'\"`").split())
+        suggestions = self.suggest(text)
+        listed = ", ".join(f"{code} ({self.names[code]})" for code in suggestions)
+        if _normalize(text) in self._shared:
+            message = f"'{label}' is used by several currencies: {listed}."
+        elif suggestions:
+            message = f"Unknown currency '{label}'. Did you mean {listed}?"
+        else:
+            message = f"Unknown currency '{label}'."
+        raise UnknownCurrencyError(
+            f"{message} Please use a three-letter ISO 4217 code.", suggestions
+        )
+
+
+# Process-wide index used by the currency tools
+currency_index = CurrencyIndex()
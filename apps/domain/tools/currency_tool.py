@@ -1,6 +1,17 @@
-import requests
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import ClassVar, List, Optional, Tuple
 from langchain.tools import BaseTool
-from apps.api.config import settings
+from apps.domain.exceptions import (
+    RateFetchError,
+    RateProviderError,
+    UnknownCurrencyError,
+)
+from apps.domain.rates.history import RateHistory
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.rates.client import rate_client
+from apps.domain.tools.currency_index import currency_index
+from apps.domain.tools.rate_answers import RateAnswer, record_rate_answer
 
 
 class CurrencyRateTool(BaseTool):
@@ -9,66 +20,98 @@ class CurrencyRateTool(BaseTool):
     name: str = "get_currency_rates"
     description: str = (
         "Get current currency exchange rates. "
-        "Input should be a base currency code (e.g., 'USD', 'EUR', 'GBP'). "
+        "Input should be a base currency code (e.g., 'USD', 'EUR', 'GBP') or name. "
         "Returns exchange rates from the base currency to all other currencies."
     )
+    compact_description: ClassVar[str] = (
+        "Rates for a base currency. Input: code, e.g. 'USD'."
+    )
+    compact: bool = False  # one-line output for compact prompt mode
+
+    @staticmethod
+    def _clean_currency(base_currency: str) -> str:
+        """Resolve the base currency code, name or symbol to its code.
+
+        Raises:
+            UnknownCurrencyError: If it names no currency, or several.
+        """
+        return currency_index.code_for(base_currency)
+
+    @staticmethod
+    def _format_rates(
+        base_currency: str, matrix: RateMatrix, compact: bool = False
+    ) -> str:
+        """Format the rates for the base currency for better readability."""
+        if base_currency not in matrix:
+            return (
+                f"Error: Currency '{base_currency}' not found in exchange rates. "
+                "Please check the currency code."
+            )
 
-    def _run(self, base_currency: str = "USD") -> str:
-        """Get currency exchange rates for the specified base currency."""
-        try:
-            # Clean and validate the base currency code
-            base_currency = (
-                base_currency.upper().strip().strip("'\"")
-            )  # Remove quotes and whitespace
-
-            # Construct the API URL
-            url = f"{settings.exchangerate_base_url}/{settings.exchangerate_api_key}/latest/{base_currency}"
-
-            # Make the API request
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+        rates = matrix.rates_for(base_currency)
+        last_update = rate_client.describe_update(matrix)
 
-            data = response.json()
+        # Add some key currencies first
+        key_currencies = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY"]
 
-            # Check if the API returned success
-            if data.get("result") != "success":
-                return f"Error: API returned result '{data.get('result')}'. Please check the currency code."
+        if compact:
+            major = ", ".join(
+                f"{currency} {rates[currency]:.4f}"
+                for currency in key_currencies
+                if currency in rates and currency != base_currency
+            )
+            return (
+                f"1 {base_currency} = {major} "
+                f"({len(rates)} currencies, updated {last_update})"
+            )
 
-            # Format the response for better readability
-            rates = data.get("conversion_rates", {})
-            last_update = data.get("time_last_update_utc", "Unknown")
+        # Create a formatted response
+        result = f"Currency exchange rates (Base: {base_currency})\n"
+        result += f"Last updated: {last_update}\n\n"
 
-            # Create a formatted response
-            result = f"Currency exchange rates (Base: {base_currency})\n"
-            result += f"Last updated: {last_update}\n\n"
+        result += "Major currencies:\n"
+        for currency in key_currencies:
+            if currency in rates and currency != base_currency:
+                result += f"{currency}: {rates[currency]:.4f}\n"
 
-            # Add some key currencies first
-            key_currencies = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY"]
+        # Add total count
+        total_currencies = len(rates)
+        result += f"\nTotal {total_currencies} currencies available."
+        result += "\nFor specific currency rates, you can ask about any currency code."
 
-            result += "Major currencies:\n"
-            for currency in key_currencies:
-                if currency in rates and currency != base_currency:
-                    result += f"{currency}: {rates[currency]:.4f}\n"
+        return result
 
-            # Add total count
-            total_currencies = len(rates)
-            result += f"\nTotal {total_currencies} currencies available."
-            result += (
-                "\nFor specific currency rates, you can ask about any currency code."
-            )
-
-            return result
+    def _run(self, base_currency: str = "USD") -> str:
+        """Get currency exchange rates for the specified base currency."""
+        try:
+            base_currency = self._clean_currency(base_currency)
+            matrix = rate_client.get_matrix()
+            return self._format_rates(base_currency, matrix, self.compact)
 
-        except requests.exceptions.RequestException as e:
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
             return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}. Please check the currency code."
         except Exception as e:
             return f"Error processing currency data: {str(e)}"
 
     async def _arun(self, base_currency: str = "USD") -> str:
         """Async version of the tool."""
-        # For now, we'll use the sync version
-        # In production, you might want to use aiohttp for async requests
-        return self._run(base_currency)
+        try:
+            base_currency = self._clean_currency(base_currency)
+            matrix = await rate_client.aget_matrix()
+            return self._format_rates(base_currency, matrix, self.compact)
+
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
+            return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}. Please check the currency code."
+        except Exception as e:
+            return f"Error processing currency data: {str(e)}"
 
 
 class SpecificCurrencyRateTool(BaseTool):
@@ -78,51 +121,501 @@ class SpecificCurrencyRateTool(BaseTool):
     description: str = (
         "Get conversion rate between two specific currencies. "
         "Input should be in format 'FROM_CURRENCY to TO_CURRENCY' "
-        "(e.g., 'USD to EUR', 'GBP to JPY'). Returns the conversion rate."
+        "(e.g., 'USD to EUR', 'GBP to JPY'); currency names also work. "
+        "Returns the conversion rate."
     )
+    compact_description: ClassVar[str] = (
+        "Rate for a pair. Input: 'FROM to TO', e.g. 'USD to EUR'."
+    )
+    compact: bool = False  # one-line output for compact prompt mode
+
+    _PAIR_SEPARATOR: ClassVar["re.Pattern[str]"] = re.compile(
+        r"\s+(?:to|in|into|vs\.?)\s+|\s*(?:/|->|=)\s*", re.IGNORECASE
+    )
+
+    @classmethod
+    def _parse_pair(cls, currency_pair: str) -> Optional[Tuple[str, str]]:
+        """Parse 'FROM to TO' into a pair of currency codes, or None if malformed.
+
+        Either side may be a code, name or symbol ('Japanese yen to US$').
+
+        Raises:
+            UnknownCurrencyError: If a side names no currency, or several.
+        """
+        currency_pair = " ".join(currency_pair.strip().strip("'\"").split())
+        parts = cls._PAIR_SEPARATOR.split(currency_pair)
+        if len(parts) == 1:
+            parts = currency_pair.split()
+            if len(parts) == 1 and len(currency_pair) == 6 and currency_pair.isalpha():
+                parts = [currency_pair[:3], currency_pair[3:]]  # "USDEUR"
+        if len(parts) != 2 or not all(parts):
+            return None
+
+        return currency_index.code_for(parts[0]), currency_index.code_for(parts[1])
+
+    @staticmethod
+    def _format_rate(
+        from_currency: str, to_currency: str, matrix: RateMatrix, compact: bool = False
+    ) -> str:
+        """Format a single cross rate derived from the rate matrix."""
+        for currency in (from_currency, to_currency):
+            if currency not in matrix:
+                return f"Error: Currency '{currency}' not found in exchange rates"
+
+        rate = matrix.rate(from_currency, to_currency)
+        last_update = rate_client.describe_update(matrix)
+
+        if compact:
+            return (
+                f"1 {from_currency} = {rate:.4f} {to_currency} (updated {last_update})"
+            )
+
+        result = f"Exchange Rate: 1 {from_currency} = {rate:.4f} {to_currency}\n"
+        result += f"Last updated: {last_update}"
+
+        return result
+
+    def _answer(self, from_currency: str, to_currency: str, matrix: RateMatrix) -> str:
+        """Format the rate and register its structured answer for the agent."""
+        result = self._format_rate(from_currency, to_currency, matrix, self.compact)
+        if not result.startswith("Error"):
+            record_rate_answer(
+                result, RateAnswer.from_matrix(matrix, from_currency, to_currency)
+            )
+        return result
 
     def _run(self, currency_pair: str) -> str:
         """Get conversion rate between two specific currencies."""
         try:
-            # Parse the input and clean quotes
-            currency_pair = currency_pair.strip().strip(
-                "'\""
-            )  # Remove quotes and whitespace
-            parts = currency_pair.upper().replace(" TO ", " ").split()
-            if len(parts) != 2:
-                return "Error: Please provide currency pair in format 'FROM_CURRENCY to TO_CURRENCY'"
+            pair = self._parse_pair(currency_pair)
+            if pair is None:
+                return (
+                    "Error: Please provide currency pair in format "
+                    "'FROM_CURRENCY to TO_CURRENCY'"
+                )
+
+            from_currency, to_currency = pair
+            matrix = rate_client.get_matrix()
+            return self._answer(from_currency, to_currency, matrix)
+
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
+            return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
+
+    async def _arun(self, currency_pair: str) -> str:
+        """Async version of the tool."""
+        try:
+            pair = self._parse_pair(currency_pair)
+            if pair is None:
+                return (
+                    "Error: Please provide currency pair in format "
+                    "'FROM_CURRENCY to TO_CURRENCY'"
+                )
+
+            from_currency, to_currency = pair
+            matrix = await rate_client.aget_matrix()
+            return self._answer(from_currency, to_currency, matrix)
+
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
+            return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
+
 
-            from_currency, to_currency = parts[0], parts[1]
+class CurrencyConversionTool(BaseTool):
+    """Tool for converting one amount into several currencies at once."""
 
-            # Get rates for the from_currency
-            url = f"{settings.exchangerate_base_url}/{settings.exchangerate_api_key}/latest/{from_currency}"
+    name: str = "convert_currency_amount"
+    description: str = (
+        "Convert an amount of one currency into several target currencies in one call. "
+        "Input should be 'AMOUNT FROM_CURRENCY to TARGET1, TARGET2, ...' "
+        "(e.g., '250 EUR to USD, GBP, JPY, CHF') or 'AMOUNT FROM_CURRENCY to all'; "
+        "currency names also work. Returns a table of converted amounts."
+    )
+    compact_description: ClassVar[str] = (
+        "Convert an amount to many currencies. "
+        "Input: '250 EUR to USD, GBP' or '250 EUR to all'."
+    )
+    compact: bool = False  # one-line output for compact prompt mode
 
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+    _INPUT_PATTERN: ClassVar["re.Pattern[str]"] = re.compile(
+        r"^(?:(?P<amount>\d[\d,]*(?:\.\d+)?|\.\d+)\s*)?"
+        r"(?P<from_currency>.+?)\s+(?:to|in|into)\s+(?P<targets>.+)$",
+        re.IGNORECASE,
+    )
+    _TARGET_SEPARATOR: ClassVar["re.Pattern[str]"] = re.compile(
+        r"\s*[,;/&]\s*|\s+and\s+", re.IGNORECASE
+    )
 
-            data = response.json()
+    @staticmethod
+    def _target_code(text: str) -> str:
+        """Resolve one target; an unknown three-letter code is kept to be reported.
+
+        Raises:
+            UnknownCurrencyError: If a longer name names no currency, or several.
+        """
+        code = currency_index.resolve(text)
+        if code is not None:
+            return code
+        if len(text) == 3 and text.isalpha():
+            return text.upper()
+        return currency_index.code_for(text)
+
+    @classmethod
+    def _parse_conversion(
+        cls, conversion: str
+    ) -> Optional[Tuple[float, str, Optional[List[str]]]]:
+        """Parse 'AMOUNT FROM to T1, T2' into (amount, from, targets).
+
+        Currencies may be codes, names or symbols ('250 euros to yen, GBP').
+        ``targets`` is None for 'all'.
+
+        Raises:
+            UnknownCurrencyError: If the source or a target name is unknown.
+        """
+        conversion = " ".join(conversion.strip().strip("'\"").split())
+        match = cls._INPUT_PATTERN.match(conversion)
+        if match is None:
+            return None
+
+        raw_amount = match.group("amount")
+        amount = float(raw_amount.replace(",", "")) if raw_amount else 1.0
+        from_currency = currency_index.code_for(match.group("from_currency"))
+        if match.group("targets").upper() == "ALL":
+            return amount, from_currency, None
+
+        targets: List[str] = []
+        for part in cls._TARGET_SEPARATOR.split(match.group("targets")):
+            code = currency_index.resolve(part) if part else None
+            if code is not None:
+                targets.append(code)
+            else:
+                # A space-separated list of codes ('USD GBP JPY')
+                targets.extend(cls._target_code(word) for word in part.split())
+        if not targets:
+            return None
+        return amount, from_currency, list(dict.fromkeys(targets))
+
+    @staticmethod
+    def _format_conversions(
+        amount: float,
+        from_currency: str,
+        targets: Optional[List[str]],
+        matrix: RateMatrix,
+        compact: bool = False,
+    ) -> str:
+        """Convert in one pass over the rate table and format the results as a table."""
+        if from_currency not in matrix:
+            return f"Error: Currency '{from_currency}' not found in exchange rates"
+
+        conversions = [
+            (code, value)
+            for code, value in matrix.convert(amount, from_currency, targets)
+            if code != from_currency
+        ]
+        unknown = [code for code in targets if code not in matrix] if targets else []
+        last_update = rate_client.describe_update(matrix)
+
+        if compact:
+            result = f"{amount:,.2f} {from_currency} = " + ", ".join(
+                f"{value:,.2f} {code}" for code, value in conversions
+            )
+            result += f" (updated {last_update})"
+        else:
+            result = f"Conversions of {amount:,.2f} {from_currency}\n"
+            result += f"Last updated: {last_update}\n\n"
+            result += "\n".join(f"{code}: {value:,.2f}" for code, value in conversions)
+
+        if unknown:
+            result += f"\nUnknown currencies: {', '.join(unknown)}"
+        return result
+
+    def _answer(
+        self,
+        amount: float,
+        from_currency: str,
+        targets: Optional[List[str]],
+        matrix: RateMatrix,
+    ) -> str:
+        """Convert and format the amount.
+
+        A single-target conversion also registers its structured answer.
+        """
+        result = self._format_conversions(
+            amount, from_currency, targets, matrix, self.compact
+        )
+        if (
+            not result.startswith("Error")
+            and targets is not None
+            and len(targets) == 1
+            and targets[0] in matrix
+            and targets[0] != from_currency
+        ):
+            record_rate_answer(
+                result,
+                RateAnswer.from_matrix(matrix, from_currency, targets[0], amount),
+            )
+        return result
 
-            if data.get("result") != "success":
-                return f"Error: API returned result '{data.get('result')}'"
+    def _run(self, conversion: str) -> str:
+        """Convert an amount into several currencies."""
+        try:
+            parsed = self._parse_conversion(conversion)
+            if parsed is None:
+                return (
+                    "Error: Please provide input in format "
+                    "'AMOUNT FROM_CURRENCY to TARGET1, TARGET2' "
+                    "or 'AMOUNT FROM_CURRENCY to all'"
+                )
+
+            amount, from_currency, targets = parsed
+            matrix = rate_client.get_matrix()
+            return self._answer(amount, from_currency, targets, matrix)
+
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
+            return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
+
+    async def _arun(self, conversion: str) -> str:
+        """Async version of the tool."""
+        try:
+            parsed = self._parse_conversion(conversion)
+            if parsed is None:
+                return (
+                    "Error: Please provide input in format "
+                    "'AMOUNT FROM_CURRENCY to TARGET1, TARGET2' "
+                    "or 'AMOUNT FROM_CURRENCY to all'"
+                )
+
+            amount, from_currency, targets = parsed
+            matrix = await rate_client.aget_matrix()
+            return self._answer(amount, from_currency, targets, matrix)
+
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except RateFetchError as e:
+            return f"Error fetching currency rates: {str(e)}"
+        except RateProviderError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
 
-            rates = data.get("conversion_rates", {})
 
-            if to_currency not in rates:
-                return f"Error: Currency '{to_currency}' not found in exchange rates"
+class HistoricalRateTool(BaseTool):
+    """Tool for past rates and recent changes from the local rate history."""
 
-            rate = rates[to_currency]
-            last_update = data.get("time_last_update_utc", "Unknown")
+    name: str = "get_historical_rates"
+    description: str = (
+        "Get past exchange rates recorded by this service. "
+        "Input should be 'FROM_CURRENCY to TO_CURRENCY on YYYY-MM-DD' "
+        "for the rate on a date (e.g., 'EUR to USD on 2025-07-01') "
+        "or 'FROM_CURRENCY to TO_CURRENCY last N days' "
+        "for the change over recent days (e.g., 'GBP to JPY last 30 days'); "
+        "currency names also work. Only days the service has recorded are available."
+    )
+    compact_description: ClassVar[str] = (
+        "Past rates. Input: 'EUR to USD on 2025-07-01' or 'EUR to USD last 30 days'."
+    )
+    compact: bool = False  # one-line output for compact prompt mode
 
-            result = f"Exchange Rate: 1 {from_currency} = {rate:.4f} {to_currency}\n"
-            result += f"Last updated: {last_update}"
+    # Longest range a single query may cover.
+    MAX_DAYS: ClassVar[int] = 3660
 
+    _INPUT_PATTERN: ClassVar["re.Pattern[str]"] = re.compile(
+        r"^(?P<currency_pair>.+?)\s+"
+        r"(?:on\s+(?P<date>\d{4}-\d{2}-\d{2})"
+        r"|(?:over\s+)?(?:the\s+)?last\s+(?P<days>\d+)\s+days?)$",
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def _parse_query(
+        cls, query: str
+    ) -> Optional[Tuple[str, str, Optional[date], Optional[int]]]:
+        """Parse the tool input into (from, to, date, days).
+
+        The pair is read as by ``get_specific_currency_rate``, so either side
+        may be a code, name or symbol. Exactly one of ``date`` and ``days`` is
+        set.
+
+        Raises:
+            UnknownCurrencyError: If a side names no currency, or several.
+        """
+        query = " ".join(query.strip().strip("'\"").split())
+        match = cls._INPUT_PATTERN.match(query)
+        if match is None:
+            return None
+
+        pair = SpecificCurrencyRateTool._parse_pair(match.group("currency_pair"))
+        if pair is None:
+            return None
+        from_currency, to_currency = pair
+        if match.group("date"):
+            try:
+                return (
+                    from_currency,
+                    to_currency,
+                    date.fromisoformat(match.group("date")),
+                    None,
+                )
+            except ValueError:
+                return None
+
+        days = int(match.group("days"))
+        if not 1 <= days <= cls.MAX_DAYS:
+            return None
+        return from_currency, to_currency, None, days
+
+    @staticmethod
+    def _no_data(
+        history: RateHistory, from_currency: str, to_currency: str, when: str
+    ) -> str:
+        for currency in (from_currency, to_currency):
+            if not history.has_currency(currency):
+                return f"Error: No rate history recorded for '{currency}'"
+
+        recorded = history.date_range()
+        if recorded is None:
+            return "Error: No rate history has been recorded yet"
+        return (
+            f"Error: No {from_currency}/{to_currency} rates recorded {when}. "
+            f"History covers {recorded[0].isoformat()} to {recorded[1].isoformat()}."
+        )
+
+    @classmethod
+    def _format_rate_on(
+        cls,
+        history: RateHistory,
+        from_currency: str,
+        to_currency: str,
+        day: date,
+        compact: bool = False,
+    ) -> str:
+        """Format the rate recorded on a day (or the closest earlier recorded day)."""
+        point = history.rate_on(from_currency, to_currency, day)
+        if point is None:
+            return cls._no_data(
+                history,
+                from_currency,
+                to_currency,
+                f"on or shortly before {day.isoformat()}",
+            )
+
+        recorded_day, rate = point
+        result = (
+            f"1 {from_currency} = {rate:.4f} {to_currency} "
+            f"on {recorded_day.isoformat()}"
+        )
+        if recorded_day != day:
+            result += f" (latest recorded day before {day.isoformat()})"
+        if compact:
             return result
+        return f"Historical exchange rate: {result}"
+
+    @classmethod
+    def _format_change(
+        cls,
+        history: RateHistory,
+        from_currency: str,
+        to_currency: str,
+        days: int,
+        today: date,
+        compact: bool = False,
+    ) -> str:
+        """Format how a pair moved over the last ``days`` days."""
+        start = today - timedelta(days=days)
+        points = history.series(from_currency, to_currency, start, today)
+        if not points:
+            return cls._no_data(
+                history, from_currency, to_currency, f"in the last {days} days"
+            )
 
-        except requests.exceptions.RequestException as e:
-            return f"Error fetching currency rates: {str(e)}"
+        (first_day, first_rate), (last_day, last_rate) = points[0], points[-1]
+        change = last_rate - first_rate
+        percent = change / first_rate * 100 if first_rate else 0.0
+        rates = [rate for _, rate in points]
+
+        if compact:
+            return (
+                f"{from_currency}/{to_currency} "
+                f"{first_day.isoformat()} {first_rate:.4f} -> "
+                f"{last_day.isoformat()} {last_rate:.4f} "
+                f"({change:+.4f}, {percent:+.2f}%), "
+                f"low {min(rates):.4f}, high {max(rates):.4f}, {len(points)} days"
+            )
+
+        result = f"{from_currency} to {to_currency} over the last {days} days\n"
+        result += (
+            f"Recorded days: {len(points)} "
+            f"({first_day.isoformat()} to {last_day.isoformat()})\n\n"
+        )
+        result += (
+            f"{first_day.isoformat()}: "
+            f"1 {from_currency} = {first_rate:.4f} {to_currency}\n"
+        )
+        result += (
+            f"{last_day.isoformat()}: "
+            f"1 {from_currency} = {last_rate:.4f} {to_currency}\n"
+        )
+        result += f"Change: {change:+.4f} ({percent:+.2f}%)\n"
+        result += f"Low: {min(rates):.4f}, High: {max(rates):.4f}"
+        return result
+
+    def _answer(self, query: str) -> str:
+        parsed = self._parse_query(query)
+        if parsed is None:
+            return (
+                "Error: Please provide input in format "
+                "'FROM_CURRENCY to TO_CURRENCY on YYYY-MM-DD' "
+                "or 'FROM_CURRENCY to TO_CURRENCY last N days'"
+            )
+
+        history = rate_client.history
+        if history is None:
+            return "Error: Rate history is not enabled on this server"
+
+        from_currency, to_currency, day, days = parsed
+        if day is not None:
+            return self._format_rate_on(
+                history, from_currency, to_currency, day, self.compact
+            )
+        today = datetime.now(timezone.utc).date()
+        return self._format_change(
+            history, from_currency, to_currency, days, today, self.compact
+        )
+
+    def _run(self, query: str) -> str:
+        """Look up past rates from the local history."""
+        try:
+            return self._answer(query)
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
         except Exception as e:
             return f"Error processing request: {str(e)}"
 
-    async def _arun(self, currency_pair: str) -> str:
-        """Async version of the tool."""
-        return self._run(currency_pair)
+    async def _arun(self, query: str) -> str:
+        """Async version of the tool.
+
+        History reads are a few pages of memory-mapped local files, so they run
+        inline instead of on a thread.
+        """
+        try:
+            return self._answer(query)
+        except UnknownCurrencyError as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Error processing request: {str(e)}"
@@ -0,0 +1,138 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional
+
+from apps.domain.rates.client import format_last_update, rate_client
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_index import currency_index
+
+_AMOUNT = re.compile(r"\d[\d,]*(?:\.\d+)?|\.\d+")
+
+
+@dataclass(frozen=True)
+class RateAnswer:
+    """Machine-readable result of a single pair lookup or conversion."""
+
+    from_currency: str
+    to_currency: str
+    amount: float
+    rate: float
+    converted_amount: float
+    last_updated: str
+    stale_age_seconds: Optional[float] = None  # set while the rates are served stale
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: RateMatrix,
+        from_currency: str,
+        to_currency: str,
+        amount: float = 1.0,
+    ) -> "RateAnswer":
+        rate = matrix.rate(from_currency, to_currency)
+        return cls(
+            from_currency=from_currency,
+            to_currency=to_currency,
+            amount=amount,
+            rate=rate,
+            converted_amount=amount * rate,
+            last_updated=matrix.time_last_update_utc,
+            stale_age_seconds=rate_client.stale_age(matrix.snapshot),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["stale"] = data.pop("stale_age_seconds") is not None
+        return data
+
+    def covers(self, query: str) -> bool:
+        """Whether ``query`` asks for exactly this pair and amount, and nothing more.
+
+        The query must name both currencies and no other, and state this
+        amount (or none, for a plain rate).
+        """
+        if currency_index.mentions(query) != {self.from_currency, self.to_currency}:
+            return False
+        amounts = [float(value.replace(",", "")) for value in _AMOUNT.findall(query)]
+        return amounts == ([] if self.amount == 1.0 else [self.amount])
+
+    def describe(self) -> str:
+        """Phrase the answer as the sentence the fast path and direct answers return."""
+        rate_line = f"1 {self.from_currency} = {self.rate:.4f} {self.to_currency}"
+        last_update = format_last_update(self.last_updated, self.stale_age_seconds)
+
+        if self.amount == 1.0:
+            return (
+                f"The current {self.from_currency} to {self.to_currency} exchange "
+                f"rate is {self.rate:.4f} ({rate_line}). "
+                f"The rates were last updated on {last_update}."
+            )
+
+        return (
+            f"{self.amount:,.2f} {self.from_currency} = "
+            f"{self.converted_amount:,.2f} {self.to_currency} ({rate_line}). "
+            f"The rates were last updated on {last_update}."
+        )
+
+
+class RateAnswerCollector:
+    """Structured answers behind the tool observations of one agent run.
+
+    Tools register the :class:`RateAnswer` their observation states; the
+    executor counts every tool call, so a run whose only tool call produced
+    an answer that covers the whole ``query`` can be recognized as fully
+    answered by it.
+    """
+
+    def __init__(self, query: Optional[str] = None):
+        self.query = query
+        self.tool_calls = 0
+        self.answers: Dict[str, RateAnswer] = {}
+
+    def answer_for(self, observation: Any) -> Optional[RateAnswer]:
+        """Return the answer behind ``observation`` if it alone answers the query."""
+        if self.tool_calls != 1 or self.query is None:
+            return None
+        if not isinstance(observation, str):
+            return None
+        answer = self.answers.get(observation)
+        if answer is None or not answer.covers(self.query):
+            return None
+        return answer
+
+    @property
+    def single_answer(self) -> Optional[RateAnswer]:
+        if self.tool_calls != 1 or len(self.answers) != 1:
+            return None
+        return next(iter(self.answers.values()))
+
+
+_active_collector: ContextVar[Optional[RateAnswerCollector]] = ContextVar(
+    "rate_answer_collector", default=None
+)
+
+
+@contextmanager
+def collecting_rate_answers(
+    query: Optional[str] = None,
+) -> Iterator[RateAnswerCollector]:
+    """Collect the structured answers of tool calls made inside the block."""
+    collector = RateAnswerCollector(query)
+    token = _active_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _active_collector.reset(token)
+
+
+def active_rate_answers() -> Optional[RateAnswerCollector]:
+    return _active_collector.get()
+
+
+def record_rate_answer(observation: str, answer: RateAnswer) -> None:
+    """Tie a tool observation to the structured answer it states."""
+    collector = _active_collector.get()
+    if collector is not None:
+        collector.answers[observation] = answer
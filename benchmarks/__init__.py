@@ -0,0 +1,6 @@
+"""Offline benchmark suite.
+
+Runs the API against a local stand-in for the ExchangeRate API and a
+deterministic fake chat model, so results depend only on this code base.
+Run it with ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,153 @@
+import asyncio
+import re
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_CURRENCY_CODE = re.compile(r"\b[A-Z]{3}\b")
+_AMOUNT = re.compile(r"\d+(?:\.\d+)?")
+_REACT_QUESTION = re.compile(r"^Question: (?P<question>.*)$", re.MULTILINE)
+_REACT_OBSERVATION = re.compile(r"Observation: (?P<observation>.*)")
+
+
+def _tool_call_for(query: str) -> Tuple[str, str, str]:
+    """Pick the tool, argument name and input an agent would use for ``query``.
+
+    Three or more currency codes convert an amount into all the others, two
+    ask for a specific rate, one asks for that base's rates and none falls
+    back to USD rates.
+    """
+    codes = _CURRENCY_CODE.findall(query)
+    if len(codes) >= 3:
+        amount = _AMOUNT.search(query)
+        targets = ", ".join(codes[1:])
+        return (
+            "convert_currency_amount",
+            "conversion",
+            f"{amount.group() if amount else 1} {codes[0]} to {targets}",
+        )
+    if len(codes) == 2:
+        return (
+            "get_specific_currency_rate",
+            "currency_pair",
+            f"{codes[0]} to {codes[1]}",
+        )
+    return "get_currency_rates", "base_currency", codes[0] if codes else "USD"
+
+
+class BenchmarkChatModel(BaseChatModel):
+    """Deterministic stand-in for a tool-calling chat model.
+
+    On the first turn it asks for one tool call picked from the currency codes
+    in the query; once it has seen a tool result it answers with that result.
+    It speaks every agent flavour: ``tool_calls`` when tools are bound
+    (``create_openai_tools_agent`` and ``create_tool_calling_agent``) and
+    Thought/Action text otherwise (``create_react_agent``). Every call sleeps
+    ``latency_seconds``.
+    """
+
+    latency_seconds: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "benchmark-fake"
+
+    def bind_tools(self, tools: Sequence[BaseTool], **kwargs: Any) -> Runnable:
+        return self.bind(
+            tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs
+        )
+
+    def _respond(self, messages: List[BaseMessage], tools_bound: bool) -> AIMessage:
+        if tools_bound:
+            message = self._respond_with_tool_calls(messages)
+        else:
+            message = self._respond_with_react_text(messages)
+
+        prompt_chars = sum(len(str(m.content)) for m in messages)
+        output_tokens = max(1, len(str(message.content)) // 4)
+        message.usage_metadata = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_chars // 4 + output_tokens,
+        }
+        return message
+
+    @staticmethod
+    def _respond_with_tool_calls(messages: List[BaseMessage]) -> AIMessage:
+        tool_results = [m for m in messages if isinstance(m, ToolMessage)]
+        if tool_results:
+            return AIMessage(
+                content=f"Here is what I found. {tool_results[-1].content}"
+            )
+
+        query = next(
+            (str(m.content) for m in messages if isinstance(m, HumanMessage)), ""
+        )
+        tool, argument, tool_input = _tool_call_for(query)
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": tool, "args": {argument: tool_input}, "id": "call_benchmark"}
+            ],
+        )
+
+    @staticmethod
+    def _respond_with_react_text(messages: List[BaseMessage]) -> AIMessage:
+        prompt = "\n".join(str(m.content) for m in messages)
+        # The format instructions contain example Question/Observation lines;
+        # the real question is the last one and the scratchpad follows it.
+        questions = list(_REACT_QUESTION.finditer(prompt))
+        question = questions[-1].group("question") if questions else ""
+        scratchpad = prompt[questions[-1].end() :] if questions else prompt
+
+        observations = _REACT_OBSERVATION.findall(scratchpad)
+        if observations:
+            return AIMessage(
+                content=(
+                    "Thought: I now know the final answer\n"
+                    f"Final Answer: Here is what I found. {observations[-1]}"
+                )
+            )
+
+        tool, _, tool_input = _tool_call_for(question)
+        return AIMessage(
+            content=(
+                "I should look up the rates.\n"
+                f"Action: {tool}\n"
+                f"Action Input: {tool_input}"
+            )
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        message = self._respond(messages, tools_bound="tools" in kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        message = self._respond(messages, tools_bound="tools" in kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,86 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+@dataclass
+class LoadResult:
+    """Latencies and errors of one scenario at one concurrency level."""
+
+    scenario: str
+    concurrency: int
+    duration_seconds: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def throughput(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return len(self.latencies) / self.duration_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        to_ms = 1000.0
+        return {
+            "scenario": self.scenario,
+            "concurrency": self.concurrency,
+            "requests": len(latencies),
+            "errors": self.errors,
+            "duration_seconds": round(self.duration_seconds, 4),
+            "throughput_rps": round(self.throughput, 2),
+            "latency_ms": {
+                "mean": (
+                    round(sum(latencies) / len(latencies) * to_ms, 3)
+                    if latencies
+                    else 0.0
+                ),
+                "p50": round(percentile(latencies, 50) * to_ms, 3),
+                "p95": round(percentile(latencies, 95) * to_ms, 3),
+                "p99": round(percentile(latencies, 99) * to_ms, 3),
+                "max": round(latencies[-1] * to_ms, 3) if latencies else 0.0,
+            },
+        }
+
+
+async def run_load(
+    scenario: str,
+    call: Callable[[int], Awaitable[bool]],
+    concurrency: int,
+    total_requests: int,
+) -> LoadResult:
+    """Issue ``total_requests`` calls from ``concurrency`` closed-loop workers.
+
+    ``call`` receives the request index and returns whether it succeeded;
+    exceptions count as errors.
+    """
+    result = LoadResult(
+        scenario=scenario, concurrency=concurrency, duration_seconds=0.0
+    )
+    indexes = iter(range(total_requests))
+
+    async def worker() -> None:
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                ok = await call(index)
+            except Exception:
+                ok = False
+            result.latencies.append(time.perf_counter() - started)
+            if not ok:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    result.duration_seconds = time.perf_counter() - started
+    return result
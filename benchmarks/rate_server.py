@@ -0,0 +1,96 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+EXAMPLE_RESPONSE_PATH = Path(__file__).parent.parent / "example_response.json"
+
+_LATEST_PATH = re.compile(r"/latest/(?P<base>[A-Za-z]{3})$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "RateServer"
+
+    def do_GET(self) -> None:
+        self.server.request_count += 1
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+
+        match = _LATEST_PATH.search(self.path)
+        payload = self.server.payload_for(match.group("base")) if match else None
+        if payload is None:
+            self._send_json(404, {"result": "error", "error-type": "unsupported-code"})
+        else:
+            self._send_json(200, payload)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # keep benchmark output readable
+
+
+class RateServer(ThreadingHTTPServer):
+    """Local stand-in for the ExchangeRate API ``latest`` endpoint.
+
+    Serves the rates from ``example_response.json`` rebased onto the requested
+    base currency, after sleeping ``latency_seconds`` to mimic the upstream
+    round trip. Point ``EXCHANGERATE_BASE_URL`` at :attr:`base_url`; any API
+    key in the path is accepted.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, latency_seconds: float = 0.0, host: str = "127.0.0.1", port: int = 0
+    ):
+        super().__init__((host, port), _Handler)
+        self.latency_seconds = latency_seconds
+        self.request_count = 0
+        self._template = json.loads(EXAMPLE_RESPONSE_PATH.read_text())
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v6"
+
+    def payload_for(self, base_currency: str) -> Optional[Dict[str, Any]]:
+        """Return a ``latest`` response for ``base_currency``, or None if unknown."""
+        base_currency = base_currency.upper()
+        if base_currency in self._payloads:
+            return self._payloads[base_currency]
+
+        usd_rates = self._template["conversion_rates"]
+        base_rate = usd_rates.get(base_currency)
+        if not base_rate:
+            return None
+
+        payload = dict(self._template)
+        payload["base_code"] = base_currency
+        payload["conversion_rates"] = {
+            code: round(rate / base_rate, 6) for code, rate in usd_rates.items()
+        }
+        self._payloads[base_currency] = payload
+        return payload
+
+    def start(self) -> "RateServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from apps.api.app import app
+from apps.api.config import settings
+from apps.api.routers import agent as agent_router
+from apps.domain.agents.answer_cache import answer_cache
+from apps.domain.agents.currency_exchange import (
+    AGENT_TYPE_OPENAI_TOOLS,
+    AGENT_TYPE_REACT,
+    AGENT_TYPE_TOOL_CALLING,
+    CurrencyExchangeAgent,
+)
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.providers import ExchangeRateApiProvider
+from apps.domain.tools.currency_tool import CurrencyRateTool, SpecificCurrencyRateTool
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.load import LoadResult, run_load
+from benchmarks.rate_server import RateServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SCENARIO_QUERY = "query"
+SCENARIO_QUERY_SYNC = "query_sync"
+SCENARIO_TOOL = "tool"
+SCENARIOS = (SCENARIO_QUERY, SCENARIO_QUERY_SYNC, SCENARIO_TOOL)
+
+# Cycled through in order so every run sends the same workload. None of them
+# is a plain "amount FROM to TO" conversion, so they all reach the agent even
+# with the fast path enabled.
+QUERIES = (
+    "What's the USD to EUR rate, and is now a good time to buy?",
+    "Show me the latest exchange rates for GBP",
+    "How does JPY compare with CHF these days?",
+    "What are the current exchange rates?",
+    "I'm travelling from CAD to AUD next week, what rate should I expect?",
+    "Give me today's EUR rates please",
+    "How much is 250 EUR in USD, GBP, JPY and CHF?",
+)
+
+
+class BenchmarkAgent(CurrencyExchangeAgent):
+    """Currency agent driven by a :class:`BenchmarkChatModel`."""
+
+    def __init__(self, llm: BenchmarkChatModel):
+        self._benchmark_llm = llm
+        super().__init__()
+
+    def _create_llm(self) -> BenchmarkChatModel:
+        return self._benchmark_llm
+
+
+def configure(
+    rate_server: RateServer,
+    agent_type: str,
+    llm_latency_seconds: float,
+    fast_path: bool,
+    answer_cache_enabled: bool,
+    compact: bool = False,
+) -> None:
+    """Point the app at the local stand-ins and install the benchmark agent."""
+    settings.exchangerate_base_url = rate_server.base_url
+    settings.model_provider = (
+        "openai" if agent_type == AGENT_TYPE_OPENAI_TOOLS else "ollama"
+    )
+    settings.ollama_tool_calling = (
+        "on" if agent_type == AGENT_TYPE_TOOL_CALLING else "off"
+    )
+    settings.model_name = "benchmark-fake"
+    settings.agent_verbose = False
+    settings.rate_prefetch_enabled = False
+    settings.fast_path_enabled = fast_path
+    settings.answer_cache_enabled = answer_cache_enabled
+    settings.prompt_compact = compact
+    # The stand-in model has no capacity limit; measure the app, not the cap.
+    settings.admission_enabled = False
+
+    # Fetch from the stand-in rate server whatever RATE_PROVIDER says, never
+    # read or overwrite the real snapshot file or history, and start cold.
+    rate_client.provider = ExchangeRateApiProvider(
+        timeout=settings.exchangerate_timeout_seconds,
+        max_connections=settings.exchangerate_max_connections,
+    )
+    rate_client.store = None
+    rate_client.history = None
+    rate_client.cache.clear()
+    rate_client.breaker.reset()
+    answer_cache.backend.clear()
+
+    agent_router._currency_agent = BenchmarkAgent(
+        BenchmarkChatModel(latency_seconds=llm_latency_seconds)
+    )
+
+
+class ApiServer:
+    """Runs the FastAPI app under uvicorn on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, 0))
+        self.url = "http://%s:%d" % self._socket.getsockname()
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, log_level="warning", timeout_graceful_shutdown=5)
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, timeout: float = 30.0) -> "ApiServer":
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("API server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join()
+        self._socket.close()
+
+
+def _http_call(
+    client: httpx.AsyncClient, path: str
+) -> Callable[[int], Awaitable[bool]]:
+    async def call(index: int) -> bool:
+        response = await client.post(
+            path, json={"message": QUERIES[index % len(QUERIES)]}
+        )
+        return response.status_code == 200
+
+    return call
+
+
+def _tool_call() -> Callable[[int], Awaitable[bool]]:
+    calls = (
+        (SpecificCurrencyRateTool(), "USD to EUR"),
+        (CurrencyRateTool(), "GBP"),
+    )
+
+    async def call(index: int) -> bool:
+        tool, tool_input = calls[index % len(calls)]
+        output = await tool.arun(tool_input)
+        return not output.startswith("Error")
+
+    return call
+
+
+async def _run_levels(
+    scenario: str,
+    call: Callable[[int], Awaitable[bool]],
+    concurrency_levels: List[int],
+    requests_per_level: int,
+) -> List[LoadResult]:
+    await call(0)  # warm-up: rate fetch, agent and connection setup
+    results = []
+    for concurrency in concurrency_levels:
+        result = await run_load(scenario, call, concurrency, requests_per_level)
+        print(format_result(result.as_dict()))
+        results.append(result)
+    return results
+
+
+async def _run_tool_scenario(
+    concurrency_levels: List[int], requests_per_level: int
+) -> List[LoadResult]:
+    try:
+        return await _run_levels(
+            SCENARIO_TOOL, _tool_call(), concurrency_levels, requests_per_level
+        )
+    finally:
+        # The async client is bound to this event loop; the server opens its own.
+        await rate_client.aclose()
+
+
+async def _run_http_scenarios(
+    base_url: str,
+    scenarios: List[str],
+    concurrency_levels: List[int],
+    requests_per_level: int,
+) -> List[LoadResult]:
+    paths = {SCENARIO_QUERY: "/query", SCENARIO_QUERY_SYNC: "/query-sync"}
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+    results: List[LoadResult] = []
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=120.0, limits=limits
+    ) as client:
+        for scenario in scenarios:
+            results += await _run_levels(
+                scenario,
+                _http_call(client, paths[scenario]),
+                concurrency_levels,
+                requests_per_level,
+            )
+    return results
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{result['scenario']:<11} c={result['concurrency']:<4} "
+        f"{result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.1f} ms  p95 {latency['p95']:>8.1f} ms  "
+        f"p99 {latency['p99']:>8.1f} ms  errors {result['errors']}"
+    )
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> List[str]:
+    """Describe throughput and p95 changes against a previous results file."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    lines = []
+    for result in results:
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+
+        def change(old: float, new: float) -> str:
+            return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+        rps_before, rps_after = before["throughput_rps"], result["throughput_rps"]
+        p95_before, p95_after = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        lines.append(
+            f"{result['scenario']:<11} c={result['concurrency']:<4} "
+            f"throughput {rps_before:.1f} -> {rps_after:.1f} req/s "
+            f"({change(rps_before, rps_after)}), "
+            f"p95 {p95_before:.1f} -> {p95_after:.1f} ms "
+            f"({change(p95_before, p95_after)})"
+        )
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the selected scenarios and return the results document."""
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+
+    rate_server = RateServer(latency_seconds=args.rate_latency_ms / 1000).start()
+    try:
+        configure(
+            rate_server,
+            agent_type=args.agent_type,
+            llm_latency_seconds=args.llm_latency_ms / 1000,
+            fast_path=args.fast_path,
+            answer_cache_enabled=args.answer_cache,
+            compact=args.compact,
+        )
+
+        results: List[LoadResult] = []
+        if SCENARIO_TOOL in scenarios:
+            results += asyncio.run(
+                _run_tool_scenario(concurrency_levels, args.requests)
+            )
+
+        http_scenarios = [s for s in scenarios if s != SCENARIO_TOOL]
+        if http_scenarios:
+            server = ApiServer().start()
+            try:
+                results += asyncio.run(
+                    _run_http_scenarios(
+                        server.url, http_scenarios, concurrency_levels, args.requests
+                    )
+                )
+            finally:
+                server.stop()
+    finally:
+        rate_server.stop()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "agent_type": args.agent_type,
+            "scenarios": scenarios,
+            "concurrency": concurrency_levels,
+            "requests_per_level": args.requests,
+            "llm_latency_ms": args.llm_latency_ms,
+            "rate_latency_ms": args.rate_latency_ms,
+            "fast_path": args.fast_path,
+            "answer_cache": args.answer_cache,
+            "compact": args.compact,
+        },
+        "rate_server_requests": rate_server.request_count,
+        "results": [result.as_dict() for result in results],
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline load test of /query, /query-sync and the currency tools.",
+    )
+    parser.add_argument(
+        "--agent-type",
+        choices=(AGENT_TYPE_OPENAI_TOOLS, AGENT_TYPE_TOOL_CALLING, AGENT_TYPE_REACT),
+        default=AGENT_TYPE_OPENAI_TOOLS,
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="comma-separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="comma-separated levels"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="requests per scenario and level"
+    )
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--rate-latency-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--fast-path", action="store_true", help="enable the LLM-free fast path"
+    )
+    parser.add_argument(
+        "--answer-cache",
+        action="store_true",
+        help="enable the answer cache (repeated queries then skip the agent)",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="use the compact prompt mode"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="results file (default: benchmarks/results/<time>.json)",
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="previous results file to compare against"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    document = run(args)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{stamp}-{args.agent_type}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.baseline is not None:
+        print(f"\nCompared with {args.baseline}:")
+        baseline = json.loads(args.baseline.read_text())
+        for line in compare(document["results"], baseline):
+            print(line)
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+# The OpenAI agent needs a key to be constructed; tests never call the API.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+# Tests must not append to the real rate history; history tests use tmp dirs.
+os.environ.setdefault("RATE_HISTORY_PATH", "")
+# Nor read or publish a shared snapshot file; store tests use tmp dirs too.
+os.environ.setdefault("RATE_SNAPSHOT_PATH", "")
+
+
+@pytest.fixture(autouse=True)
+def _close_rate_circuit():
+    """Provider failures in one test must not make the next one fail fast."""
+    from apps.domain.rates.client import rate_client
+
+    rate_client.breaker.reset()
+    yield
@@ -0,0 +1,160 @@
+"""Tests for admission control of agent runs."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.app import app
+from apps.api.routers import agent as agent_router
+from apps.domain.agents.admission import AdmissionController, model_rate_limit_error
+from apps.domain.exceptions import (
+    AdmissionQueueFullError,
+    AdmissionTimeoutError,
+    ModelRateLimitError,
+)
+
+
+def _controller(max_concurrent=1, max_queue=1, queue_timeout_seconds=1.0):
+    return AdmissionController(
+        "ollama",
+        max_concurrent=max_concurrent,
+        max_queue=max_queue,
+        queue_timeout_seconds=queue_timeout_seconds,
+        retry_after_seconds=7,
+    )
+
+
+def test_waiters_get_slots_in_order():
+    controller = _controller(max_concurrent=1, max_queue=2)
+    order = []
+
+    async def run(name, hold):
+        async with controller.slot():
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def main():
+        first = asyncio.ensure_future(run("first", 0.05))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(run("second", 0))
+        await asyncio.sleep(0.01)
+        third = asyncio.ensure_future(run("third", 0))
+        await asyncio.sleep(0.01)
+        assert controller.in_flight == 1
+        assert controller.queued == 2
+        await asyncio.gather(first, second, third)
+
+    asyncio.run(main())
+
+    assert order == ["first", "second", "third"]
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+
+
+def test_full_queue_is_rejected_immediately():
+    controller = _controller(max_concurrent=1, max_queue=0)
+    controller.acquire_sync()
+
+    with pytest.raises(AdmissionQueueFullError) as excinfo:
+        controller.acquire_sync()
+
+    assert excinfo.value.retry_after_seconds == 7
+    controller.release()
+    assert controller.in_flight == 0
+
+
+def test_wait_times_out_and_leaves_the_queue():
+    controller = _controller(max_concurrent=1, max_queue=1, queue_timeout_seconds=0.05)
+
+    async def main():
+        await controller.acquire()
+        with pytest.raises(AdmissionTimeoutError):
+            await controller.acquire()
+        assert controller.queued == 0
+        controller.release()
+
+    asyncio.run(main())
+    assert controller.in_flight == 0
+
+
+def test_sync_and_async_callers_share_slots():
+    controller = _controller(max_concurrent=1, max_queue=1)
+    admitted = threading.Event()
+
+    async def main():
+        await controller.acquire()
+        thread = threading.Thread(
+            target=lambda: (controller.acquire_sync(), admitted.set())
+        )
+        thread.start()
+        await asyncio.sleep(0.05)
+        assert not admitted.is_set()
+        controller.release()
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+    asyncio.run(main())
+
+    assert admitted.is_set()
+    assert controller.in_flight == 1
+    controller.release()
+
+
+def test_provider_429_becomes_a_rate_limit_error():
+    class _Response:
+        headers = {"retry-after": "20"}
+
+    class _RateLimited(Exception):
+        status_code = 429
+        response = _Response()
+
+    error = model_rate_limit_error(_RateLimited("slow down"))
+
+    assert isinstance(error, ModelRateLimitError)
+    assert error.retry_after_seconds == 20
+    assert model_rate_limit_error(ValueError("boom")) is None
+
+
+@pytest.mark.parametrize(
+    "error, status_code",
+    [
+        (AdmissionQueueFullError("busy", 7), 429),
+        (ModelRateLimitError("rate limited", 20), 429),
+        (AdmissionTimeoutError("timed out", 7), 503),
+    ],
+)
+def test_overload_maps_to_status_and_retry_after(monkeypatch, error, status_code):
+    async def fake_process_query(query, session_id=None):
+        raise error
+
+    monkeypatch.setattr(
+        agent_router.get_currency_agent(), "process_query", fake_process_query
+    )
+
+    response = TestClient(app).post(
+        "/query", json={"message": "Explain exchange rates"}
+    )
+
+    assert response.status_code == status_code
+    assert response.headers["Retry-After"] == str(error.retry_after_seconds)
+    assert response.json()["detail"] == str(error)
+
+
+def test_query_sync_runs_on_its_own_thread_pool(monkeypatch):
+    threads = []
+
+    def fake_process_query_sync(query, session_id=None):
+        threads.append(threading.current_thread().name)
+        return {"success": True, "response": "ok", "error": None, "served_by": "agent"}
+
+    monkeypatch.setattr(
+        agent_router.get_currency_agent(), "process_query_sync", fake_process_query_sync
+    )
+
+    response = TestClient(app).post(
+        "/query-sync", json={"message": "Explain exchange rates"}
+    )
+
+    assert response.status_code == 200
+    assert threads[0].startswith("query-sync")
@@ -0,0 +1,50 @@
+"""Tests for the agent answer cache."""
+
+import pytest
+
+from apps.domain.agents.answer_cache import (
+    AnswerCache,
+    InMemoryAnswerCacheBackend,
+    load_backend,
+    normalize_query,
+)
+
+
+def test_normalize_query_ignores_case_spacing_and_trailing_punctuation():
+    assert normalize_query("  What's the USD   to EUR rate?! ") == normalize_query(
+        "what’s the usd to eur rate"
+    )
+
+
+def test_key_changes_with_rate_version_and_model():
+    key = AnswerCache.make_key("USD to EUR?", "openai", "gpt-4", "USD@Mon")
+
+    assert key == AnswerCache.make_key("usd to eur", "OpenAI", "gpt-4", "USD@Mon")
+    assert key != AnswerCache.make_key("usd to eur", "openai", "gpt-4", "USD@Tue")
+    assert key != AnswerCache.make_key("usd to eur", "ollama", "gpt-4", "USD@Mon")
+
+
+def test_cache_counts_hits_and_misses_and_evicts_lru():
+    cache = AnswerCache(InMemoryAnswerCacheBackend(max_size=2))
+
+    assert cache.get("a") is None
+    cache.set("a", {"response": "A"})
+    cache.set("b", {"response": "B"})
+    assert cache.get("a") == {"response": "A"}
+    cache.set("c", {"response": "C"})
+
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+
+def test_load_backend_from_dotted_path():
+    backend = load_backend(
+        "apps.domain.agents.answer_cache:InMemoryAnswerCacheBackend", max_size=1
+    )
+
+    assert isinstance(backend, InMemoryAnswerCacheBackend)
+
+
+def test_load_backend_rejects_classes_that_are_not_backends():
+    with pytest.raises(TypeError):
+        load_backend("apps.domain.agents.answer_cache:AnswerCache", max_size=1)
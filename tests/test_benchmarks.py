@@ -0,0 +1,90 @@
+"""Tests for the offline benchmark stand-ins and load driver."""
+
+import asyncio
+
+import pytest
+import requests
+
+from apps.api.config import settings
+from apps.domain.agents.currency_exchange import (
+    AGENT_TYPE_OPENAI_TOOLS,
+    AGENT_TYPE_REACT,
+    AGENT_TYPE_TOOL_CALLING,
+)
+from apps.domain.rates.client import rate_client
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.load import percentile, run_load
+from benchmarks.rate_server import RateServer
+from benchmarks.run import BenchmarkAgent
+
+
+@pytest.fixture
+def rate_server(monkeypatch):
+    server = RateServer().start()
+    monkeypatch.setattr(settings, "exchangerate_base_url", server.base_url)
+    monkeypatch.setattr(settings, "fast_path_enabled", False)
+    monkeypatch.setattr(settings, "answer_cache_enabled", False)
+    monkeypatch.setattr(settings, "agent_verbose", False)
+    monkeypatch.setattr(rate_client, "store", None)
+    rate_client.cache.clear()
+    yield server
+    rate_client.cache.clear()
+    server.stop()
+
+
+def test_rate_server_rebases_rates(rate_server):
+    data = requests.get(f"{rate_server.base_url}/any-key/latest/EUR").json()
+
+    assert data["result"] == "success"
+    assert data["base_code"] == "EUR"
+    assert data["conversion_rates"]["EUR"] == 1.0
+    assert data["conversion_rates"]["USD"] == pytest.approx(1 / 0.8599, rel=1e-5)
+    assert requests.get(f"{rate_server.base_url}/k/latest/XXX").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "provider, tool_calling, agent_type",
+    [
+        ("openai", "off", AGENT_TYPE_OPENAI_TOOLS),
+        ("ollama", "on", AGENT_TYPE_TOOL_CALLING),
+        ("ollama", "off", AGENT_TYPE_REACT),
+    ],
+)
+def test_fake_model_drives_every_agent_flavour(
+    rate_server, monkeypatch, provider, tool_calling, agent_type
+):
+    monkeypatch.setattr(settings, "model_provider", provider)
+    monkeypatch.setattr(settings, "ollama_tool_calling", tool_calling)
+    agent = BenchmarkAgent(BenchmarkChatModel())
+
+    result = agent.process_query_sync("How does GBP compare with JPY today?")
+
+    assert agent.agent_type == agent_type
+    assert result["success"] is True
+    assert result["served_by"] == "agent"
+    assert "1 GBP = " in result["response"]
+    assert result["answer"]["from_currency"] == "GBP"
+    assert result["answer"]["to_currency"] == "JPY"
+    assert rate_server.request_count == 1
+
+
+def test_run_load_counts_errors_and_requests():
+    async def call(index):
+        await asyncio.sleep(0)
+        return index % 4 != 0
+
+    result = asyncio.run(run_load("demo", call, concurrency=3, total_requests=10))
+    summary = result.as_dict()
+
+    assert summary["requests"] == 10
+    assert summary["errors"] == 3
+    assert summary["concurrency"] == 3
+    assert set(summary["latency_ms"]) == {"mean", "p50", "p95", "p99", "max"}
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
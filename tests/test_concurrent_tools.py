@@ -0,0 +1,109 @@
+"""Tests for concurrent, bounded and timed tool calls in the agent executor."""
+
+import asyncio
+import time
+
+from langchain.agents import create_openai_tools_agent
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.tools import tool
+
+from apps.domain.agents.executor import ConcurrentToolExecutor
+
+PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("human", "{input}"),
+        MessagesPlaceholder(variable_name="agent_scratchpad"),
+    ]
+)
+
+
+class _ToolsFakeChatModel(FakeMessagesListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _executor(tools, calls, **kwargs):
+    llm = _ToolsFakeChatModel(
+        responses=[
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": name, "args": {"currency": code}, "id": f"call_{i}"}
+                    for i, (name, code) in enumerate(calls)
+                ],
+            ),
+            AIMessage(content="done"),
+        ]
+    )
+    agent = create_openai_tools_agent(llm, tools, PROMPT)
+    return ConcurrentToolExecutor(
+        agent=agent, tools=tools, return_intermediate_steps=True, **kwargs
+    )
+
+
+def _tracking_tools(delays):
+    state = {"in_flight": 0, "peak": 0}
+
+    @tool
+    async def lookup(currency: str) -> str:
+        """Look up a currency."""
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(delays[currency])
+        state["in_flight"] -= 1
+        return f"{currency} ok"
+
+    return [lookup], state
+
+
+def test_tool_calls_of_one_turn_run_concurrently():
+    tools, state = _tracking_tools({"USD": 0.2, "EUR": 0.2, "GBP": 0.2})
+    executor = _executor(
+        tools, [("lookup", "USD"), ("lookup", "EUR"), ("lookup", "GBP")]
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(executor.ainvoke({"input": "rates"}))
+    elapsed = time.perf_counter() - started
+
+    assert result["output"] == "done"
+    assert [step[1] for step in result["intermediate_steps"]] == [
+        "USD ok",
+        "EUR ok",
+        "GBP ok",
+    ]
+    assert state["peak"] == 3
+    assert elapsed < 0.5
+
+
+def test_parallel_tool_calls_are_capped():
+    tools, state = _tracking_tools({"USD": 0.05, "EUR": 0.05, "GBP": 0.05})
+    executor = _executor(
+        tools,
+        [("lookup", "USD"), ("lookup", "EUR"), ("lookup", "GBP")],
+        max_parallel_tool_calls=2,
+    )
+
+    result = asyncio.run(executor.ainvoke({"input": "rates"}))
+
+    assert result["output"] == "done"
+    assert state["peak"] == 2
+
+
+def test_slow_tool_call_becomes_an_error_observation():
+    tools, _ = _tracking_tools({"USD": 0.01, "EUR": 5.0})
+    executor = _executor(
+        tools, [("lookup", "USD"), ("lookup", "EUR")], tool_timeout_seconds=0.1
+    )
+
+    started = time.perf_counter()
+    result = asyncio.run(executor.ainvoke({"input": "rates"}))
+
+    assert time.perf_counter() - started < 1.0
+    assert result["output"] == "done"
+    assert [step[1] for step in result["intermediate_steps"]] == [
+        "USD ok",
+        "Error: lookup timed out after 0.1 seconds",
+    ]
@@ -0,0 +1,65 @@
+"""Tests for the multi-target currency conversion tool."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_tool import CurrencyConversionTool
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+@pytest.fixture
+def matrix(monkeypatch):
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+    monkeypatch.setattr(rate_client, "get_matrix", lambda: matrix)
+    return matrix
+
+
+@pytest.mark.parametrize(
+    "conversion, expected",
+    [
+        (
+            "250 EUR to USD, GBP, JPY and CHF",
+            (250.0, "EUR", ["USD", "GBP", "JPY", "CHF"]),
+        ),
+        ("'1,000.50 usd in all'", (1000.5, "USD", None)),
+        ("GBP into EUR/EUR", (1.0, "GBP", ["EUR"])),
+        ("250 euros to yen and pounds", (250.0, "EUR", ["JPY", "GBP"])),
+        ("10 US dollars into USD GBP", (10.0, "USD", ["USD", "GBP"])),
+        ("250 euros please", None),
+    ],
+)
+def test_parse_conversion(conversion, expected):
+    assert CurrencyConversionTool._parse_conversion(conversion) == expected
+
+
+def test_converts_to_every_target_in_one_call(matrix):
+    result = CurrencyConversionTool()._run("100 USD to EUR, JPY, XXX")
+
+    assert "Conversions of 100.00 USD" in result
+    assert "EUR: 85.99" in result
+    assert f"JPY: {100 * matrix.rate('USD', 'JPY'):,.2f}" in result
+    assert result.endswith("Unknown currencies: XXX")
+
+
+def test_all_targets_skip_the_source_currency(matrix):
+    result = CurrencyConversionTool(compact=True)._run("10 USD to all")
+
+    conversions = result.split(" = ", 1)[1].split(" (updated")[0].split(", ")
+    assert len(conversions) == len(matrix) - 1
+    assert not any(c.endswith(" USD") for c in conversions)
+
+
+def test_unknown_source_and_malformed_input_return_errors(matrix):
+    tool = CurrencyConversionTool()
+
+    assert tool._run("10 XXX to EUR").startswith("Error: Unknown currency 'XXX'")
+    assert "'pesos' is used by several currencies" in tool._run("10 USD to pesos")
+    assert tool._run("ten dollars").startswith("Error: Please provide input")
@@ -0,0 +1,108 @@
+"""Tests for the local currency index and how the rate tools use it."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from apps.domain.exceptions import UnknownCurrencyError
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_index import currency_index
+from apps.domain.tools.currency_tool import CurrencyRateTool, SpecificCurrencyRateTool
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("jpy", "JPY"),
+        ("'EUR'", "EUR"),
+        ("yen?", "JPY"),
+        ("Japanese Yen", "JPY"),
+        ("japanse yen", "JPY"),
+        ("US$", "USD"),
+        ("euros", "EUR"),
+        ("Swiss francs", "CHF"),
+        ("pounds sterling", "GBP"),
+        ("mexican pesos", "MXN"),
+        ("Złoty", "PLN"),
+        ("baht", "THB"),
+        ("€", "EUR"),
+        ("peso", None),
+        ("YEM", None),
+        ("bitcoin", None),
+    ],
+)
+def test_resolves_codes_names_aliases_and_symbols(text, expected):
+    assert currency_index.resolve(text) == expected
+
+
+def test_every_published_code_is_indexed():
+    assert all(code in currency_index for code in EXAMPLE_RESPONSE["conversion_rates"])
+
+
+def test_rejections_list_the_closest_candidates():
+    with pytest.raises(
+        UnknownCurrencyError, match=r"Did you mean YER \(Yemeni Rial\)\?"
+    ) as typo:
+        currency_index.code_for("YEM")
+    with pytest.raises(UnknownCurrencyError, match="several currencies") as shared:
+        currency_index.code_for("krona")
+
+    assert typo.value.suggestions == ["YER"]
+    assert shared.value.suggestions == ["FOK", "ISK", "SEK"]
+
+
+@pytest.mark.parametrize(
+    "currency_pair, expected",
+    [
+        ("USD to EUR", ("USD", "EUR")),
+        ("'gbp jpy'", ("GBP", "JPY")),
+        ("Japanese yen to US dollars", ("JPY", "USD")),
+        ("€/£", ("EUR", "GBP")),
+        ("usdeur", ("USD", "EUR")),
+        ("USD to EUR to GBP", None),
+        ("USD", None),
+    ],
+)
+def test_pair_parser_resolves_both_sides(currency_pair, expected):
+    assert SpecificCurrencyRateTool._parse_pair(currency_pair) == expected
+
+
+def test_tools_reject_unknown_currencies_without_fetching_rates(monkeypatch):
+    def fail():
+        raise AssertionError("rates were fetched for an unknown currency")
+
+    monkeypatch.setattr(rate_client, "get_matrix", fail)
+    monkeypatch.setattr(rate_client, "aget_matrix", fail)
+
+    assert (
+        SpecificCurrencyRateTool()
+        ._run("yen to peso")
+        .startswith("Error: 'peso' is used by several currencies")
+    )
+    assert asyncio.run(CurrencyRateTool()._arun("EUD")).startswith(
+        "Error: Unknown currency"
+    )
+
+
+def test_tools_accept_currency_names(monkeypatch):
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+    monkeypatch.setattr(rate_client, "get_matrix", lambda: matrix)
+
+    assert (
+        SpecificCurrencyRateTool()
+        ._run("euro to yen")
+        .startswith("Exchange Rate: 1 EUR = ")
+    )
+    assert (
+        CurrencyRateTool()
+        ._run("pound sterling")
+        .startswith("Currency exchange rates (Base: GBP)")
+    )
@@ -0,0 +1,198 @@
+"""Tests for structured answers and skipping the summarizing model turn."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage, ToolMessage
+from pydantic import Field
+
+from apps.api.app import app
+from apps.api.config import settings
+from apps.api.routers import agent as agent_router
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_tool import (
+    CurrencyConversionTool,
+    SpecificCurrencyRateTool,
+)
+from apps.domain.tools.rate_answers import RateAnswer, collecting_rate_answers
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.run import BenchmarkAgent
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+class _CountingChatModel(BenchmarkChatModel):
+    turns: List[int] = Field(default_factory=list)
+
+    def _respond(self, messages, tools_bound):
+        self.turns.append(len(messages))
+        return super()._respond(messages, tools_bound)
+
+
+class _OnePairPerTurnModel(_CountingChatModel):
+    """Looks up one pair per turn, as small tool-calling models tend to."""
+
+    pairs: List[str] = Field(default_factory=lambda: ["USD to EUR", "USD to GBP"])
+
+    def _respond(self, messages, tools_bound):
+        self.turns.append(len(messages))
+        results = [m.content for m in messages if isinstance(m, ToolMessage)]
+        if len(results) == len(self.pairs):
+            return AIMessage(content=" ".join(results))
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {
+                    "name": "get_specific_currency_rate",
+                    "args": {"currency_pair": self.pairs[len(results)]},
+                    "id": f"call_{len(results)}",
+                }
+            ],
+        )
+
+
+@pytest.fixture
+def matrix(monkeypatch):
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+    monkeypatch.setattr(rate_client, "get_matrix", lambda: matrix)
+
+    async def aget_matrix():
+        return matrix
+
+    monkeypatch.setattr(rate_client, "aget_matrix", aget_matrix)
+    monkeypatch.setattr(settings, "model_provider", "openai")
+    monkeypatch.setattr(settings, "fast_path_enabled", False)
+    monkeypatch.setattr(settings, "answer_cache_enabled", False)
+    monkeypatch.setattr(settings, "agent_verbose", False)
+    return matrix
+
+
+def test_pair_lookup_is_answered_without_a_second_model_turn(matrix):
+    agent = BenchmarkAgent(_CountingChatModel())
+
+    result = asyncio.run(agent.process_query("How does GBP compare with JPY today?"))
+
+    assert result["success"]
+    assert len(agent.llm.turns) == 1
+    assert result["answer"]["rate"] == pytest.approx(matrix.rate("GBP", "JPY"))
+    assert result["answer"]["stale"] is False
+    assert result["response"].startswith("The current GBP to JPY exchange rate is")
+
+
+def test_a_lookup_answering_part_of_the_query_does_not_end_the_run(matrix):
+    agent = BenchmarkAgent(_OnePairPerTurnModel())
+
+    result = agent.process_query_sync("What are USD to EUR and USD to GBP rates?")
+
+    assert len(agent.llm.turns) == 3
+    assert "1 USD = 0.8599 EUR" in result["response"]
+    assert "1 USD = 0.7453 GBP" in result["response"]
+
+
+def test_react_runs_always_get_a_summarizing_turn(matrix, monkeypatch):
+    monkeypatch.setattr(settings, "model_provider", "ollama")
+    monkeypatch.setattr(settings, "ollama_tool_calling", "off")
+    agent = BenchmarkAgent(_CountingChatModel())
+
+    result = agent.process_query_sync("How does GBP compare with JPY today?")
+
+    assert len(agent.llm.turns) == 2
+    assert result["response"].startswith("Here is what I found.")
+
+
+def test_only_answers_covering_the_query_end_the_run(matrix):
+    with collecting_rate_answers("100 bucks in yen") as answers:
+        rate_only = SpecificCurrencyRateTool()._run("USD to JPY")
+        converted = CurrencyConversionTool()._run("100 USD to JPY")
+        answers.tool_calls = 1
+
+        assert answers.answer_for(rate_only) is None
+        assert answers.answer_for(converted).converted_amount == pytest.approx(
+            100 * matrix.rate("USD", "JPY")
+        )
+
+
+def test_single_target_conversions_register_their_answer(matrix):
+    with collecting_rate_answers() as answers:
+        single = CurrencyConversionTool()._run("250 EUR to USD")
+        CurrencyConversionTool()._run("250 EUR to USD, GBP")
+
+    assert list(answers.answers) == [single]
+    answer = answers.answers[single]
+    assert answer.amount == 250.0
+    assert answer.converted_amount == pytest.approx(250 * matrix.rate("EUR", "USD"))
+
+
+def test_other_tools_still_get_a_summarizing_turn(matrix):
+    agent = BenchmarkAgent(_CountingChatModel())
+
+    result = agent.process_query_sync("Show me the GBP rates")
+
+    assert len(agent.llm.turns) == 2
+    assert result["answer"] is None
+
+
+def test_direct_answers_can_be_turned_off(matrix, monkeypatch):
+    monkeypatch.setattr(settings, "agent_direct_answers", False)
+    agent = BenchmarkAgent(_CountingChatModel())
+
+    result = agent.process_query_sync("How does GBP compare with JPY today?")
+
+    assert len(agent.llm.turns) == 2
+    assert result["response"].startswith("Here is what I found.")
+    assert (
+        result["answer"]["to_currency"] == "JPY"
+    )  # still reported, just not used to stop
+
+
+def test_fast_path_answers_are_structured(matrix, monkeypatch):
+    monkeypatch.setattr(settings, "fast_path_enabled", True)
+    agent = BenchmarkAgent(_CountingChatModel())
+
+    result = agent.process_query_sync("Convert 100 USD to EUR")
+
+    assert result["served_by"] == "fast_path"
+    assert result["answer"]["amount"] == 100.0
+    assert result["answer"]["converted_amount"] == pytest.approx(
+        100 * matrix.rate("USD", "EUR")
+    )
+    assert agent.llm.turns == []
+
+
+def test_query_response_includes_the_answer(monkeypatch):
+    answer = RateAnswer(
+        "USD", "EUR", 2.0, 0.86, 1.72, "Mon, 21 Jul 2025 00:00:01 +0000"
+    )
+
+    async def fake_process_query(query, session_id=None):
+        return {
+            "success": True,
+            "response": answer.describe(),
+            "error": None,
+            "served_by": "agent",
+            "answer": answer.as_dict(),
+        }
+
+    monkeypatch.setattr(
+        agent_router.get_currency_agent(), "process_query", fake_process_query
+    )
+
+    body = TestClient(app).post("/query", json={"message": "2 USD in EUR?"}).json()
+
+    assert body["answer"] == {
+        "from_currency": "USD",
+        "to_currency": "EUR",
+        "amount": 2.0,
+        "rate": 0.86,
+        "converted_amount": 1.72,
+        "last_updated": "Mon, 21 Jul 2025 00:00:01 +0000",
+        "stale": False,
+    }
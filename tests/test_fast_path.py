@@ -0,0 +1,61 @@
+"""Tests for the LLM-free conversion fast path."""
+
+import pytest
+
+from apps.domain.agents.fast_path import (
+    ConversionIntent,
+    conversion_answer,
+    parse_conversion_query,
+)
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.matrix import RateMatrix
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("USD to EUR", ConversionIntent("USD", "EUR")),
+        (
+            "What's the current USD to EUR exchange rate?",
+            ConversionIntent("USD", "EUR"),
+        ),
+        ("how much is 100 GBP in JPY", ConversionIntent("GBP", "JPY", 100.0)),
+        ("How much is 100 USD in Japanese Yen?", ConversionIntent("USD", "JPY", 100.0)),
+        ("How much is 50 pounds in dollars?", ConversionIntent("GBP", "USD", 50.0)),
+        ("Convert 1,250.50 usd to eur", ConversionIntent("USD", "EUR", 1250.5)),
+        ("$20 in euros", ConversionIntent("USD", "EUR", 20.0)),
+        ("10 quid in yuan", ConversionIntent("GBP", "CNY", 10.0)),
+    ],
+)
+def test_parse_simple_conversions(query, expected):
+    assert parse_conversion_query(query) == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Show me exchange rates for British Pound",
+        "What are today's exchange rates?",
+        "What's the trend of USD to EUR?",
+        "Should I buy euros now or wait?",
+        "100 pesos to dollars",
+    ],
+)
+def test_ambiguous_queries_fall_back_to_agent(query):
+    assert parse_conversion_query(query) is None
+
+
+def test_conversion_answer_uses_matrix_and_rejects_unknown_codes():
+    matrix = RateMatrix(
+        RateSnapshot(
+            base_code="USD",
+            rates={"USD": 1.0, "EUR": 0.8599},
+            time_last_update_utc="Mon, 21 Jul 2025 00:00:01 +0000",
+        )
+    )
+
+    answer = conversion_answer(ConversionIntent("USD", "EUR", 100.0), matrix).describe()
+
+    assert "100.00 USD = 85.99 EUR" in answer
+    assert "Mon, 21 Jul 2025" in answer
+    assert conversion_answer(ConversionIntent("USD", "XYZ"), matrix) is None
@@ -0,0 +1,111 @@
+"""Tests for Prometheus metrics collection and the /metrics endpoint."""
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from prometheus_client import REGISTRY
+
+from apps.api.app import app
+from apps.domain.metrics import MetricsCallbackHandler
+from apps.domain.rates.cache import RateCache
+from apps.domain.rates.client import RateClient
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+def _sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_callback_handler_records_llm_tool_and_iteration_metrics():
+    handler = MetricsCallbackHandler(agent_type="react")
+    root, llm, tool = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    prompt_tokens = _sample("llm_tokens_total", type="prompt")
+    llm_calls = _sample("llm_call_duration_seconds_count", status="ok")
+    tool_calls = _sample(
+        "tool_call_duration_seconds_count", tool="get_currency_rates", status="ok"
+    )
+    runs = _sample("agent_iterations_count", agent_type="react")
+
+    handler.on_chat_model_start({}, [[]], run_id=llm, parent_run_id=root)
+    message = AIMessage(
+        content="",
+        usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15},
+    )
+    handler.on_llm_end(
+        LLMResult(generations=[[ChatGeneration(message=message)]]),
+        run_id=llm,
+        parent_run_id=root,
+    )
+    handler.on_tool_start(
+        {"name": "get_currency_rates"}, "USD", run_id=tool, parent_run_id=root
+    )
+    handler.on_tool_end("rates", run_id=tool, parent_run_id=root)
+    handler.on_chain_end({}, run_id=root)
+
+    assert _sample("llm_tokens_total", type="prompt") == prompt_tokens + 12
+    assert _sample("llm_call_duration_seconds_count", status="ok") == llm_calls + 1
+    assert (
+        _sample(
+            "tool_call_duration_seconds_count", tool="get_currency_rates", status="ok"
+        )
+        == tool_calls + 1
+    )
+    assert _sample("agent_iterations_count", agent_type="react") == runs + 1
+    assert handler.llm_calls == 1
+
+
+def test_rate_client_records_fetch_latency_and_cache_hits():
+    client = RateClient(RateCache())
+    client.provider._async_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=EXAMPLE_RESPONSE)
+        )
+    )
+    fetches = _sample("rate_fetch_duration_seconds_count", status="ok")
+    hits = _sample("rate_cache_lookups_total", result="hit")
+    misses = _sample("rate_cache_lookups_total", result="miss")
+
+    async def run():
+        await client.aget_snapshot("USD")
+        await client.aget_snapshot("USD")
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert _sample("rate_fetch_duration_seconds_count", status="ok") == fetches + 1
+    assert _sample("rate_cache_lookups_total", result="miss") == misses + 1
+    assert _sample("rate_cache_lookups_total", result="hit") == hits + 1
+
+
+def test_http_requests_are_timed_per_route():
+    client = TestClient(app)
+    before = _sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="/healthcheck",
+        status="200",
+    )
+
+    client.get("/healthcheck")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert (
+        _sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="/healthcheck",
+            status="200",
+        )
+        == before + 1
+    )
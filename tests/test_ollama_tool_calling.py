@@ -0,0 +1,79 @@
+"""Tests for choosing native tool calling or ReAct for Ollama models."""
+
+import pytest
+import requests
+
+from apps.api.config import settings
+from apps.domain.agents import currency_exchange
+from apps.domain.agents.currency_exchange import (
+    AGENT_TYPE_REACT,
+    AGENT_TYPE_TOOL_CALLING,
+)
+from apps.domain.agents.ollama_capabilities import ollama_supports_tools
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.run import BenchmarkAgent
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ({"capabilities": ["completion", "tools"]}, True),
+        ({"capabilities": ["completion"]}, False),
+        ({"template": "{{- if .Tools }}...{{ end }}"}, True),
+        ({"template": "{{ .Prompt }}"}, False),
+    ],
+)
+def test_capabilities_are_read_from_the_show_endpoint(monkeypatch, payload, expected):
+    calls = []
+
+    def fake_post(url, json, timeout):
+        calls.append((url, json))
+        return _FakeResponse(payload)
+
+    monkeypatch.setattr(requests, "post", fake_post)
+
+    assert ollama_supports_tools("http://ollama:11434/", "llama3.2") is expected
+    assert calls == [("http://ollama:11434/api/show", {"model": "llama3.2"})]
+
+
+def test_unreachable_server_counts_as_unsupported(monkeypatch):
+    def fake_post(url, json, timeout):
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(requests, "post", fake_post)
+
+    assert ollama_supports_tools("http://ollama:11434", "llama3.2") is False
+
+
+@pytest.mark.parametrize(
+    "mode, supported, agent_type",
+    [
+        ("auto", True, AGENT_TYPE_TOOL_CALLING),
+        ("auto", False, AGENT_TYPE_REACT),
+        ("on", False, AGENT_TYPE_TOOL_CALLING),
+        ("off", True, AGENT_TYPE_REACT),
+    ],
+)
+def test_ollama_agent_flavour_follows_setting_and_capabilities(
+    monkeypatch, mode, supported, agent_type
+):
+    monkeypatch.setattr(settings, "model_provider", "ollama")
+    monkeypatch.setattr(settings, "ollama_tool_calling", mode)
+    monkeypatch.setattr(
+        currency_exchange, "ollama_supports_tools", lambda base_url, model: supported
+    )
+
+    agent = BenchmarkAgent(BenchmarkChatModel())
+
+    assert agent.agent_type == agent_type
@@ -0,0 +1,156 @@
+"""Tests for opt-in per-request profiling."""
+
+import asyncio
+import os
+import pstats
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.api.app import app
+from apps.api.profiling import RequestProfiler, request_profiler
+from apps.api.routers import agent as agent_router
+from apps.api.routers import profiles
+
+
+def _expensive_step():
+    return sum(range(1000))
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_profiler, "enabled", True)
+    monkeypatch.setattr(request_profiler, "directory", str(tmp_path))
+    monkeypatch.setattr(request_profiler, "sample_rate", 0.0)
+    return request_profiler
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    currency_agent = agent_router.get_currency_agent()
+
+    def answer():
+        _expensive_step()
+        return {"success": True, "response": "ok", "error": None, "served_by": "agent"}
+
+    async def fake_process_query(query, session_id=None):
+        await asyncio.sleep(0)
+        return answer()
+
+    monkeypatch.setattr(currency_agent, "process_query", fake_process_query)
+    monkeypatch.setattr(
+        currency_agent, "process_query_sync", lambda query, session_id=None: answer()
+    )
+
+
+@pytest.mark.parametrize("path", ["/query", "/query-sync"])
+def test_requested_profile_is_saved_and_named_in_headers(profiler, fake_agent, path):
+    response = TestClient(app).post(
+        path, json={"message": "Explain exchange rates"}, headers={"X-Profile": "1"}
+    )
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert response.headers["X-Profile-Url"] == f"/profiles/{profile_id}"
+
+    stats = pstats.Stats(profiler.path_for(profile_id))
+    assert any(name == "_expensive_step" for _, _, name in stats.stats)
+
+
+def test_requests_are_not_profiled_unless_asked_or_enabled(
+    profiler, fake_agent, monkeypatch
+):
+    client = TestClient(app)
+
+    assert (
+        "X-Profile-Id"
+        not in client.post("/query", json={"message": "hi there"}).headers
+    )
+
+    monkeypatch.setattr(profiler, "enabled", False)
+    response = client.post(
+        "/query", json={"message": "hi there"}, headers={"X-Profile": "1"}
+    )
+    assert "X-Profile-Id" not in response.headers
+    assert os.listdir(profiler.directory) == []
+
+
+@pytest.mark.parametrize("path", ["/query", "/query-sync"])
+def test_failed_agent_build_does_not_hold_a_profile_slot(profiler, monkeypatch, path):
+    def broken_agent():
+        raise RuntimeError("no model")
+
+    monkeypatch.setattr(agent_router, "get_currency_agent", broken_agent)
+    response = TestClient(app).post(
+        path, json={"message": "Explain exchange rates"}, headers={"X-Profile": "1"}
+    )
+
+    assert response.status_code == 500
+    assert profiler._active == 0
+    assert not profiler._event_loop_busy
+
+
+def test_concurrent_profiles_are_capped(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), enabled=True, max_concurrent=1)
+
+    run = profiler.start(requested=True)
+    assert run is not None
+    assert profiler.start(requested=True) is None
+
+    run.save()
+    assert profiler.start(requested=True) is not None
+
+
+def test_event_loop_profiles_never_overlap(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), enabled=True, max_concurrent=1)
+    profiler.max_concurrent = 2  # as on Python < 3.12, where threads profile apart
+
+    run = profiler.start(requested=True, on_event_loop=True)
+    assert profiler.start(requested=True, on_event_loop=True) is None
+
+    thread_run = profiler.start(requested=True)
+    assert thread_run is not None
+    thread_run.save()
+    run.save()
+    assert profiler.start(requested=True, on_event_loop=True) is not None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="cProfile is per thread")
+def test_one_profile_at_a_time_where_cprofile_is_process_wide(tmp_path):
+    assert RequestProfiler(str(tmp_path), max_concurrent=4).max_concurrent == 1
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    profiler = RequestProfiler(
+        str(tmp_path), enabled=True, max_concurrent=5, max_files=2
+    )
+    ids = []
+    for _ in range(3):
+        run = profiler.start(requested=True)
+        with run:
+            _expensive_step()
+        run.save()
+        ids.append(run.profile_id)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f"{profile_id}.prof" for profile_id in ids[1:]
+    )
+
+
+def test_profiles_are_downloadable_by_id_only(profiler, fake_agent):
+    client = TestClient(app)
+    profile_id = client.post(
+        "/query-sync",
+        json={"message": "Explain exchange rates"},
+        headers={"X-Profile": "true"},
+    ).headers["X-Profile-Id"]
+
+    downloads = FastAPI()
+    downloads.include_router(profiles.router)
+    download = TestClient(downloads)
+
+    assert download.get(f"/profiles/{profile_id}").content[:1]
+    assert download.get("/profiles/..%2F..%2Fetc%2Fpasswd").status_code == 404
+    assert download.get("/profiles/20250101T000000-000000000000").status_code == 404
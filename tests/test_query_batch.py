@@ -0,0 +1,66 @@
+"""Tests for the batch query endpoint."""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from apps.api.app import app
+from apps.api.config import settings
+from apps.api.routers import agent as agent_router
+from apps.domain.rates.client import rate_client
+
+
+def test_batch_runs_with_bounded_concurrency_and_keeps_order(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_process_query(query, session_id=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "fail":
+            return {
+                "success": False,
+                "response": "",
+                "error": "boom",
+                "served_by": "agent",
+            }
+        return {
+            "success": True,
+            "response": query.upper(),
+            "error": None,
+            "served_by": "agent",
+        }
+
+    async def fake_matrix():
+        return None
+
+    monkeypatch.setattr(
+        agent_router.get_currency_agent(), "process_query", fake_process_query
+    )
+    monkeypatch.setattr(rate_client, "aget_matrix", fake_matrix)
+    monkeypatch.setattr(settings, "batch_max_concurrency", 2)
+
+    messages = ["a", "fail", "c", " ", "e"]
+    response = TestClient(app).post(
+        "/query/batch", json={"queries": [{"message": m} for m in messages]}
+    )
+
+    results = response.json()["results"]
+    assert response.status_code == 200
+    assert [r["response"] for r in results] == ["A", "", "C", "", "E"]
+    assert [r["success"] for r in results] == [True, False, True, False, True]
+    assert results[3]["error"] == "Message cannot be empty"
+    assert peak == 2
+
+
+def test_batch_rejects_oversized_requests(monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_size", 1)
+
+    response = TestClient(app).post(
+        "/query/batch", json={"queries": [{"message": "a"}, {"message": "b"}]}
+    )
+
+    assert response.status_code == 400
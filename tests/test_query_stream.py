@@ -0,0 +1,142 @@
+"""Tests for the server-sent-events query endpoint."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.app import app
+from apps.api.routers import agent as agent_router
+from apps.domain.agents.admission import AdmissionController
+from apps.domain.agents.answer_cache import answer_cache
+from apps.domain.agents.currency_exchange import CurrencyExchangeAgent
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """Admission with its only slot taken and no queue, and rates served locally."""
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+
+    async def aget_matrix():
+        return matrix
+
+    monkeypatch.setattr(rate_client, "aget_matrix", aget_matrix)
+    admission = AdmissionController(
+        "openai",
+        max_concurrent=1,
+        max_queue=0,
+        queue_timeout_seconds=1.0,
+        retry_after_seconds=7,
+    )
+    admission.acquire_sync()
+    monkeypatch.setattr(agent_router.get_currency_agent(), "admission", admission)
+    answer_cache.backend.clear()
+    yield admission
+    answer_cache.backend.clear()
+
+
+def test_stream_endpoint_emits_sse_frames(monkeypatch):
+    async def fake_events():
+        yield {"event": "tool_start", "data": {"tool": "get_specific_currency_rate"}}
+        yield {"event": "token", "data": {"content": "0.86"}}
+        yield {"event": "final", "data": {"success": True, "response": "0.86"}}
+
+    async def fake_open_stream(query, session_id=None):
+        return fake_events()
+
+    monkeypatch.setattr(
+        agent_router.get_currency_agent(), "open_stream", fake_open_stream
+    )
+
+    response = TestClient(app).post("/query/stream", json={"message": "USD to EUR?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:3] == [
+        'event: tool_start\ndata: {"tool": "get_specific_currency_rate"}',
+        'event: token\ndata: {"content": "0.86"}',
+        'event: final\ndata: {"success": true, "response": "0.86"}',
+    ]
+
+
+def test_stream_endpoint_rejects_empty_message():
+    response = TestClient(app).post("/query/stream", json={"message": "  "})
+
+    assert response.status_code == 400
+
+
+def test_stream_is_refused_before_it_starts_when_overloaded(saturated):
+    response = TestClient(app).post(
+        "/query/stream", json={"message": "Explain exchange rates"}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+
+
+def test_fast_path_and_cached_streams_are_not_admission_limited(saturated):
+    client = TestClient(app)
+    answer_cache.set(
+        CurrencyExchangeAgent._answer_cache_key(
+            "Explain exchange rates",
+            RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE)).version,
+        ),
+        {"success": True, "response": "cached", "error": None, "served_by": "agent"},
+    )
+
+    fast = client.post("/query/stream", json={"message": "100 USD to EUR"})
+    cached = client.post("/query/stream", json={"message": "Explain exchange rates"})
+
+    assert fast.status_code == 200
+    assert '"served_by": "fast_path"' in fast.text
+    assert cached.status_code == 200
+    assert '"response": "cached"' in cached.text
+    assert saturated.in_flight == 1
+
+
+def test_lookup_errors_become_error_events_without_taking_a_slot(
+    saturated, monkeypatch
+):
+    currency_agent = agent_router.get_currency_agent()
+
+    async def broken_fast_path(query):
+        raise RuntimeError("rates unreadable")
+
+    monkeypatch.setattr(currency_agent, "_try_fast_path", broken_fast_path)
+
+    async def run():
+        return [event async for event in currency_agent.stream_query("100 USD to EUR")]
+
+    assert asyncio.run(run()) == [
+        {
+            "event": "error",
+            "data": {
+                "success": False,
+                "response": "",
+                "error": "rates unreadable",
+                "served_by": "agent",
+            },
+        }
+    ]
+    assert saturated.in_flight == 1
+
+
+def test_react_tokens_are_streamed_only_after_final_answer_marker():
+    buffers = {}
+    chunks = ["Thought: done\nFinal ", "Answer: 1 USD", " = 0.86 EUR"]
+
+    streamed = [
+        CurrencyExchangeAgent._final_answer_delta(buffers, "run", chunk)
+        for chunk in chunks
+    ]
+
+    assert streamed == ["", "1 USD", " = 0.86 EUR"]
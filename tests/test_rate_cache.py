@@ -0,0 +1,92 @@
+"""Tests for the shared rate snapshot cache."""
+
+import time
+
+from apps.domain.rates.cache import RateCache, RateSnapshot
+
+
+def _snapshot(base_code: str, next_update_in: float = 3600.0) -> RateSnapshot:
+    return RateSnapshot(
+        base_code=base_code,
+        rates={base_code: 1.0, "EUR": 0.86},
+        time_next_update_unix=time.time() + next_update_in,
+    )
+
+
+def test_snapshot_from_api_response():
+    snapshot = RateSnapshot.from_api_response(
+        {
+            "result": "success",
+            "base_code": "usd",
+            "time_last_update_utc": "Mon, 21 Jul 2025 00:00:01 +0000",
+            "time_next_update_utc": "Tue, 22 Jul 2025 00:00:01 +0000",
+            "conversion_rates": {"USD": 1, "EUR": 0.8599},
+        }
+    )
+
+    assert snapshot.base_code == "USD"
+    assert snapshot.rates["EUR"] == 0.8599
+    assert snapshot.time_next_update_unix == 1753142401.0
+
+
+def test_cache_hit_and_case_insensitive_lookup():
+    cache = RateCache()
+    snapshot = _snapshot("USD")
+    cache.set(snapshot)
+
+    assert cache.get("usd") is snapshot
+
+
+def test_cache_expires_at_provider_next_update():
+    cache = RateCache(max_ttl=3600.0)
+    stale = RateSnapshot(
+        base_code="USD",
+        rates={"USD": 1.0},
+        time_next_update_unix=time.time() - 10,
+        fetched_at=time.time() - 120,
+    )
+    cache.set(stale)
+
+    assert cache.get("USD") is None
+    assert len(cache) == 0
+
+
+def test_cache_expires_after_max_ttl():
+    cache = RateCache(max_ttl=60.0)
+    cache.set(
+        RateSnapshot(base_code="USD", rates={"USD": 1.0}, fetched_at=time.time() - 61)
+    )
+
+    assert cache.get("USD") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RateCache(max_size=2)
+    cache.set(_snapshot("USD"))
+    cache.set(_snapshot("EUR"))
+    cache.get("USD")
+    cache.set(_snapshot("GBP"))
+
+    assert cache.get("EUR") is None
+    assert cache.get("USD") is not None
+    assert cache.get("GBP") is not None
+
+
+def test_expired_snapshot_is_kept_as_last_good_one():
+    cache = RateCache(max_ttl=60.0, max_stale_age=3600.0)
+    expired = RateSnapshot(
+        base_code="USD", rates={"USD": 1.0}, fetched_at=time.time() - 61
+    )
+    too_old = RateSnapshot(
+        base_code="EUR", rates={"EUR": 1.0}, fetched_at=time.time() - 7200
+    )
+    cache.set(expired)
+    cache.retain(too_old)
+
+    assert cache.get_stale("USD") is None  # not known to be expired yet
+    assert cache.get("USD") is None
+    assert cache.get_stale("usd") is expired
+    assert cache.get_stale("EUR") is None
+
+    cache.set(_snapshot("USD"))
+    assert cache.get_stale("USD") is None
@@ -0,0 +1,206 @@
+"""Tests for the pooled ExchangeRate API client."""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from apps.domain.exceptions import (
+    RateFetchError,
+    RateProviderError,
+    RateProviderUnavailableError,
+)
+from apps.domain.rates.breaker import CircuitBreaker
+from apps.domain.rates.cache import RateCache, RateSnapshot
+from apps.domain.rates.client import RateClient
+from apps.domain.rates.matrix import RateMatrix
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+def _client_with_transport(handler) -> RateClient:
+    client = RateClient(RateCache())
+    client.provider._async_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_async_snapshot_is_fetched_once_and_cached():
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request.url.path)
+        return httpx.Response(200, json=EXAMPLE_RESPONSE)
+
+    client = _client_with_transport(handler)
+
+    async def run():
+        first = await client.aget_snapshot("usd")
+        second = await client.aget_snapshot("USD")
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.rates["EUR"] == 0.8599
+    assert len(requests_seen) == 1
+    assert requests_seen[0].endswith("/latest/USD")
+
+
+def test_async_provider_error_is_raised():
+    client = _client_with_transport(
+        lambda request: httpx.Response(200, json={"result": "error"})
+    )
+
+    with pytest.raises(RateProviderError):
+        asyncio.run(client.aget_snapshot("XXX"))
+
+
+def test_async_transport_error_is_wrapped():
+    client = _client_with_transport(lambda request: httpx.Response(503))
+
+    with pytest.raises(RateFetchError):
+        asyncio.run(client.aget_snapshot("USD"))
+
+
+def test_async_non_json_body_is_a_fetch_error():
+    client = _client_with_transport(
+        lambda request: httpx.Response(200, text="<html>maintenance</html>")
+    )
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+
+    with pytest.raises(RateFetchError):
+        asyncio.run(client.aget_snapshot("USD"))
+    assert client.breaker.is_open
+
+
+def test_circuit_opens_after_repeated_outages_and_fails_fast():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    client = _client_with_transport(handler)
+    client.breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(RateFetchError):
+                await client.aget_snapshot("USD")
+        with pytest.raises(RateProviderUnavailableError):
+            await client.aget_snapshot("USD")
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+    assert client.breaker.is_open
+
+
+def test_rejected_requests_do_not_open_the_circuit():
+    client = _client_with_transport(lambda request: httpx.Response(404))
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+
+    with pytest.raises(RateFetchError):
+        asyncio.run(client.aget_snapshot("XXX"))
+
+    assert not client.breaker.is_open
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    clock = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=1, reset_seconds=30, clock=lambda: clock[0]
+    )
+    breaker.record_failure()
+
+    with pytest.raises(RateProviderUnavailableError):
+        breaker.before_call()
+
+    clock[0] = 31
+    breaker.before_call()
+    with pytest.raises(RateProviderUnavailableError):
+        breaker.before_call()  # the probe is still in flight
+    breaker.record_success()
+    breaker.before_call()
+    assert not breaker.is_open
+
+
+class _FlakyClient(RateClient):
+    def __init__(self, failures):
+        super().__init__(
+            RateCache(max_ttl=60.0, max_stale_age=86400.0),
+            retry_attempts=3,
+            retry_base_seconds=0.01,
+        )
+        self.failures = failures
+        self.fetches = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def _next_snapshot(self, base_currency):
+        self.gate.wait(5)
+        self.fetches += 1
+        if self.fetches <= self.failures:
+            raise RateFetchError("provider down")
+        return RateSnapshot(base_currency, {base_currency: 1.0, "EUR": 0.9})
+
+    def fetch_snapshot(self, base_currency):
+        return self._next_snapshot(base_currency)
+
+    async def afetch_snapshot(self, base_currency):
+        return self._next_snapshot(base_currency)
+
+
+def _expired(base_currency="USD"):
+    return RateSnapshot(
+        base_currency,
+        {base_currency: 1.0, "EUR": 0.8},
+        time_last_update_utc="Mon, 21 Jul 2025 00:00:01 +0000",
+        fetched_at=time.time() - 7260,
+    )
+
+
+def test_stale_snapshot_is_served_while_a_background_refresh_retries():
+    client = _FlakyClient(failures=1)
+    client.cache.retain(_expired())
+
+    async def run():
+        stale = await client.aget_snapshot("USD")
+        assert client.stale_age(stale) == pytest.approx(7260, abs=5)
+        assert "(STALE: fetched 2h 1m ago" in client.describe_update(RateMatrix(stale))
+        await asyncio.gather(*client._background_tasks)
+        return stale, await client.aget_snapshot("USD")
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale.rates["EUR"] == 0.8
+    assert fresh.rates["EUR"] == 0.9
+    assert client.fetches == 2
+    assert client.stale_age(fresh) is None
+
+
+def test_sync_callers_get_the_stale_snapshot_without_waiting():
+    client = _FlakyClient(failures=5)
+    client.cache.retain(_expired())
+    client.gate.clear()
+
+    assert client.get_snapshot("USD").rates["EUR"] == 0.8
+    assert client.get_snapshot("USD").rates["EUR"] == 0.8
+    client.gate.set()
+    for thread in threading.enumerate():
+        if thread.name == "rate-revalidate-USD":
+            thread.join()
+
+    assert client.fetches == 3  # one refresh with its retries, not one per caller
+    with pytest.raises(RateFetchError):
+        client.get_snapshot("USD", allow_stale=False)
@@ -0,0 +1,172 @@
+"""Tests for the local memory-mapped rate history and the historical rates tool."""
+
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.history import RateHistory, snapshot_date
+from apps.domain.tools.currency_tool import HistoricalRateTool
+
+
+def _snapshot(day, eur, gbp=0.75, base="USD"):
+    published = datetime(day.year, day.month, day.day, 0, 0, 1, tzinfo=timezone.utc)
+    rates = {"USD": 1.0, "EUR": eur, "GBP": gbp}
+    if base != "USD":
+        rates = {code: rate / rates[base] for code, rate in rates.items()}
+    return RateSnapshot(
+        base_code=base,
+        rates=rates,
+        time_last_update_utc=format_datetime(published),
+    )
+
+
+def test_snapshot_date_comes_from_the_publication_time():
+    snapshot = RateSnapshot(
+        "USD", {"USD": 1.0}, time_last_update_utc="Mon, 21 Jul 2025 00:00:01 +0000"
+    )
+
+    assert snapshot_date(snapshot) == date(2025, 7, 21)
+
+
+def test_series_reads_recorded_days_and_skips_gaps(tmp_path):
+    history = RateHistory(str(tmp_path))
+    start = date(2025, 7, 1)
+    assert history.record(_snapshot(start, eur=0.80))
+    assert history.record(_snapshot(start + timedelta(days=1), eur=0.82))
+    assert history.record(_snapshot(start + timedelta(days=3), eur=0.84))
+
+    points = history.series("EUR", "GBP", start, start + timedelta(days=10))
+
+    assert [day for day, _ in points] == [
+        start,
+        start + timedelta(days=1),
+        start + timedelta(days=3),
+    ]
+    assert points[0][1] == pytest.approx(0.75 / 0.80)
+    assert history.date_range() == (start, start + timedelta(days=3))
+    assert (tmp_path / "EUR.f64").stat().st_size == 4 * 8
+
+
+def test_history_is_append_only(tmp_path):
+    history = RateHistory(str(tmp_path))
+    day = date(2025, 7, 2)
+    assert history.record(_snapshot(day, eur=0.80))
+
+    assert not history.record(_snapshot(day, eur=0.99))
+    assert not history.record(_snapshot(day - timedelta(days=1), eur=0.99))
+    assert history.rate_on("USD", "EUR", day) == (day, 0.80)
+
+
+def test_other_bases_are_stored_against_the_history_base(tmp_path):
+    history = RateHistory(str(tmp_path))
+    day = date(2025, 7, 1)
+    history.record(_snapshot(day, eur=0.80, base="EUR"))
+
+    _, rate = history.rate_on("USD", "EUR", day)
+    assert rate == pytest.approx(0.80)
+
+
+def test_readers_see_days_appended_by_other_writers(tmp_path):
+    reader = RateHistory(str(tmp_path))
+    writer = RateHistory(str(tmp_path))
+    day = date(2025, 7, 1)
+    writer.record(_snapshot(day, eur=0.80))
+    assert reader.rate_on("USD", "EUR", day) == (day, 0.80)
+
+    writer.record(_snapshot(day + timedelta(days=1), eur=0.81))
+
+    assert reader.rate_on("USD", "EUR", day + timedelta(days=1)) == (
+        day + timedelta(days=1),
+        0.81,
+    )
+    reader.close()
+    writer.close()
+
+
+def test_rate_on_falls_back_to_the_latest_earlier_day(tmp_path):
+    history = RateHistory(str(tmp_path))
+    friday = date(2025, 7, 4)
+    history.record(_snapshot(friday, eur=0.80))
+
+    assert history.rate_on("USD", "EUR", friday + timedelta(days=2)) == (friday, 0.80)
+    assert history.rate_on("USD", "EUR", friday + timedelta(days=30)) is None
+    assert history.series("USD", "../../etc", friday, friday) == []
+
+
+@pytest.fixture
+def recorded_history(tmp_path, monkeypatch):
+    history = RateHistory(str(tmp_path))
+    today = datetime.now(timezone.utc).date()
+    for days_ago, eur in ((10, 0.80), (5, 0.90), (1, 0.88)):
+        history.record(_snapshot(today - timedelta(days=days_ago), eur=eur))
+    monkeypatch.setattr(rate_client, "history", history)
+    return today
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("EUR to USD on 2025-07-01", ("EUR", "USD", date(2025, 7, 1), None)),
+        ("'gbp jpy last 30 days'", ("GBP", "JPY", None, 30)),
+        ("USD to EUR over the last 7 days", ("USD", "EUR", None, 7)),
+        ("euro to Japanese yen on 2025-07-01", ("EUR", "JPY", date(2025, 7, 1), None)),
+        ("USD to EUR on 2025-02-30", None),
+        ("USD to EUR last 0 days", None),
+        ("USD to EUR yesterday", None),
+    ],
+)
+def test_historical_tool_parses_input(query, expected):
+    assert HistoricalRateTool._parse_query(query) == expected
+
+
+def test_historical_tool_reports_change_over_recent_days(recorded_history):
+    result = HistoricalRateTool(compact=True)._run("USD to EUR last 7 days")
+
+    assert result.startswith("USD/EUR")
+    assert "0.9000 ->" in result
+    assert "0.8800 (-0.0200, -2.22%)" in result
+    assert result.endswith("2 days")
+
+
+def test_historical_tool_reports_rate_on_a_date(recorded_history):
+    day = recorded_history - timedelta(days=5)
+
+    result = HistoricalRateTool()._run(f"USD to EUR on {day.isoformat()}")
+
+    assert (
+        result == f"Historical exchange rate: 1 USD = 0.9000 EUR on {day.isoformat()}"
+    )
+
+
+def test_historical_tool_explains_missing_data(recorded_history):
+    assert "History covers" in HistoricalRateTool()._run("USD to EUR on 2001-01-01")
+    assert "'CHF'" in HistoricalRateTool()._run("USD to CHF last 7 days")
+    assert HistoricalRateTool()._run("bad input").startswith("Error: Please provide")
+    assert (
+        HistoricalRateTool()
+        ._run("USD to pesos last 7 days")
+        .startswith("Error: 'pesos' is used by several currencies")
+    )
+
+
+def _agent_tool_names():
+    from apps.domain.agents.currency_exchange import CurrencyExchangeAgent
+
+    agent = CurrencyExchangeAgent()
+    system_prompt = agent._tools_prompt().messages[0].prompt.template
+    return [tool.name for tool in agent.tools], system_prompt
+
+
+def test_agent_offers_history_only_when_it_is_recorded(recorded_history, monkeypatch):
+    names, prompt = _agent_tool_names()
+    assert "get_historical_rates" in names
+    assert "get_historical_rates" in prompt
+
+    monkeypatch.setattr(rate_client, "history", None)
+    names, prompt = _agent_tool_names()
+    assert "get_historical_rates" not in names
+    assert "get_historical_rates" not in prompt
+    assert "not historical data" in prompt
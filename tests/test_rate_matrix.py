@@ -0,0 +1,42 @@
+"""Tests for the single-fetch cross-rate matrix."""
+
+import pytest
+
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.matrix import RateMatrix
+
+
+@pytest.fixture
+def matrix() -> RateMatrix:
+    return RateMatrix(
+        RateSnapshot(
+            base_code="USD",
+            rates={"USD": 1.0, "EUR": 0.8, "GBP": 0.5, "JPY": 150.0},
+        )
+    )
+
+
+def test_cross_rate_is_derived_from_base_table(matrix):
+    assert matrix.rate("USD", "EUR") == pytest.approx(0.8)
+    assert matrix.rate("EUR", "GBP") == pytest.approx(0.625)
+    assert matrix.rate("GBP", "JPY") == pytest.approx(300.0)
+
+
+def test_rates_for_rebases_the_whole_table(matrix):
+    rates = matrix.rates_for("EUR")
+
+    assert rates["EUR"] == pytest.approx(1.0)
+    assert rates["USD"] == pytest.approx(1.25)
+    assert len(rates) == len(matrix)
+
+
+def test_convert_to_selected_targets_skips_unknown(matrix):
+    converted = dict(matrix.convert(100.0, "GBP", ["USD", "XXX", "JPY"]))
+
+    assert converted == {"USD": pytest.approx(200.0), "JPY": pytest.approx(30000.0)}
+
+
+def test_unknown_currency_raises_key_error(matrix):
+    assert "XXX" not in matrix
+    with pytest.raises(KeyError):
+        matrix.rate("USD", "XXX")
@@ -0,0 +1,95 @@
+"""Tests for the background rate prefetcher and on-disk snapshots."""
+
+import asyncio
+import math
+import time
+
+import pytest
+
+from apps.domain.rates.cache import RateCache, RateSnapshot
+from apps.domain.rates.client import RateClient
+from apps.domain.rates.prefetch import RatePrefetcher
+from apps.domain.rates.shared_store import SharedRateStore
+from apps.domain.rates.snapshot_file import read_snapshot_file, write_snapshot_file
+
+
+def _snapshot(base_code, rates):
+    return RateSnapshot(
+        base_code=base_code,
+        rates=rates,
+        time_last_update_utc="Mon, 21 Jul 2025 00:00:01 +0000",
+        time_next_update_unix=time.time() + 3600,
+    )
+
+
+def test_snapshot_file_round_trip(tmp_path):
+    path = str(tmp_path / "rates.bin")
+    usd = _snapshot("USD", {"USD": 1.0, "EUR": 0.8599, "JPY": 147.2})
+    eur = _snapshot("EUR", {"EUR": 1.0, "USD": 1.163})
+
+    write_snapshot_file(path, [usd, eur])
+    loaded = read_snapshot_file(path)
+
+    assert loaded == [usd, eur]
+    assert not any(math.isnan(rate) for rate in loaded[1].rates.values())
+
+
+def test_snapshot_file_rejects_other_files(tmp_path):
+    path = tmp_path / "rates.bin"
+    path.write_bytes(b"not a snapshot file")
+
+    with pytest.raises(ValueError):
+        read_snapshot_file(str(path))
+
+
+class _FakeClient(RateClient):
+    def __init__(self, cache, store=None):
+        super().__init__(cache, matrix_base="USD", store=store)
+        self.fetched = []
+
+    async def afetch_snapshot(self, base_currency):
+        self.fetched.append(base_currency)
+        return _snapshot(base_currency, {base_currency: 1.0})
+
+
+def test_refresh_fetches_missing_bases_and_persists(tmp_path):
+    path = str(tmp_path / "rates.bin")
+    client = _FakeClient(RateCache(), store=SharedRateStore(path))
+    prefetcher = RatePrefetcher(client, ["eur", "USD", ""])
+
+    assert prefetcher.base_currencies == ["USD", "EUR"]
+    assert asyncio.run(prefetcher.refresh()) is True
+    assert asyncio.run(prefetcher.refresh()) is True
+    assert client.fetched == ["USD", "EUR"]
+    assert [s.base_code for s in read_snapshot_file(path)] == ["USD", "EUR"]
+
+
+def test_load_seeds_cache_with_fresh_snapshots_only(tmp_path):
+    path = str(tmp_path / "rates.bin")
+    expired = RateSnapshot(
+        base_code="EUR",
+        rates={"EUR": 1.0},
+        time_next_update_unix=time.time() - 10,
+        fetched_at=time.time() - 7200,
+    )
+    write_snapshot_file(path, [_snapshot("USD", {"USD": 1.0}), expired])
+    client = _FakeClient(RateCache(), store=SharedRateStore(path))
+
+    assert RatePrefetcher(client).load() == 1
+    assert client.cache.get("USD") is not None
+    assert client.cache.get("EUR") is None
+
+
+def test_workers_share_snapshots_through_the_store(tmp_path):
+    path = str(tmp_path / "rates.bin")
+    first = _FakeClient(RateCache(), store=SharedRateStore(path))
+    second = _FakeClient(RateCache(), store=SharedRateStore(path))
+
+    asyncio.run(first.aget_snapshot("USD"))
+    asyncio.run(first.aget_snapshot("EUR"))
+    snapshot = second.get_snapshot("EUR")
+
+    assert first.fetched == ["USD", "EUR"]
+    assert second.fetched == []
+    assert snapshot.base_code == "EUR"
+    assert {s.base_code for s in second.store.snapshots()} == {"USD", "EUR"}
@@ -0,0 +1,131 @@
+"""Tests for the pluggable rate providers."""
+
+import asyncio
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from apps.domain.exceptions import RateFetchError, RateProviderError
+from apps.domain.rates.breaker import CircuitBreaker
+from apps.domain.rates.cache import RateCache
+from apps.domain.rates.client import RateClient
+from apps.domain.rates.providers import FileRateProvider, RateProvider, load_provider
+
+EXAMPLE_RESPONSE = Path(__file__).parent.parent / "example_response.json"
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="2025-07-18">
+      <Cube currency="USD" rate="1.1627"/>
+      <Cube currency="JPY" rate="173.26"/>
+      <Cube currency="GBP" rate="0.86603"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>
+"""
+
+
+def test_json_file_in_the_api_format_serves_any_base(tmp_path):
+    path = tmp_path / "latest.json"
+    shutil.copy(EXAMPLE_RESPONSE, path)
+    provider = FileRateProvider(str(path))
+
+    usd = provider.fetch("USD")
+    eur = provider.fetch("EUR")
+
+    assert usd.rates["EUR"] == 0.8599
+    assert eur.base_code == "EUR"
+    assert eur.rates["USD"] == pytest.approx(1 / 0.8599)
+    assert eur.time_last_update_utc == "Mon, 21 Jul 2025 00:00:01 +0000"
+
+
+def test_csv_file_is_read_against_the_configured_base(tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text(
+        "currency,rate\nEUR,0.8599\ngbp,0.7412\n\n# hand-edited\nJPY,147.2\n"
+    )
+
+    snapshot = FileRateProvider(str(path), base_code="usd").fetch("GBP")
+
+    assert snapshot.rates["GBP"] == pytest.approx(1.0)
+    assert snapshot.rates["USD"] == pytest.approx(1 / 0.7412)
+    assert snapshot.rates["JPY"] == pytest.approx(147.2 / 0.7412)
+    assert snapshot.time_last_update_utc.endswith("+0000")
+
+
+def test_ecb_xml_file_is_read_against_eur(tmp_path):
+    path = tmp_path / "eurofxref-daily.xml"
+    path.write_bytes(ECB_XML)
+
+    snapshot = FileRateProvider(str(path)).fetch("EUR")
+
+    assert snapshot.rates == {"USD": 1.1627, "JPY": 173.26, "GBP": 0.86603, "EUR": 1.0}
+    assert snapshot.time_last_update_utc == "Fri, 18 Jul 2025 00:00:00 +0000"
+
+
+def test_file_is_parsed_again_only_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "rates.json"
+    path.write_text('{"base": "EUR", "date": "2025-07-18", "rates": {"USD": 1.16}}')
+    provider = FileRateProvider(str(path))
+    loads = []
+    load = provider._load
+    monkeypatch.setattr(
+        provider, "_load", lambda modified_at: loads.append(1) or load(modified_at)
+    )
+
+    provider.fetch("EUR")
+    asyncio.run(provider.afetch("USD"))
+    path.write_text('{"base": "EUR", "date": "2025-07-21", "rates": {"USD": 1.17}}')
+    os.utime(path, ns=(0, 10**9))
+
+    assert provider.fetch("EUR").rates["USD"] == 1.17
+    assert len(loads) == 2
+
+
+def test_file_errors_are_reported_like_provider_errors(tmp_path):
+    bad = tmp_path / "rates.csv"
+    bad.write_text("EUR,0.86\nUSD,lots\n")
+
+    with pytest.raises(RateFetchError):
+        FileRateProvider(str(tmp_path / "missing.json")).fetch("USD")
+    with pytest.raises(RateProviderError, match="non-numeric"):
+        FileRateProvider(str(bad)).fetch("USD")
+    with pytest.raises(ValueError):
+        FileRateProvider(str(tmp_path / "rates.txt"))
+
+
+def test_client_serves_rates_from_a_file_provider(tmp_path):
+    path = tmp_path / "latest.json"
+    shutil.copy(EXAMPLE_RESPONSE, path)
+    client = RateClient(
+        RateCache(),
+        provider=FileRateProvider(str(path)),
+        breaker=CircuitBreaker(failure_threshold=1, reset_seconds=60),
+    )
+
+    matrix = asyncio.run(client.aget_matrix())
+    assert matrix.rate("EUR", "GBP") == pytest.approx(0.7453 / 0.8599)
+
+    with pytest.raises(RateProviderError):
+        client.get_snapshot("XYZ")
+    assert not client.breaker.is_open
+
+    path.unlink()
+    with pytest.raises(RateFetchError):
+        client.get_snapshot("GBP")
+    assert client.breaker.is_open
+
+
+def test_custom_providers_must_subclass_rate_provider():
+    assert isinstance(
+        load_provider("apps.domain.rates.providers:ExchangeRateApiProvider"),
+        RateProvider,
+    )
+    with pytest.raises(TypeError):
+        load_provider("apps.domain.rates.cache:RateCache")
+    with pytest.raises(TypeError):
+        RateProvider()
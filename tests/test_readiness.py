@@ -0,0 +1,44 @@
+"""Tests for lazy agent construction and the readiness endpoint."""
+
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from apps.api.app import app
+from apps.api.config import settings
+from apps.api.startup import startup_report
+
+
+def test_importing_the_app_does_not_build_the_agent_or_load_providers():
+    code = (
+        "import sys\n"
+        "from apps.api.routers import agent\n"
+        "import apps.api.app\n"
+        "assert agent._currency_agent is None\n"
+        "assert 'langchain_openai' not in sys.modules\n"
+        "assert 'langchain_ollama' not in sys.modules\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_readiness_reports_startup_stages(monkeypatch):
+    monkeypatch.setattr(settings, "rate_prefetch_enabled", False)
+    monkeypatch.setattr(settings, "rate_snapshot_path", None)
+
+    with TestClient(app) as client:
+        response = client.get("/readiness")
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["ready"] is True
+    assert {"imports", "agent_init", "total"} <= set(body["stages_seconds"])
+
+
+def test_readiness_is_unavailable_until_ready(monkeypatch):
+    monkeypatch.setattr(startup_report, "ready", False)
+
+    response = TestClient(app).get("/readiness")
+
+    assert response.status_code == 503
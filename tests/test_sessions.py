@@ -0,0 +1,170 @@
+"""Tests for conversational sessions and their bounds."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+from langchain_core.messages import BaseMessage, HumanMessage
+from pydantic import Field
+
+from apps.api.config import settings
+from apps.domain.agents.sessions import SessionStore, ToolResultMemo, session_store
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+from apps.domain.tools.currency_tool import CurrencyRateTool
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.run import BenchmarkAgent
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _store(**overrides):
+    options = dict(
+        max_sessions=10,
+        max_session_tokens=1000,
+        max_total_tokens=100_000,
+        idle_ttl_seconds=60,
+        max_tool_results=4,
+        clock=_Clock(),
+    )
+    options.update(overrides)
+    return SessionStore(**options)
+
+
+def test_older_turns_are_summarized_to_stay_within_the_cap():
+    store = _store(max_session_tokens=150)
+    session = store.get("s")
+
+    for i in range(6):
+        store.record(session, f"question {i} " + "x" * 100, f"answer {i} " + "y" * 100)
+
+    assert session.prompt_tokens <= 150
+    assert session.turns[-1].query.startswith("question 5")
+    assert session.summary
+    assert session.summary[-1].startswith("User asked: question 4")
+
+
+def test_idle_and_least_recently_used_sessions_are_evicted():
+    clock = _Clock()
+    store = _store(max_sessions=2, clock=clock)
+    first = store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+
+    assert store.get("a") is first
+    assert len(store) == 2  # "b" was least recently used
+
+    clock.now = 61
+    assert store.get("a") is not first
+
+
+def test_global_token_bound_evicts_other_sessions():
+    store = _store(max_total_tokens=200)
+    old = store.get("old")
+    store.record(old, "q", "a" * 600)
+    new = store.get("new")
+    store.record(new, "q", "b" * 600)
+
+    assert len(store) == 1
+    assert store.get("new") is new
+
+
+def test_tool_results_are_reused_only_for_the_same_rate_version():
+    memo = ToolResultMemo(max_entries=2)
+    memo.put("get_currency_rates", "USD", "USD rates")
+    assert memo.get("get_currency_rates", "USD") is None  # no rate version yet
+
+    memo.set_rate_version("v1")
+    memo.put("get_currency_rates", "USD", "USD rates")
+    memo.put("get_currency_rates", "EUR", "Error: unavailable")
+
+    assert memo.get("get_currency_rates", " usd ") == "USD rates"
+    assert memo.get("get_currency_rates", "EUR") is None
+
+    memo.set_rate_version("v2")
+    assert memo.get("get_currency_rates", "USD") is None
+
+
+class _RecordingChatModel(BenchmarkChatModel):
+    prompts: List[List[BaseMessage]] = Field(default_factory=list)
+
+    def _respond(self, messages, tools_bound):
+        self.prompts.append(list(messages))
+        return super()._respond(messages, tools_bound)
+
+
+@pytest.fixture
+def session_agent(monkeypatch):
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+    monkeypatch.setattr(rate_client, "get_matrix", lambda: matrix)
+
+    async def aget_matrix():
+        return matrix
+
+    monkeypatch.setattr(rate_client, "aget_matrix", aget_matrix)
+    monkeypatch.setattr(settings, "model_provider", "openai")
+    monkeypatch.setattr(settings, "fast_path_enabled", False)
+    monkeypatch.setattr(settings, "answer_cache_enabled", False)
+    monkeypatch.setattr(settings, "agent_verbose", False)
+    monkeypatch.setattr(settings, "prompt_compact", False)
+    session_store.clear()
+    yield BenchmarkAgent(_RecordingChatModel())
+    session_store.clear()
+
+
+def test_follow_ups_see_earlier_turns_and_reuse_tool_results(
+    session_agent, monkeypatch
+):
+    tool_calls = []
+    original_arun = CurrencyRateTool._arun
+
+    async def counting_arun(self, *args, **kwargs):
+        tool_calls.append(args)
+        return await original_arun(self, *args, **kwargs)
+
+    monkeypatch.setattr(CurrencyRateTool, "_arun", counting_arun)
+
+    async def main():
+        first = await session_agent.process_query(
+            "Show me the GBP rates", session_id="s1"
+        )
+        second = await session_agent.process_query(
+            "Show me the GBP rates", session_id="s1"
+        )
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first["success"] and second["success"]
+    assert second["response"] == first["response"]
+    assert len(tool_calls) == 1
+
+    follow_up_prompt = session_agent.llm.prompts[-2]
+    assert [m.content for m in follow_up_prompt if isinstance(m, HumanMessage)] == [
+        "Show me the GBP rates",
+        "Show me the GBP rates",
+    ]
+    assert len(session_store.get("s1").turns) == 2
+
+
+def test_queries_without_a_session_stay_stateless(session_agent):
+    session_agent.process_query_sync("Show me the GBP rates")
+    session_agent.process_query_sync("Show me the GBP rates")
+
+    last_prompt = session_agent.llm.prompts[-2]
+    assert len([m for m in last_prompt if isinstance(m, HumanMessage)]) == 1
+    assert len(session_store) == 0
@@ -0,0 +1,88 @@
+"""Tests for request coalescing of concurrent rate fetches."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from apps.domain.rates.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_threads_share_one_in_flight_call():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "USD"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flights.do, "USD", fetch) for _ in range(8)]
+        results = [future.result() for future in futures]
+
+    assert results == ["USD"] * 8
+    assert len(calls) == 1
+
+
+def test_thread_followers_receive_leader_exception():
+    flights = SingleFlight()
+
+    def fetch():
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flights.do, "USD", fetch) for _ in range(4)]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_coroutines_share_one_in_flight_call_and_survive_cancellation():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "EUR"
+
+    async def run():
+        first = asyncio.ensure_future(flights.do("EUR", fetch))
+        others = [asyncio.ensure_future(flights.do("EUR", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        first.cancel()
+        results = await asyncio.gather(*others)
+        after = await flights.do("EUR", fetch)
+        return results, after
+
+    results, after = asyncio.run(run())
+
+    assert results == ["EUR"] * 5
+    assert after == "EUR"
+    assert len(calls) == 2
+
+
+def test_calls_are_not_shared_across_event_loops():
+    flights = AsyncSingleFlight()
+
+    async def stuck():
+        await asyncio.Event().wait()
+
+    async def fetch():
+        return "GBP"
+
+    # A loop that closes with its call still in flight must not leave that
+    # call behind for callers on the next loop.
+    loop = asyncio.new_event_loop()
+    leader = loop.create_task(flights.do("GBP", stuck))
+    loop.run_until_complete(asyncio.sleep(0))
+    leader.cancel()
+    loop.close()
+
+    assert asyncio.run(asyncio.wait_for(flights.do("GBP", fetch), 1)) == "GBP"
@@ -0,0 +1,116 @@
+"""Tests for per-request token accounting and compact prompt mode."""
+
+import json
+from pathlib import Path
+
+import pytest
+from langchain_core.agents import AgentAction
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.messages import AIMessage
+
+from apps.api.config import settings
+from apps.domain.agents.token_usage import TRUNCATION_MARKER, trim_intermediate_steps
+from apps.domain.rates.cache import RateSnapshot
+from apps.domain.rates.client import rate_client
+from apps.domain.rates.matrix import RateMatrix
+from benchmarks.fake_llm import BenchmarkChatModel
+from benchmarks.run import BenchmarkAgent
+
+EXAMPLE_RESPONSE = json.loads(
+    (Path(__file__).parent.parent / "example_response.json").read_text()
+)
+
+
+@pytest.fixture
+def offline_agent(monkeypatch):
+    matrix = RateMatrix(RateSnapshot.from_api_response(EXAMPLE_RESPONSE))
+    monkeypatch.setattr(rate_client, "get_matrix", lambda: matrix)
+    monkeypatch.setattr(settings, "model_provider", "ollama")
+    monkeypatch.setattr(settings, "ollama_tool_calling", "off")
+    monkeypatch.setattr(settings, "fast_path_enabled", False)
+    monkeypatch.setattr(settings, "answer_cache_enabled", False)
+    monkeypatch.setattr(settings, "agent_verbose", False)
+
+    def build(compact):
+        monkeypatch.setattr(settings, "prompt_compact", compact)
+        return BenchmarkAgent(BenchmarkChatModel())
+
+    return build
+
+
+def test_agent_reports_token_usage_per_component(offline_agent):
+    result = offline_agent(compact=False).process_query_sync("Show me the GBP rates")
+
+    usage = result["token_usage"]
+    assert result["success"] is True
+    assert usage["llm_calls"] == 2
+    assert (
+        usage["prompt_tokens"]
+        == 2 * usage["base_prompt_tokens"] + usage["scratchpad_tokens"]
+    )
+    assert usage["scratchpad_tokens"] > 0
+    assert usage["tool_output_tokens"] > 0
+
+
+def test_compact_mode_sends_fewer_prompt_tokens(offline_agent):
+    query = "How does GBP compare with JPY today?"
+    full = offline_agent(compact=False).process_query_sync(query)
+    compact = offline_agent(compact=True).process_query_sync(query)
+
+    assert compact["success"] is True
+    assert "1 GBP = " in compact["response"]
+    assert (
+        compact["token_usage"]["base_prompt_tokens"]
+        < full["token_usage"]["base_prompt_tokens"] / 2
+    )
+    assert (
+        compact["token_usage"]["prompt_tokens"] < full["token_usage"]["prompt_tokens"]
+    )
+
+
+def _react_step(observation):
+    return (
+        AgentAction(tool="get_currency_rates", tool_input="USD", log="Action: x"),
+        observation,
+    )
+
+
+def test_scratchpad_cap_drops_oldest_steps():
+    steps = [_react_step("a" * 400), _react_step("b" * 400), _react_step("c" * 400)]
+
+    trimmed = trim_intermediate_steps(steps, max_tokens=250)
+
+    assert [observation[0] for _, observation in trimmed] == ["b", "c"]
+    assert trim_intermediate_steps(steps, max_tokens=0) == steps
+
+
+def test_scratchpad_cap_truncates_an_oversized_newest_step():
+    trimmed = trim_intermediate_steps([_react_step("x" * 4000)], max_tokens=100)
+
+    observation = trimmed[0][1]
+    assert len(observation) == 400
+    assert observation.endswith(TRUNCATION_MARKER)
+
+
+def test_scratchpad_cap_keeps_parallel_tool_calls_together():
+    shared_log = [AIMessage(content="", tool_calls=[])]
+    parallel = [
+        (
+            ToolAgentAction(
+                tool="get_currency_rates",
+                tool_input={},
+                log="call",
+                message_log=shared_log,
+                tool_call_id=f"call_{i}",
+            ),
+            "r" * 400,
+        )
+        for i in range(2)
+    ]
+
+    trimmed = trim_intermediate_steps(
+        [_react_step("a" * 40)] + parallel, max_tokens=150
+    )
+
+    assert [action.tool_call_id for action, _ in trimmed] == ["call_0", "call_1"]
+    assert all(observation.endswith(TRUNCATION_MARKER) for _, observation in trimmed)